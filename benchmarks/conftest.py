@@ -0,0 +1,40 @@
+"""Benchmark fixtures: a fake DO API serving a synthetic account.
+
+``DOM_BENCH_SIZES`` lists the account sizes (default ``10,1000``; add
+``50000`` for the large account), ``DOM_BENCH_LATENCY`` delays every
+response by that many seconds, ``DOM_BENCH_THROTTLE=n`` answers every n-th
+request with 429 and ``DOM_BENCH_ROUNDS`` sets the rounds per benchmark.
+"""
+
+import os
+
+import pytest
+
+from tests.conftest import isolated_state  # noqa: F401  (autouse)
+from tests.fake_api import FakeDOAPI
+
+SIZES = [int(size) for size in os.getenv("DOM_BENCH_SIZES", "10,1000").split(",") if size.strip()]
+LATENCY = float(os.getenv("DOM_BENCH_LATENCY", "0"))
+THROTTLE = int(os.getenv("DOM_BENCH_THROTTLE", "0"))
+ROUNDS = int(os.getenv("DOM_BENCH_ROUNDS", "5"))
+
+
+@pytest.fixture(scope="session", params=SIZES, ids=str)
+def account_api(request):
+    """One server per account size, shared by every benchmark."""
+    api = FakeDOAPI(latency=LATENCY).start()
+    api.add_account(request.param)
+    api.throttle(THROTTLE)
+    api.quota = 10 ** 9  # the hourly budget would otherwise pace the large account
+    yield api
+    api.stop()
+
+
+@pytest.fixture
+def account(account_api, monkeypatch):
+    """Point dom at the account, with the cache off so every round hits the API."""
+    monkeypatch.setenv("DIGITALOCEAN_TOKEN", "bench-token")
+    monkeypatch.setenv("DIGITALOCEAN_API_URL", account_api.url)
+    monkeypatch.setenv("DOM_RATE_LIMIT_PER_MINUTE", "1000000")
+    monkeypatch.setenv("DOM_CACHE", "off")
+    return account_api
@@ -0,0 +1,49 @@
+"""Benchmarks of the sync and async clients on an N+1 record crawl.
+
+Both benchmarks are in one group, so ``make bench`` shows them side by
+side; ``DOM_BENCH_LATENCY`` (default 0.02s here) sets the API latency the
+async fan-out hides.
+"""
+
+import asyncio
+
+import pytest
+
+from benchmarks.conftest import LATENCY, ROUNDS
+from dom.utils import aio, get_client, list_resources
+from tests.fake_api import FakeDOAPI
+
+DOMAINS = [f"example{i}.com" for i in range(30)]
+
+
+@pytest.fixture
+def zones(monkeypatch):
+    api = FakeDOAPI(latency=LATENCY or 0.02).start()
+    for name in DOMAINS:
+        api.add(f"domains/{name}/records", "domain_records", [{"type": "A", "name": "@"}])
+    monkeypatch.setenv("DIGITALOCEAN_TOKEN", "bench-token")
+    monkeypatch.setenv("DIGITALOCEAN_API_URL", api.url)
+    monkeypatch.setenv("DOM_RATE_LIMIT_PER_MINUTE", "1000000")
+    monkeypatch.setenv("DOM_CACHE", "off")
+    yield api
+    api.stop()
+
+
+@pytest.mark.benchmark(group="record crawl")
+def test_crawl_pydo(benchmark, zones):
+    client = get_client()
+    benchmark.pedantic(
+        lambda: [list_resources(client, "domain_records", name) for name in DOMAINS],
+        rounds=ROUNDS,
+    )
+
+
+@pytest.mark.benchmark(group="record crawl")
+def test_crawl_asyncio(benchmark, zones):
+    async def crawl():
+        async with aio.get_async_client() as client:
+            return await asyncio.gather(
+                *(client.list_resources("domain_records", name) for name in DOMAINS)
+            )
+
+    benchmark.pedantic(lambda: aio.run(crawl()), rounds=ROUNDS)
@@ -0,0 +1,90 @@
+"""Benchmarks of the main commands against a synthetic account.
+
+Run with ``make bench``; results are saved under ``.benchmarks/`` and
+compared with the previous run.
+"""
+
+import asyncio
+import shutil
+
+import pytest
+from typer.testing import CliRunner
+
+from benchmarks.conftest import ROUNDS
+from dom.cli import app
+from dom.utils import client, pricing, ratelimit, transport
+
+runner = CliRunner()
+
+
+def _new_process() -> None:
+    """Forget clients, limiters and price catalogs, like a fresh ``dom`` run."""
+    client._clients.clear()
+    ratelimit._limiters.clear()
+    pricing._catalogs.clear()
+    transport.reset()
+
+
+def _measure(benchmark, api, run, setup=None):
+    def prepare():
+        _new_process()
+        if setup:
+            setup()
+
+    before = len(api.requests)
+    benchmark.pedantic(run, setup=prepare, rounds=ROUNDS)
+    benchmark.extra_info["api_requests"] = (len(api.requests) - before) // ROUNDS
+
+
+def _bench_cli(benchmark, api, *args, setup=None):
+    def run():
+        result = runner.invoke(app, list(args))
+        assert result.exit_code == 0, result.output
+
+    _measure(benchmark, api, run, setup)
+
+
+def test_audit_all(benchmark, account):
+    _bench_cli(benchmark, account, "audit", "all")
+
+
+def test_audit_all_throttled(benchmark, account):
+    """Every 20th request is rate-limited, as on a token shared with other tools."""
+    every = account.throttle_every
+    account.throttle(20)
+    try:
+        _bench_cli(benchmark, account, "audit", "all")
+    finally:
+        account.throttle(every)
+
+
+def test_costs_estimate(benchmark, account):
+    _bench_cli(benchmark, account, "costs", "estimate")
+
+
+def test_cleanup_all(benchmark, account):
+    _bench_cli(benchmark, account, "cleanup", "all", "--dry-run")
+
+
+def test_export_terraform(benchmark, account, tmp_path):
+    out = tmp_path / "terraform"
+    _bench_cli(benchmark, account, "export", "terraform", "-o", str(out),
+               setup=lambda: shutil.rmtree(out, ignore_errors=True))
+
+
+def test_export_ansible(benchmark, account, tmp_path):
+    _bench_cli(benchmark, account, "export", "ansible", "-o", str(tmp_path / "ansible"))
+
+
+@pytest.mark.filterwarnings("ignore::ResourceWarning")
+def test_tui_load(benchmark, account):
+    """Time until every tab is loaded and the droplet table is filled."""
+    from dom.tui import DOManagerApp
+
+    async def scenario():
+        async with DOManagerApp().run_test() as pilot:
+            await pilot.app.workers.wait_for_complete()
+            await pilot.pause()
+            assert len(pilot.app.screen.loaded) == 5
+
+    _measure(benchmark, account, lambda: asyncio.run(scenario()))
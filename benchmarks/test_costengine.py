@@ -0,0 +1,18 @@
+"""Benchmarks of the cost engine group-by; time should grow linearly."""
+
+import pytest
+
+from benchmarks.conftest import ROUNDS
+from tests.test_costengine import _frame
+
+
+@pytest.mark.benchmark(group="cost group-by")
+@pytest.mark.parametrize("count", [10_000, 100_000], ids=str)
+def test_group_by(benchmark, count):
+    frame = _frame(count)
+
+    def run():
+        frame.group_by(["tag", "region", "size", "type"])
+        frame.group_by(["region"])
+
+    benchmark.pedantic(run, rounds=ROUNDS)
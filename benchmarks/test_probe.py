@@ -0,0 +1,44 @@
+"""Benchmark of the reachability sweep behind ``dom ans probe``.
+
+A local SSH-like server answers every connection after 5ms, so the
+sweep's wall time is set by how many probes it keeps open at once.
+"""
+
+import asyncio
+
+import pytest
+
+from benchmarks.conftest import ROUNDS
+from dom.utils.probe import sweep
+
+HOSTS = 2000
+BANNER = b"SSH-2.0-OpenSSH_9.6\r\n"
+
+
+async def _sweep(concurrency: int) -> list:
+    async def handle(reader, writer):
+        await asyncio.sleep(0.005)
+        writer.write(BANNER)
+        try:
+            await writer.drain()
+            await reader.read()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0, backlog=1024)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        targets = [(f"web-{i}", "127.0.0.1", port) for i in range(HOSTS)]
+        return await sweep(targets, concurrency=concurrency, timeout=10)
+    finally:
+        server.close()
+
+
+@pytest.mark.benchmark(group="probe sweep")
+@pytest.mark.parametrize("concurrency", [10, 100])
+def test_sweep(benchmark, concurrency):
+    results = benchmark.pedantic(lambda: asyncio.run(_sweep(concurrency)), rounds=ROUNDS)
+
+    assert all(r.status == "ok" for r in results)
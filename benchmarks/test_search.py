@@ -0,0 +1,19 @@
+"""Benchmarks of the TUI search index: one keystroke should take well
+under a 60 Hz frame (16 ms) at 20k rows."""
+
+import pytest
+
+from benchmarks.conftest import ROUNDS
+from dom.tui.app import VIEWS
+from tests.test_search import QUERIES, _droplets
+
+
+@pytest.fixture(scope="module")
+def index():
+    return VIEWS["droplets"].search_index(_droplets(20_000))
+
+
+@pytest.mark.benchmark(group="search keystroke")
+@pytest.mark.parametrize("query", QUERIES + ["wb199"])
+def test_keystroke(benchmark, index, query):
+    benchmark.pedantic(index.search, (query,), {"limit": 201}, rounds=ROUNDS * 20)
@@ -0,0 +1,5 @@
+"""Allow running dom as ``python -m dom``."""
+
+from dom.cli import app
+
+app(prog_name="dom")
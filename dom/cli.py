@@ -1,40 +1,224 @@
 """Main CLI entry point."""
 
+import importlib
+from pathlib import Path
+from typing import List, Optional, cast
+
 import typer
-from rich.console import Console
+from typer.core import TyperGroup
+
+# Sub-commands, imported only when invoked so that `dom version`, `--help`
+# and shell completion don't load pydo, azure-core and friends.
+SUBCOMMANDS = {
+    "audit": ("dom.commands.audit", "Audit and list DigitalOcean resources"),
+    "costs": ("dom.commands.costs", "Analyze costs and billing"),
+    "cleanup": ("dom.commands.cleanup", "Find orphaned or unused resources"),
+    "export": ("dom.commands.export", "Export resources to Terraform/Ansible"),
+    "tf": ("dom.commands.tf", "Terraform commands (init, plan, apply, import)"),
+    "ans": ("dom.commands.ans", "Ansible commands (ping, probe, play, shell)"),
+}
+
+
+def _load_subcommand(name: str):
+    """Import a sub-command module and build its command group."""
+    module_name, help_text = SUBCOMMANDS[name]
+    module = importlib.import_module(module_name)
+    wrapper = typer.Typer()
+    wrapper.add_typer(module.app, name=name, help=help_text)
+    group = cast(TyperGroup, typer.main.get_command(wrapper))
+    return group.commands[name]
+
+
+class LazyGroup(TyperGroup):
+    """Root group that lists sub-commands from SUBCOMMANDS and loads them on use.
+
+    Help output only needs names and help strings, so it is served by
+    placeholders; the real group replaces a placeholder when it is resolved
+    for running or completion.
+    """
+
+    def __init__(self, **attrs):
+        super().__init__(**attrs)
+        commands = {
+            name: TyperGroup(name=name, help=help_text)
+            for name, (_, help_text) in SUBCOMMANDS.items()
+        }
+        commands.update(self.commands)
+        self.commands = commands
+
+    def resolve_command(self, ctx, args):
+        if args and args[0] in SUBCOMMANDS:
+            self.commands[args[0]] = _load_subcommand(args[0])
+        return super().resolve_command(ctx, args)
+
+    def invoke(self, ctx):
+        from dom.utils.cache import OfflineCacheMissError
+
+        try:
+            return super().invoke(ctx)
+        except OfflineCacheMissError as e:
+            from rich.console import Console
+
+            Console(stderr=True).print(f"[red]Error:[/red] {e}")
+            raise typer.Exit(1)
 
-from dom.commands import audit, costs, cleanup, export, tf, ans
 
 app = typer.Typer(
     name="dom",
+    cls=LazyGroup,
     help="DigitalOcean Infrastructure Manager - Audit, manage and export your DO resources.",
     no_args_is_help=True,
 )
 
-console = Console()
 
-# Register sub-commands
-app.add_typer(audit.app, name="audit", help="Audit and list DigitalOcean resources")
-app.add_typer(costs.app, name="costs", help="Analyze costs and billing")
-app.add_typer(cleanup.app, name="cleanup", help="Find orphaned or unused resources")
-app.add_typer(export.app, name="export", help="Export resources to Terraform/Ansible")
-app.add_typer(tf.app, name="tf", help="Terraform commands (init, plan, apply, import)")
-app.add_typer(ans.app, name="ans", help="Ansible commands (ping, play, shell)")
+@app.callback()
+def main(
+    ctx: typer.Context,
+    refresh: bool = typer.Option(
+        False, "--refresh", help="Ignore the local inventory cache and refetch"
+    ),
+    offline: bool = typer.Option(
+        False, "--offline", help="Serve inventory from the local cache only"
+    ),
+    quota: bool = typer.Option(
+        False, "--quota", help="Report API requests and rate-limit quota used"
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        envvar="DOM_PROFILE",
+        help="Time API calls and command phases;"
+        " print a summary and write a Chrome trace",
+    ),
+    profile_out: str = typer.Option(
+        "dom-profile.json",
+        "--profile-out",
+        envvar="DOM_PROFILE_OUT",
+        help="Trace file written by --profile",
+    ),
+    record: Optional[Path] = typer.Option(
+        None,
+        "--record",
+        envvar="DOM_RECORD",
+        help="Save every API response to this archive (secrets scrubbed)",
+    ),
+    replay: Optional[Path] = typer.Option(
+        None,
+        "--replay",
+        envvar="DOM_REPLAY",
+        help="Answer API requests from an archive made with --record, offline",
+    ),
+):
+    """Global options, applied before the sub-command runs."""
+    from dom.utils import cache
+
+    if record and replay:
+        raise typer.BadParameter(
+            "use either --record or --replay", param_hint="--record"
+        )
+    cache.configure(refresh=refresh, offline=offline, enabled=not (record or replay))
+    if record or replay:
+        from dom.utils import archive, transport
+        from dom.utils.credentials import find_token
+
+        if replay:
+            try:
+                archive.start_replay(replay)
+            except (OSError, ValueError) as e:
+                raise typer.BadParameter(f"{replay}: {e}", param_hint="--replay")
+        else:
+            token = find_token()
+            secrets = [token or "", *_account_tokens()]
+            archive.start_recording(secrets=secrets, token=token)
+        transport.reset()  # the shared session picks up the archive adapter
+        ctx.call_on_close(lambda: _finish_archive(record))
+    if profile:
+        from dom.utils import profile as profiler
+
+        profiler.enable(profile_out)
+        ctx.call_on_close(_finish_profile)
+    if quota:
+        ctx.call_on_close(_print_quota)
+
+
+def _account_tokens() -> List[str]:
+    """Tokens of the accounts file, scrubbed from recordings like the main one."""
+    from dom.utils.accounts import load_accounts
+
+    try:
+        return [account.token for account in load_accounts().values()]
+    except ValueError:  # no usable accounts file: --accounts will say so
+        return []
+
+
+def _print_quota() -> None:
+    from rich.console import Console
+
+    from dom.utils.ratelimit import all_limiters
+
+    stderr = Console(stderr=True)
+    limiters = all_limiters()
+    if not limiters:
+        stderr.print("[dim]API requests: 0[/dim]")
+    for limiter in limiters.values():
+        stderr.print(f"[dim]{limiter.summary()}[/dim]")
+
+
+def _finish_archive(record: Optional[Path]) -> None:
+    from rich.console import Console
+
+    from dom.utils import archive, transport
+
+    store = archive.stop()
+    transport.reset()
+    if store is None:
+        return
+    stderr = Console(stderr=True)
+    if record:
+        store.save(record)
+        stderr.print(f"[dim]Recorded {len(store)} API responses to {record}[/dim]")
+    elif store.missing:
+        stderr.print(
+            f"[yellow]Requests missing from the archive: {len(store.missing)}"
+            f" (first: {store.missing[0]})[/yellow]"
+        )
+
+
+def _finish_profile() -> None:
+    from rich.console import Console
+
+    from dom.utils import profile
+
+    profiler = profile.disable()
+    if profiler is None:
+        return
+    stderr = Console(stderr=True)
+    stderr.print()
+    profiler.print_summary(stderr)
+    path = profiler.write_trace()
+    stderr.print(f"[dim]Trace written to {path} (open it in https://ui.perfetto.dev)[/dim]")
 
 
 @app.command()
 def version():
     """Show version information."""
     from dom import __version__
-    console.print(f"dom version {__version__}")
+    typer.echo(f"dom version {__version__}")
 
 
 @app.command()
-def tui():
+def tui(
+    live: bool = typer.Option(
+        False,
+        "--live",
+        "-l",
+        help="Refresh on its own, faster while resources change state",
+    ),
+):
     """Launch interactive TUI (Terminal User Interface)."""
     import os
     from dom.tui import DOManagerApp
-    app = DOManagerApp()
+    app = DOManagerApp(live=live)
     result = app.run()
     if result and result.startswith("ssh "):
         os.system(result)
@@ -43,27 +227,23 @@ def tui():
 @app.command()
 def status():
     """Quick status check of your DigitalOcean account."""
-    from dom.utils import get_client
+    from dom.utils import console, count_resources, get_account, get_client
 
     client = get_client()
+    account = get_account(client)
 
     console.print("\n[bold]DigitalOcean Account Status[/bold]\n")
 
     # Account info
-    account = client.account.get()["account"]
     console.print(f"  Email: {account['email']}")
     console.print(f"  Status: {account['status']}")
     console.print(f"  Droplet Limit: {account['droplet_limit']}")
 
     # Quick resource count
-    droplets = client.droplets.list()
-    volumes = client.volumes.list()
-    domains = client.domains.list()
-
     console.print("\n[bold]Resources:[/bold]")
-    console.print(f"  Droplets: {len(droplets.get('droplets', []))}")
-    console.print(f"  Volumes: {len(volumes.get('volumes', []))}")
-    console.print(f"  Domains: {len(domains.get('domains', []))}")
+    console.print(f"  Droplets: {count_resources(client, 'droplets')}")
+    console.print(f"  Volumes: {count_resources(client, 'volumes')}")
+    console.print(f"  Domains: {count_resources(client, 'domains')}")
     console.print()
 
 
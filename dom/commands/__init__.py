@@ -1,5 +1,7 @@
-"""CLI commands."""
+"""CLI commands.
 
-from . import audit, costs, cleanup, export, tf, ans
+Sub-command modules are imported on demand by ``dom.cli`` so that startup
+only pays for the command being run.
+"""
 
 __all__ = ["audit", "costs", "cleanup", "export", "tf", "ans"]
@@ -1,6 +1,9 @@
 """Ansible wrapper commands."""
 
+import json
+import shlex
 import subprocess
+import sys
 from pathlib import Path
 from typing import Optional
 
@@ -8,16 +11,57 @@ import typer
 from rich.console import Console
 from rich.table import Table
 
+from dom.utils.output import RowWriter, check_format, record_row
+
 app = typer.Typer(no_args_is_help=True)
 console = Console()
 
 ANSIBLE_DIR = Path("./ansible")
 INVENTORY_DIR = Path("./inventory")  # Relative to ANSIBLE_DIR
 PLAYBOOKS_DIR = Path("./playbooks")  # Relative to ANSIBLE_DIR
+DYNAMIC_INVENTORY = "dom_inventory.sh"  # In ANSIBLE_DIR / "inventory"
+
+# Set from the --dynamic flag of the ans group.
+_options = {"dynamic": False}
 
 
-def get_inventory_file() -> Path:
-    """Get the inventory file path (relative to ANSIBLE_DIR)."""
+@app.callback()
+def ans_main(
+    dynamic: bool = typer.Option(
+        False, "--dynamic", envvar="DOM_ANSIBLE_DYNAMIC",
+        help="Use dom as a dynamic inventory instead of the exported files",
+    ),
+):
+    """Ansible commands (ping, probe, play, shell)."""
+    _options["dynamic"] = dynamic
+
+
+def write_inventory_script() -> Path:
+    """Write the executable that lets Ansible call `dom ans inventory`."""
+    script = ANSIBLE_DIR / "inventory" / DYNAMIC_INVENTORY
+    script.parent.mkdir(parents=True, exist_ok=True)
+    content = (
+        "#!/bin/sh\n"
+        "# Generated by dom: Ansible dynamic inventory\n"
+        f'exec {shlex.quote(sys.executable)} -m dom ans inventory "$@"\n'
+    )
+    if not script.exists() or script.read_text() != content:
+        script.write_text(content)
+    script.chmod(0o755)
+    return script
+
+
+def get_inventory_file(dynamic: Optional[bool] = None) -> Path:
+    """Get the inventory file path (relative to ANSIBLE_DIR).
+
+    In dynamic mode this is a script that prints the inventory from dom's cache.
+    """
+    if dynamic is None:
+        dynamic = _options["dynamic"]
+    if dynamic:
+        write_inventory_script()
+        return INVENTORY_DIR / DYNAMIC_INVENTORY
+
     ini_file = ANSIBLE_DIR / "inventory" / "inventory.ini"
     yml_file = ANSIBLE_DIR / "inventory" / "inventory.yml"
 
@@ -27,7 +71,7 @@ def get_inventory_file() -> Path:
         return INVENTORY_DIR / "inventory.yml"
     else:
         console.print(f"[red]Error:[/red] No inventory found in {ANSIBLE_DIR / 'inventory'}")
-        console.print("Run 'dom export ansible' first")
+        console.print("Run 'dom export ansible' first, or use 'dom ans --dynamic'")
         raise typer.Exit(1)
 
 
@@ -56,6 +100,94 @@ def ans_ping(
     run_ansible(["-i", str(inventory), host, "-m", "ping"])
 
 
+@app.command("probe")
+def ans_probe(
+    host: str = typer.Argument(
+        "all",
+        help="Host pattern: all, host or group names, wildcards, comma-separated",
+    ),
+    port: int = typer.Option(22, "--port", "-p", help="TCP port to check"),
+    concurrency: int = typer.Option(
+        256, "--concurrency", "-c", min=1, help="Hosts checked at the same time"
+    ),
+    timeout: float = typer.Option(
+        3.0, "--timeout", "-t", min=0.01, help="Seconds per host, connect plus banner"
+    ),
+    banner: bool = typer.Option(
+        True, "--banner/--no-banner", help="Also wait for the SSH banner"
+    ),
+    private: bool = typer.Option(
+        False, "--private", help="Use private IPs (when running inside the VPC)"
+    ),
+    fmt: str = typer.Option(
+        "table",
+        "--format",
+        "-f",
+        callback=check_format,
+        help="Output format: table, ndjson, csv, json",
+    ),
+):
+    """Check TCP/SSH reachability of inventory hosts, without Ansible.
+
+    Much faster than `ans ping`: one process probes every host
+    concurrently instead of forking an SSH session per host.
+    """
+    import asyncio
+    import time
+
+    from dom.utils.inventory import inventory_json, select_hosts
+    from dom.utils.probe import ProbeResult, sweep
+
+    err_console = Console(stderr=True)
+    inventory = json.loads(inventory_json())
+    hostvars = inventory["_meta"]["hostvars"]
+    targets = []
+    for name in select_hosts(inventory, host):
+        address = hostvars[name]["do_private_ip" if private else "ansible_host"]
+        if address:
+            targets.append((name, address, port))
+    if not targets:
+        err_console.print(f"[yellow]No hosts match {host!r}[/yellow]")
+        raise typer.Exit(1)
+
+    started = time.perf_counter()
+    results = asyncio.run(
+        sweep(targets, concurrency=concurrency, timeout=timeout, banner=banner)
+    )
+    elapsed = time.perf_counter() - started
+
+    if fmt != "table":
+        with RowWriter(fmt, ProbeResult._fields) as writer:
+            for r in results:
+                writer.write(record_row(r))
+    else:
+        table = Table(title=f"Probe :{port}")
+        table.add_column("Host", style="green")
+        table.add_column("Address")
+        table.add_column("Status")
+        table.add_column("Connect", justify="right")
+        table.add_column("Banner")
+        for r in results:
+            color = "green" if r.reachable else "red"
+            status = f"[{color}]{r.status}[/{color}]"
+            connect = f"{r.connect_ms:.1f} ms" if r.connect_ms is not None else "-"
+            banner_text = r.banner or f"[dim]{r.error}[/dim]"
+            table.add_row(r.host, r.address, status, connect, banner_text)
+        console.print(table)
+
+    reachable = sum(1 for r in results if r.reachable)
+    latencies = sorted(r.connect_ms for r in results if r.connect_ms is not None)
+    summary = f"{reachable}/{len(results)} reachable in {elapsed:.2f}s"
+    if latencies:
+        p50 = latencies[len(latencies) // 2]
+        p95 = latencies[min(len(latencies) - 1, len(latencies) * 95 // 100)]
+        summary += f", connect p50 {p50:.1f} ms, p95 {p95:.1f} ms"
+    if reachable < len(results):
+        err_console.print(f"[yellow]{summary}[/yellow]")
+        raise typer.Exit(1)
+    err_console.print(f"[dim]{summary}[/dim]")
+
+
 @app.command("play")
 def ans_play(
     playbook: str = typer.Argument(..., help="Playbook name (e.g., setup-base.yml)"),
@@ -89,8 +221,25 @@ def ans_play(
 
 
 @app.command("inventory")
-def ans_inventory():
-    """Show current inventory."""
+def ans_inventory(
+    list_all: bool = typer.Option(
+        False, "--list", help="Print the dynamic inventory as JSON (for Ansible)"
+    ),
+    host: Optional[str] = typer.Option(
+        None, "--host", help="Print the variables of one host as JSON"
+    ),
+):
+    """Show current inventory, or act as an Ansible dynamic inventory."""
+    if list_all or host is not None or _options["dynamic"]:
+        from dom.utils.inventory import host_json, inventory_json
+
+        data = host_json(host) if host is not None else inventory_json()
+        if list_all or host is not None:
+            sys.stdout.write(data + "\n")
+        else:
+            console.print_json(data)
+        return
+
     inventory = get_inventory_file()
     full_path = ANSIBLE_DIR / inventory
 
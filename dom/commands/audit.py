@@ -1,180 +1,180 @@
 """Audit commands - list and inspect DigitalOcean resources."""
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 import typer
 from rich.console import Console
 from rich.table import Table
 
-from dom.utils import get_client
+from dom.utils import accounts, aio, get_client, iter_models, list_models
+from dom.utils.accounts import ACCOUNTS_HELP, ALL_ACCOUNTS_HELP
+from dom.utils.models import MODELS, DomainRecord
+from dom.utils.output import RowWriter, check_format, record_row
+from dom.utils.profile import phase
+from dom.utils.zones import DEFAULT_ZONE_CONCURRENCY, crawl_records
 
 app = typer.Typer(no_args_is_help=True)
 console = Console()
+err_console = Console(stderr=True)
+
+FORMAT_HELP = "Output format: table, ndjson, csv, json (streamed)"
+
+
+def _render_droplets(droplets: list) -> None:
+    if not droplets:
+        console.print("[dim]  No droplets found[/dim]")
+        return
+    table = Table()
+    table.add_column("ID", style="cyan")
+    table.add_column("Name", style="green")
+    table.add_column("Region")
+    table.add_column("Size")
+    table.add_column("IP")
+    table.add_column("Status")
+
+    for d in droplets:
+        table.add_row(str(d.id), d.name, d.region, d.size, d.ip or "-", d.status)
+    console.print(table)
+
+
+def _render_volumes(volumes: list) -> None:
+    if not volumes:
+        console.print("[dim]  No volumes found[/dim]")
+        return
+    table = Table()
+    table.add_column("ID", style="cyan")
+    table.add_column("Name", style="green")
+    table.add_column("Size (GB)")
+    table.add_column("Region")
+    table.add_column("Attached To")
+
+    for v in volumes:
+        attached = ", ".join(str(d) for d in v.droplet_ids) or "-"
+        table.add_row(v.id, v.name, str(v.size_gigabytes), v.region, attached)
+    console.print(table)
+
+
+def _render_domains(domains: list) -> None:
+    if not domains:
+        console.print("[dim]  No domains found[/dim]")
+        return
+    for domain in domains:
+        console.print(f"  - {domain.name}")
+
+
+def _render_firewalls(firewalls: list) -> None:
+    if not firewalls:
+        console.print("[dim]  No firewalls found[/dim]")
+        return
+    for fw in firewalls:
+        console.print(f"  - {fw.name} ({len(fw.droplet_ids)} droplets)")
+
+
+def _render_load_balancers(lbs: list) -> None:
+    if not lbs:
+        console.print("[dim]  No load balancers found[/dim]")
+        return
+    for lb in lbs:
+        console.print(f"  - {lb.name} ({lb.ip}) - {lb.status}")
+
+
+def _render_databases(databases: list) -> None:
+    if not databases:
+        console.print("[dim]  No database clusters found[/dim]")
+        return
+    table = Table()
+    table.add_column("Name", style="green")
+    table.add_column("Engine")
+    table.add_column("Size")
+    table.add_column("Region")
+    table.add_column("Status")
+
+    for db in databases:
+        table.add_row(
+            db.name, f"{db.engine} {db.version}", db.size, db.region, db.status
+        )
+    console.print(table)
+
+
+def _render_kubernetes(clusters: list) -> None:
+    if not clusters:
+        console.print("[dim]  No kubernetes clusters found[/dim]")
+        return
+    table = Table()
+    table.add_column("Name", style="green")
+    table.add_column("Region")
+    table.add_column("Version")
+    table.add_column("Nodes")
+    table.add_column("Status")
+
+    for k in clusters:
+        table.add_row(k.name, k.region, k.version, str(k.node_count), k.status)
+    console.print(table)
+
+
+def _render_apps(apps: list) -> None:
+    if not apps:
+        console.print("[dim]  No apps found[/dim]")
+        return
+    for app in apps:
+        console.print(f"  - {app.name} - {app.live_url or 'no url'}")
+
+
+# (title, resource type, renderer) in the order sections are printed
+AUDIT_SECTIONS = [
+    ("Droplets", "droplets", _render_droplets),
+    ("Volumes", "volumes", _render_volumes),
+    ("Domains", "domains", _render_domains),
+    ("Firewalls", "firewalls", _render_firewalls),
+    ("Load Balancers", "load_balancers", _render_load_balancers),
+    ("Database Clusters", "databases", _render_databases),
+    ("Kubernetes Clusters", "kubernetes", _render_kubernetes),
+    ("Apps (App Platform)", "apps", _render_apps),
+]
 
 
 @app.command("all")
-def audit_all():
-    """List all resources in your account."""
+def audit_all(
+    fmt: str = typer.Option(
+        "table", "--format", "-f", callback=check_format, help=FORMAT_HELP
+    ),
+    account_names: Optional[str] = typer.Option(None, "--accounts", help=ACCOUNTS_HELP),
+    all_accounts: bool = typer.Option(False, "--all-accounts", help=ALL_ACCOUNTS_HELP),
+):
+    """List all resources in your account, or in several with --accounts."""
+    try:
+        selected = accounts.select(account_names, all_accounts)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--accounts")
+    if selected:
+        _audit_accounts(selected, fmt)
+        return
+
     client = get_client()
 
+    if fmt != "table":
+        _stream_all(client, fmt)
+        return
+
     console.print("\n[bold]DigitalOcean Resource Audit[/bold]\n")
 
-    # Droplets
-    console.print("[bold cyan]Droplets[/bold cyan]")
-    try:
-        droplets = client.droplets.list().get("droplets", [])
-        if droplets:
-            table = Table()
-            table.add_column("ID", style="cyan")
-            table.add_column("Name", style="green")
-            table.add_column("Region")
-            table.add_column("Size")
-            table.add_column("IP")
-            table.add_column("Status")
-
-            for d in droplets:
-                ip = d["networks"]["v4"][0]["ip_address"] if d["networks"]["v4"] else "-"
-                table.add_row(
-                    str(d["id"]),
-                    d["name"],
-                    d["region"]["slug"],
-                    d["size_slug"],
-                    ip,
-                    d["status"],
-                )
-            console.print(table)
-        else:
-            console.print("[dim]  No droplets found[/dim]")
-    except Exception as e:
-        console.print(f"[red]  Error: {e}[/red]")
-
-    # Volumes
-    console.print("\n[bold cyan]Volumes[/bold cyan]")
-    try:
-        volumes = client.volumes.list().get("volumes", [])
-        if volumes:
-            table = Table()
-            table.add_column("ID", style="cyan")
-            table.add_column("Name", style="green")
-            table.add_column("Size (GB)")
-            table.add_column("Region")
-            table.add_column("Attached To")
-
-            for v in volumes:
-                attached = ", ".join(str(d) for d in v.get("droplet_ids", [])) or "-"
-                table.add_row(
-                    v["id"],
-                    v["name"],
-                    str(v["size_gigabytes"]),
-                    v["region"]["slug"],
-                    attached,
-                )
-            console.print(table)
-        else:
-            console.print("[dim]  No volumes found[/dim]")
-    except Exception as e:
-        console.print(f"[red]  Error: {e}[/red]")
-
-    # Domains
-    console.print("\n[bold cyan]Domains[/bold cyan]")
-    try:
-        domains = client.domains.list().get("domains", [])
-        if domains:
-            for domain in domains:
-                console.print(f"  - {domain['name']}")
-        else:
-            console.print("[dim]  No domains found[/dim]")
-    except Exception as e:
-        console.print(f"[red]  Error: {e}[/red]")
-
-    # Firewalls
-    console.print("\n[bold cyan]Firewalls[/bold cyan]")
-    try:
-        firewalls = client.firewalls.list().get("firewalls", [])
-        if firewalls:
-            for fw in firewalls:
-                console.print(f"  - {fw['name']} ({len(fw.get('droplet_ids', []))} droplets)")
-        else:
-            console.print("[dim]  No firewalls found[/dim]")
-    except Exception as e:
-        console.print(f"[red]  Error: {e}[/red]")
-
-    # Load Balancers
-    console.print("\n[bold cyan]Load Balancers[/bold cyan]")
-    try:
-        lbs = client.load_balancers.list().get("load_balancers", [])
-        if lbs:
-            for lb in lbs:
-                console.print(f"  - {lb['name']} ({lb['ip']}) - {lb['status']}")
-        else:
-            console.print("[dim]  No load balancers found[/dim]")
-    except Exception as e:
-        console.print(f"[red]  Error: {e}[/red]")
-
-    # Databases
-    console.print("\n[bold cyan]Database Clusters[/bold cyan]")
-    try:
-        databases = client.databases.list_clusters().get("databases", [])
-        if databases:
-            table = Table()
-            table.add_column("Name", style="green")
-            table.add_column("Engine")
-            table.add_column("Size")
-            table.add_column("Region")
-            table.add_column("Status")
-
-            for db in databases:
-                table.add_row(
-                    db["name"],
-                    f"{db['engine']} {db['version']}",
-                    db["size"],
-                    db["region"],
-                    db["status"],
-                )
-            console.print(table)
-        else:
-            console.print("[dim]  No database clusters found[/dim]")
-    except Exception as e:
-        console.print(f"[red]  Error: {e}[/red]")
-
-    # Kubernetes
-    console.print("\n[bold cyan]Kubernetes Clusters[/bold cyan]")
-    try:
-        clusters = client.kubernetes.list_clusters().get("kubernetes_clusters", [])
-        if clusters:
-            table = Table()
-            table.add_column("Name", style="green")
-            table.add_column("Region")
-            table.add_column("Version")
-            table.add_column("Nodes")
-            table.add_column("Status")
-
-            for k in clusters:
-                node_count = sum(p["count"] for p in k.get("node_pools", []))
-                table.add_row(
-                    k["name"],
-                    k["region"],
-                    k["version"],
-                    str(node_count),
-                    k["status"]["state"],
-                )
-            console.print(table)
-        else:
-            console.print("[dim]  No kubernetes clusters found[/dim]")
-    except Exception as e:
-        console.print(f"[red]  Error: {e}[/red]")
-
-    # Apps (App Platform)
-    console.print("\n[bold cyan]Apps (App Platform)[/bold cyan]")
-    try:
-        apps = client.apps.list().get("apps", [])
-        if apps:
-            for app in apps:
-                console.print(f"  - {app['spec']['name']} - {app.get('live_url', 'no url')}")
-        else:
-            console.print("[dim]  No apps found[/dim]")
-    except Exception as e:
-        console.print(f"[red]  Error: {e}[/red]")
+    # Fetch every section at once; print them in order as each one (and all
+    # the ones before it) is ready, so wall time is the slowest endpoint.
+    with ThreadPoolExecutor(max_workers=len(AUDIT_SECTIONS)) as pool:
+        futures = [
+            pool.submit(list_models, client, kind) for _, kind, _ in AUDIT_SECTIONS
+        ]
+        sections = zip(AUDIT_SECTIONS, futures)
+        for i, ((title, kind, render), future) in enumerate(sections):
+            prefix = "\n" if i else ""
+            console.print(f"{prefix}[bold cyan]{title}[/bold cyan]")
+            try:
+                records = future.result()
+                with phase(f"render {kind}"):
+                    render(records)
+            except Exception as e:
+                console.print(f"[red]  Error: {e}[/red]")
 
     # Spaces (object storage buckets)
     console.print("\n[bold cyan]Spaces[/bold cyan]")
@@ -183,10 +183,93 @@ def audit_all():
     console.print()
 
 
+def _section_fields(*first: str) -> list:
+    fields = list(first)
+    for _, kind, _ in AUDIT_SECTIONS:
+        fields.extend(f for f in MODELS[kind]._fields if f not in fields)
+    return fields
+
+
+def _stream_all(client, fmt: str) -> None:
+    """Stream every section's rows, tagged with their type, one section at a time."""
+    with RowWriter(fmt, _section_fields("type")) as writer:
+        for _, kind, _ in AUDIT_SECTIONS:
+            try:
+                with phase(f"stream {kind}"):  # fetch and write interleave
+                    for record in iter_models(client, kind):
+                        writer.write(record_row(record, type=kind))
+            except Exception as e:
+                err_console.print(f"[red]Error listing {kind}: {e}[/red]")
+
+
+def _fetch_sections(account: accounts.Account) -> list:
+    """Every section of one account, fetched at once.
+
+    A section that failed holds its exception instead of its records.
+    """
+    client = accounts.client_for(account)
+    kinds = [kind for _, kind, _ in AUDIT_SECTIONS]
+    with ThreadPoolExecutor(max_workers=len(kinds)) as pool:
+        futures = [pool.submit(list_models, client, kind) for kind in kinds]
+    sections = []
+    for future in futures:
+        try:
+            sections.append(future.result())
+        except Exception as e:
+            sections.append(e)
+    return sections
+
+
+def _audit_accounts(selected: list, fmt: str) -> None:
+    """One report for several accounts, fetched in parallel and labelled by account."""
+    if fmt != "table":
+        with RowWriter(fmt, _section_fields("account", "type")) as writer:
+            for account, future in accounts.in_parallel(selected, _fetch_sections):
+                for (_, kind, _), records in zip(AUDIT_SECTIONS, future.result()):
+                    name = account.name
+                    if isinstance(records, Exception):
+                        err_console.print(
+                            f"[red]Error listing {kind} in {name}: {records}[/red]"
+                        )
+                        continue
+                    for record in records:
+                        writer.write(record_row(record, account=name, type=kind))
+        return
+
+    console.print(
+        f"\n[bold]DigitalOcean Resource Audit[/bold] ({len(selected)} accounts)\n"
+    )
+    summary = Table(title="Accounts")
+    summary.add_column("Account", style="magenta")
+    for title, _, _ in AUDIT_SECTIONS:
+        summary.add_column(title, justify="right")
+
+    for account, future in accounts.in_parallel(selected, _fetch_sections):
+        console.print(f"[bold magenta]== {account.name} ==[/bold magenta]\n")
+        counts = []
+        for (title, kind, render), records in zip(AUDIT_SECTIONS, future.result()):
+            console.print(f"[bold cyan]{title}[/bold cyan] [dim]({account.name})[/dim]")
+            if isinstance(records, Exception):
+                console.print(f"[red]  Error: {records}[/red]")
+                counts.append("[red]error[/red]")
+            else:
+                with phase(f"render {kind}"):
+                    render(records)
+                counts.append(str(len(records)))
+            console.print()
+        summary.add_row(account.name, *counts)
+
+    console.print(summary)
+    console.print()
+
+
 @app.command("droplets")
 def audit_droplets(
     region: Optional[str] = typer.Option(None, "--region", "-r", help="Filter by region"),
     tag: Optional[str] = typer.Option(None, "--tag", "-t", help="Filter by tag"),
+    fmt: str = typer.Option(
+        "table", "--format", "-f", callback=check_format, help=FORMAT_HELP
+    ),
 ):
     """List all droplets with details."""
     client = get_client()
@@ -195,78 +278,105 @@ def audit_droplets(
     if tag:
         params["tag_name"] = tag
 
-    droplets = client.droplets.list(**params).get("droplets", [])
+    if fmt != "table":
+        fields = MODELS["droplets"]._fields
+        with phase("stream droplets"), RowWriter(fmt, fields) as writer:
+            for d in iter_models(client, "droplets", **params):
+                if not region or d.region == region:
+                    writer.write(record_row(d))
+        return
+
+    droplets = list_models(client, "droplets", **params)
 
     if region:
-        droplets = [d for d in droplets if d["region"]["slug"] == region]
+        droplets = [d for d in droplets if d.region == region]
 
     if not droplets:
         console.print("[dim]No droplets found[/dim]")
         return
 
-    table = Table(title="Droplets")
-    table.add_column("ID", style="cyan")
-    table.add_column("Name", style="green")
-    table.add_column("Region")
-    table.add_column("Size")
-    table.add_column("vCPUs")
-    table.add_column("Memory")
-    table.add_column("Disk")
-    table.add_column("IP")
-    table.add_column("Status")
-    table.add_column("Tags")
-
-    for d in droplets:
-        ip = d["networks"]["v4"][0]["ip_address"] if d["networks"]["v4"] else "-"
-        tags = ", ".join(d.get("tags", [])) or "-"
-        table.add_row(
-            str(d["id"]),
-            d["name"],
-            d["region"]["slug"],
-            d["size_slug"],
-            str(d["vcpus"]),
-            f"{d['memory']} MB",
-            f"{d['disk']} GB",
-            ip,
-            d["status"],
-            tags,
-        )
-
-    console.print(table)
+    with phase("render droplets"):
+        table = Table(title="Droplets")
+        table.add_column("ID", style="cyan")
+        table.add_column("Name", style="green")
+        table.add_column("Region")
+        table.add_column("Size")
+        table.add_column("vCPUs")
+        table.add_column("Memory")
+        table.add_column("Disk")
+        table.add_column("IP")
+        table.add_column("Status")
+        table.add_column("Tags")
+
+        for d in droplets:
+            table.add_row(
+                str(d.id),
+                d.name,
+                d.region,
+                d.size,
+                str(d.vcpus),
+                f"{d.memory} MB",
+                f"{d.disk} GB",
+                d.ip or "-",
+                d.status,
+                ", ".join(d.tags) or "-",
+            )
+
+        console.print(table)
     console.print(f"\n[dim]Total: {len(droplets)} droplets[/dim]\n")
 
 
 @app.command("domains")
-def audit_domains():
+def audit_domains(
+    concurrency: int = typer.Option(
+        DEFAULT_ZONE_CONCURRENCY,
+        "--concurrency",
+        "-c",
+        help="Max concurrent DNS API requests",
+    ),
+    fmt: str = typer.Option(
+        "table", "--format", "-f", callback=check_format, help=FORMAT_HELP
+    ),
+):
     """List all domains and DNS records."""
-    client = get_client()
+    if fmt != "table":
+        aio.run(_stream_domains(concurrency, fmt))
+        return
+    aio.run(_audit_domains(concurrency))
 
-    domains = client.domains.list().get("domains", [])
 
-    if not domains:
-        console.print("[dim]No domains found[/dim]")
-        return
+async def _stream_domains(concurrency: int, fmt: str) -> None:
+    async with aio.get_async_client() as client:
+        names = [domain.name for domain in await client.list_models("domains")]
+        with RowWriter(fmt, ["domain", *DomainRecord._fields]) as writer:
+            async for zone in crawl_records(client, names, concurrency=concurrency):
+                for r in zone.records:
+                    row = record_row(DomainRecord.from_api(r), domain=zone.domain)
+                    writer.write(row)
 
-    for domain in domains:
-        console.print(f"\n[bold]{domain['name']}[/bold]")
-
-        records = client.domains.list_records(domain["name"]).get("domain_records", [])
-
-        if records:
-            table = Table()
-            table.add_column("Type", style="cyan")
-            table.add_column("Name", style="green")
-            table.add_column("Data")
-            table.add_column("TTL")
-
-            for r in records:
-                table.add_row(
-                    r["type"],
-                    r["name"],
-                    r["data"],
-                    str(r["ttl"]),
-                )
-            console.print(table)
+
+async def _audit_domains(concurrency: int) -> None:
+    async with aio.get_async_client() as client:
+        domains = await client.list_models("domains")
+
+        if not domains:
+            console.print("[dim]No domains found[/dim]")
+            return
+
+        names = [domain.name for domain in domains]
+        async for zone in crawl_records(client, names, concurrency=concurrency):
+            console.print(f"\n[bold]{zone.domain}[/bold]")
+
+            if zone.records:
+                table = Table()
+                table.add_column("Type", style="cyan")
+                table.add_column("Name", style="green")
+                table.add_column("Data")
+                table.add_column("TTL")
+
+                for r in map(DomainRecord.from_api, zone.records):
+                    table.add_row(r.type, r.name, r.data, str(r.ttl))
+                console.print(table)
 
     console.print()
 
@@ -276,32 +386,26 @@ def audit_firewalls():
     """List all firewalls and their rules."""
     client = get_client()
 
-    firewalls = client.firewalls.list().get("firewalls", [])
+    firewalls = list_models(client, "firewalls")
 
     if not firewalls:
         console.print("[dim]No firewalls found[/dim]")
         return
 
     for fw in firewalls:
-        console.print(f"\n[bold]{fw['name']}[/bold] ({fw['id']})")
-        console.print(f"  Droplets: {len(fw.get('droplet_ids', []))}")
+        console.print(f"\n[bold]{fw.name}[/bold] ({fw.id})")
+        console.print(f"  Droplets: {len(fw.droplet_ids)}")
 
         # Inbound rules
-        inbound = fw.get("inbound_rules", [])
-        if inbound:
+        if fw.inbound_rules:
             console.print("  [green]Inbound:[/green]")
-            for rule in inbound:
-                sources = rule.get("sources", {})
-                src = sources.get("addresses", sources.get("droplet_ids", ["any"]))
-                console.print(f"    {rule['protocol']}:{rule['ports']} from {src}")
+            for rule in fw.inbound_rules:
+                console.print(f"    {rule.protocol}:{rule.ports} from {rule.targets}")
 
         # Outbound rules
-        outbound = fw.get("outbound_rules", [])
-        if outbound:
+        if fw.outbound_rules:
             console.print("  [yellow]Outbound:[/yellow]")
-            for rule in outbound:
-                destinations = rule.get("destinations", {})
-                dst = destinations.get("addresses", destinations.get("droplet_ids", ["any"]))
-                console.print(f"    {rule['protocol']}:{rule['ports']} to {dst}")
+            for rule in fw.outbound_rules:
+                console.print(f"    {rule.protocol}:{rule.ports} to {rule.targets}")
 
     console.print()
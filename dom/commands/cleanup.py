@@ -4,11 +4,49 @@ import typer
 from rich.console import Console
 from rich.table import Table
 
-from dom.utils import get_client
+from dom.utils import get_client, invalidate, list_models
+from dom.utils.bulk import (
+    DEFAULT_BULK_CONCURRENCY,
+    Journal,
+    Target,
+    bulk_delete,
+    journal_path,
+    print_report,
+)
+from dom.utils.pricing import get_catalog
 
 app = typer.Typer(no_args_is_help=True)
 console = Console()
 
+CONCURRENCY_HELP = "Max deletes in flight at once"
+
+
+def _delete_all(
+    client, kind: str, targets: list, delete, noun: str, force: bool, concurrency: int
+) -> None:
+    """Confirm, then bulk-delete ``targets`` and print the report."""
+    if not force:
+        confirm = typer.confirm(f"Delete {len(targets)} {noun}?")
+        if not confirm:
+            console.print("[dim]Aborted[/dim]")
+            return
+
+    journal = Journal(journal_path(client.dom_account, kind))
+    try:
+        report = bulk_delete(
+            targets,
+            delete,
+            journal,
+            label=f"Deleting {noun}",
+            concurrency=concurrency,
+            console=console,
+        )
+    finally:
+        invalidate(client, kind)
+    print_report(console, report, noun)
+    if report.failed:
+        raise typer.Exit(1)
+
 
 @app.command("all")
 def cleanup_all(
@@ -16,6 +54,7 @@ def cleanup_all(
 ):
     """Find all orphaned and unused resources."""
     client = get_client()
+    catalog = get_catalog(client)
 
     console.print("\n[bold]Cleanup Analysis[/bold]")
     if dry_run:
@@ -24,8 +63,8 @@ def cleanup_all(
     issues_found = False
 
     # Unattached volumes
-    volumes = client.volumes.list().get("volumes", [])
-    unattached = [v for v in volumes if not v.get("droplet_ids")]
+    volumes = list_models(client, "volumes")
+    unattached = [v for v in volumes if not v.droplet_ids]
 
     if unattached:
         issues_found = True
@@ -35,18 +74,18 @@ def cleanup_all(
         table.add_column("Size (GB)")
         table.add_column("Monthly Cost", justify="right")
 
-        total_cost = 0
+        total_cost = 0.0
         for v in unattached:
-            cost = v["size_gigabytes"] * 0.10
+            cost = catalog.volume(v.size_gigabytes)
             total_cost += cost
-            table.add_row(v["id"], v["name"], str(v["size_gigabytes"]), f"${cost:.2f}")
+            table.add_row(v.id, v.name, str(v.size_gigabytes), f"${cost:.2f}")
 
         console.print(table)
         console.print(f"[yellow]Potential savings: ${total_cost:.2f}/month[/yellow]\n")
 
     # Unused snapshots (older than 90 days)
     try:
-        snapshots = client.snapshots.list().get("snapshots", [])
+        snapshots = list_models(client, "snapshots")
         # Could add age filtering here
         if snapshots:
             console.print(f"[dim]Found {len(snapshots)} snapshots - review manually[/dim]")
@@ -58,8 +97,8 @@ def cleanup_all(
 
     # Floating IPs not attached
     try:
-        floating_ips = client.floating_ips.list().get("floating_ips", [])
-        unassigned = [ip for ip in floating_ips if not ip.get("droplet")]
+        floating_ips = list_models(client, "floating_ips")
+        unassigned = [ip for ip in floating_ips if ip.droplet_id is None]
 
         if unassigned:
             issues_found = True
@@ -68,17 +107,20 @@ def cleanup_all(
             table.add_column("Region")
 
             for ip in unassigned:
-                table.add_row(ip["ip"], ip["region"]["slug"])
+                table.add_row(ip.ip, ip.region)
 
             console.print(table)
-            console.print("[yellow]Floating IPs cost $5/month when not attached[/yellow]\n")
+            price = catalog.floating_ip(assigned=False)
+            console.print(
+                f"[yellow]Floating IPs cost ${price:.0f}/month when not attached[/yellow]\n"
+            )
     except Exception:
         pass
 
     # Load balancers with no backends
     try:
-        lbs = client.load_balancers.list().get("load_balancers", [])
-        empty_lbs = [lb for lb in lbs if not lb.get("droplet_ids")]
+        lbs = list_models(client, "load_balancers")
+        empty_lbs = [lb for lb in lbs if not lb.droplet_ids]
 
         if empty_lbs:
             issues_found = True
@@ -88,10 +130,11 @@ def cleanup_all(
             table.add_column("Region")
 
             for lb in empty_lbs:
-                table.add_row(lb["id"], lb["name"], lb["region"])
+                table.add_row(lb.id, lb.name, lb.region)
 
             console.print(table)
-            console.print("[yellow]Load balancers cost $12+/month[/yellow]\n")
+            cost = sum(catalog.load_balancer(lb) for lb in empty_lbs)
+            console.print(f"[yellow]Potential savings: ${cost:.2f}/month[/yellow]\n")
     except Exception:
         pass
 
@@ -101,14 +144,20 @@ def cleanup_all(
 
 @app.command("volumes")
 def cleanup_volumes(
-    dry_run: bool = typer.Option(True, "--dry-run/--execute", help="Show vs actually delete"),
+    dry_run: bool = typer.Option(
+        True, "--dry-run/--execute", help="Show vs actually delete"
+    ),
     force: bool = typer.Option(False, "--force", "-f", help="Skip confirmation"),
+    concurrency: int = typer.Option(
+        DEFAULT_BULK_CONCURRENCY, "--concurrency", "-c", help=CONCURRENCY_HELP
+    ),
 ):
     """Find and optionally delete unattached volumes."""
     client = get_client()
 
-    volumes = client.volumes.list().get("volumes", [])
-    unattached = [v for v in volumes if not v.get("droplet_ids")]
+    # deciding what to delete from a stale cached listing is not safe
+    volumes = list_models(client, "volumes", refresh=not dry_run)
+    unattached = [v for v in volumes if not v.droplet_ids]
 
     if not unattached:
         console.print("[green]No unattached volumes found[/green]")
@@ -122,13 +171,7 @@ def cleanup_volumes(
     table.add_column("Created")
 
     for v in unattached:
-        table.add_row(
-            v["id"],
-            v["name"],
-            str(v["size_gigabytes"]),
-            v["region"]["slug"],
-            v["created_at"][:10],
-        )
+        table.add_row(v.id, v.name, str(v.size_gigabytes), v.region, v.created_at[:10])
 
     console.print(table)
 
@@ -136,37 +179,34 @@ def cleanup_volumes(
         console.print("\n[yellow]DRY RUN - use --execute to delete[/yellow]")
         return
 
-    if not force:
-        confirm = typer.confirm(f"Delete {len(unattached)} volumes?")
-        if not confirm:
-            console.print("[dim]Aborted[/dim]")
-            return
-
-    for v in unattached:
-        try:
-            client.volumes.delete(v["id"])
-            console.print(f"[green]Deleted:[/green] {v['name']}")
-        except Exception as e:
-            console.print(f"[red]Failed to delete {v['name']}:[/red] {e}")
+    targets = [Target(v.id, v.name) for v in unattached]
+    delete = client.volumes.delete
+    _delete_all(client, "volumes", targets, delete, "volumes", force, concurrency)
 
 
 @app.command("snapshots")
 def cleanup_snapshots(
     days: int = typer.Option(90, "--older-than", "-d", help="Delete snapshots older than N days"),
-    dry_run: bool = typer.Option(True, "--dry-run/--execute", help="Show vs actually delete"),
+    dry_run: bool = typer.Option(
+        True, "--dry-run/--execute", help="Show vs actually delete"
+    ),
+    force: bool = typer.Option(False, "--force", "-f", help="Skip confirmation"),
+    concurrency: int = typer.Option(
+        DEFAULT_BULK_CONCURRENCY, "--concurrency", "-c", help=CONCURRENCY_HELP
+    ),
 ):
-    """Find old snapshots."""
+    """Find and optionally delete old snapshots."""
     from datetime import datetime, timedelta, timezone
 
     client = get_client()
 
-    snapshots = client.snapshots.list().get("snapshots", [])
+    snapshots = list_models(client, "snapshots", refresh=not dry_run)
 
     cutoff = datetime.now(timezone.utc) - timedelta(days=days)
     old_snapshots = []
 
     for s in snapshots:
-        created = datetime.fromisoformat(s["created_at"].replace("Z", "+00:00"))
+        created = datetime.fromisoformat(s.created_at.replace("Z", "+00:00"))
         if created < cutoff:
             old_snapshots.append(s)
 
@@ -181,14 +221,58 @@ def cleanup_snapshots(
     table.add_column("Created")
 
     for s in old_snapshots:
-        table.add_row(
-            s["id"],
-            s["name"],
-            str(s["min_disk_size"]),
-            s["created_at"][:10],
+        table.add_row(s.id, s.name, str(s.min_disk_size), s.created_at[:10])
+
+    console.print(table)
+
+    if dry_run:
+        console.print(
+            f"\n[yellow]DRY RUN - found {len(old_snapshots)} old snapshots,"
+            " use --execute to delete[/yellow]"
         )
+        return
+
+    targets = [Target(s.id, s.name) for s in old_snapshots]
+    delete = client.snapshots.delete
+    _delete_all(client, "snapshots", targets, delete, "snapshots", force, concurrency)
+
+
+@app.command("floating-ips")
+def cleanup_floating_ips(
+    dry_run: bool = typer.Option(
+        True, "--dry-run/--execute", help="Show vs actually release"
+    ),
+    force: bool = typer.Option(False, "--force", "-f", help="Skip confirmation"),
+    concurrency: int = typer.Option(
+        DEFAULT_BULK_CONCURRENCY, "--concurrency", "-c", help=CONCURRENCY_HELP
+    ),
+):
+    """Find and optionally release unassigned floating (reserved) IPs."""
+    client = get_client()
+
+    floating_ips = list_models(client, "floating_ips", refresh=not dry_run)
+    unassigned = [ip for ip in floating_ips if ip.droplet_id is None]
+
+    if not unassigned:
+        console.print("[green]No unassigned floating IPs found[/green]")
+        return
+
+    table = Table(title="Unassigned Floating IPs")
+    table.add_column("IP", style="cyan")
+    table.add_column("Region")
+
+    for ip in unassigned:
+        table.add_row(ip.ip, ip.region)
 
     console.print(table)
 
     if dry_run:
-        console.print(f"\n[yellow]DRY RUN - found {len(old_snapshots)} old snapshots[/yellow]")
+        console.print("\n[yellow]DRY RUN - use --execute to release[/yellow]")
+        return
+
+    # Floating IPs were renamed reserved IPs; newer pydo only has the latter.
+    ops = getattr(client, "floating_ips", None) or client.reserved_ips
+    targets = [Target(ip.ip, ip.ip) for ip in unassigned]
+    _delete_all(
+        client, "floating_ips", targets, ops.delete, "floating IPs", force, concurrency
+    )
@@ -1,13 +1,17 @@
 """Cost analysis commands."""
 
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from datetime import datetime
 
 import typer
 from rich.console import Console
 from rich.table import Table
 
-from dom.utils import get_client
+from dom.utils import accounts, get_client, list_models
+from dom.utils.accounts import ACCOUNTS_HELP, ALL_ACCOUNTS_HELP
+from dom.utils.output import RowWriter, check_format
+from dom.utils.pricing import get_catalog
+from dom.utils.profile import phase
 
 app = typer.Typer(no_args_is_help=True)
 console = Console()
@@ -33,26 +37,28 @@ def cost_summary():
 
 
 @app.command("estimate")
-def cost_estimate():
+def cost_estimate(
+    account_names: Optional[str] = typer.Option(None, "--accounts", help=ACCOUNTS_HELP),
+    all_accounts: bool = typer.Option(False, "--all-accounts", help=ALL_ACCOUNTS_HELP),
+):
     """Estimate monthly costs based on current resources."""
+    try:
+        selected = accounts.select(account_names, all_accounts)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--accounts")
+    if selected:
+        _estimate_accounts(selected)
+        return
+
     client = get_client()
+    with phase("fetch catalog"):
+        catalog = get_catalog(client)
 
     console.print("\n[bold]Estimated Monthly Costs[/bold]\n")
 
     total = 0.0
 
-    # Droplet costs (approximate based on common sizes)
-    size_prices = {
-        "s-1vcpu-512mb-10gb": 4,
-        "s-1vcpu-1gb": 6,
-        "s-1vcpu-2gb": 12,
-        "s-2vcpu-2gb": 18,
-        "s-2vcpu-4gb": 24,
-        "s-4vcpu-8gb": 48,
-        "s-8vcpu-16gb": 96,
-    }
-
-    droplets = client.droplets.list().get("droplets", [])
+    droplets = list_models(client, "droplets")
     if droplets:
         table = Table(title="Droplets")
         table.add_column("Name", style="green")
@@ -60,81 +66,144 @@ def cost_estimate():
         table.add_column("Est. Monthly", justify="right")
 
         for d in droplets:
-            price = size_prices.get(d["size_slug"], 0)
-            if price == 0:
-                # Try to extract from size_slug pattern
-                price = d.get("size", {}).get("price_monthly", 0)
+            price = catalog.droplet(d)
             total += price
-            table.add_row(d["name"], d["size_slug"], f"${price:.2f}")
+            table.add_row(d.name, d.size, f"${price:.2f}")
 
         console.print(table)
 
-    # Volume costs ($0.10 per GB/month)
-    volumes = client.volumes.list().get("volumes", [])
+    volumes = list_models(client, "volumes")
     if volumes:
-        table = Table(title="\nVolumes ($0.10/GB/month)")
+        table = Table(title=f"\nVolumes (${catalog.rates['volume_gb']:.2f}/GB/month)")
         table.add_column("Name", style="green")
         table.add_column("Size (GB)", justify="right")
         table.add_column("Est. Monthly", justify="right")
 
         for v in volumes:
-            price = v["size_gigabytes"] * 0.10
+            price = catalog.volume(v.size_gigabytes)
             total += price
-            table.add_row(v["name"], str(v["size_gigabytes"]), f"${price:.2f}")
+            table.add_row(v.name, str(v.size_gigabytes), f"${price:.2f}")
 
         console.print(table)
 
     # Database clusters
     try:
-        databases = client.databases.list_clusters().get("databases", [])
+        databases = list_models(client, "databases")
         if databases:
             table = Table(title="\nDatabase Clusters")
             table.add_column("Name", style="green")
             table.add_column("Engine")
             table.add_column("Size")
+            table.add_column("Nodes", justify="right")
             table.add_column("Est. Monthly", justify="right")
 
             for db in databases:
-                # Approximate prices
-                price = 15  # Base price, actual varies
+                price = catalog.database(db)
                 total += price
-                table.add_row(db["name"], db["engine"], db["size"], f"${price:.2f}+")
+                table.add_row(
+                    db.name, db.engine, db.size, str(db.num_nodes), f"${price:.2f}"
+                )
 
             console.print(table)
     except Exception:
         pass
 
     console.print(f"\n[bold]Estimated Total: ${total:.2f}/month[/bold]")
+    if catalog.source != "api":
+        console.print("[dim]Prices from the bundled catalog (API unreachable).[/dim]")
     console.print("[dim]Note: Estimates are approximate. Check billing for actual costs.[/dim]\n")
 
 
+ESTIMATE_KINDS = [
+    ("Droplets", "droplets"), ("Volumes", "volumes"), ("Databases", "databases"),
+]
+
+
+def _account_costs(
+    account: accounts.Account,
+) -> Tuple[Dict[str, Optional[float]], str]:
+    """Monthly estimate per resource type of one account.
+
+    A type that could not be listed is None.
+    """
+    client = accounts.client_for(account)
+    with phase("fetch catalog"):
+        catalog = get_catalog(client)
+    price = {"droplets": catalog.droplet,
+             "volumes": lambda v: catalog.volume(v.size_gigabytes),
+             "databases": catalog.database}
+    costs: Dict[str, Optional[float]] = {}
+    for _, kind in ESTIMATE_KINDS:
+        try:
+            records = list_models(client, kind)
+            costs[kind] = sum(price[kind](record) for record in records)
+        except Exception:
+            costs[kind] = None
+    return costs, catalog.source
+
+
+def _estimate_accounts(selected: list) -> None:
+    """Cost rollup of several accounts, fetched in parallel."""
+    console.print(
+        f"\n[bold]Estimated Monthly Costs[/bold] ({len(selected)} accounts)\n"
+    )
+
+    table = Table()
+    table.add_column("Account", style="magenta")
+    for title, _ in ESTIMATE_KINDS:
+        table.add_column(title, justify="right")
+    table.add_column("Total", justify="right", style="bold")
+
+    totals = {kind: 0.0 for _, kind in ESTIMATE_KINDS}
+    bundled = []
+    for account, future in accounts.in_parallel(selected, _account_costs):
+        try:
+            costs, source = future.result()
+        except Exception as e:
+            table.add_row(account.name, *["-"] * len(ESTIMATE_KINDS), f"[red]{e}[/red]")
+            continue
+        if source != "api":
+            bundled.append(account.name)
+        cells = []
+        for _, kind in ESTIMATE_KINDS:
+            cost = costs[kind]
+            cells.append("[dim]n/a[/dim]" if cost is None else f"${cost:.2f}")
+            totals[kind] += cost or 0.0
+        total = sum(c or 0.0 for c in costs.values())
+        table.add_row(account.name, *cells, f"${total:.2f}")
+
+    table.add_section()
+    cells = [f"${totals[kind]:.2f}" for _, kind in ESTIMATE_KINDS]
+    table.add_row("All accounts", *cells, f"${sum(totals.values()):.2f}")
+    console.print(table)
+    if bundled:
+        console.print(
+            "[dim]Prices from the bundled catalog (API unreachable)"
+            f" for: {', '.join(bundled)}.[/dim]"
+        )
+    console.print(
+        "[dim]Note: Estimates are approximate. Check billing for actual costs.[/dim]\n"
+    )
+
+
 @app.command("by-tag")
 def cost_by_tag():
     """Break down costs by resource tags."""
     client = get_client()
+    catalog = get_catalog(client)
 
     console.print("\n[bold]Costs by Tag[/bold]\n")
 
-    size_prices = {
-        "s-1vcpu-512mb-10gb": 4,
-        "s-1vcpu-1gb": 6,
-        "s-1vcpu-2gb": 12,
-        "s-2vcpu-2gb": 18,
-        "s-2vcpu-4gb": 24,
-        "s-4vcpu-8gb": 48,
-    }
-
-    droplets = client.droplets.list().get("droplets", [])
+    droplets = list_models(client, "droplets")
 
     tag_costs: dict[str, float] = {}
     untagged = 0.0
 
     for d in droplets:
-        price = size_prices.get(d["size_slug"], 10)
-        tags = d.get("tags", [])
+        price = catalog.droplet(d)
 
-        if tags:
-            for tag in tags:
+        if d.tags:
+            for tag in d.tags:
                 tag_costs[tag] = tag_costs.get(tag, 0) + price
         else:
             untagged += price
@@ -155,3 +224,69 @@ def cost_by_tag():
         console.print("[dim]No tagged resources found[/dim]")
 
     console.print()
+
+
+@app.command("breakdown")
+def cost_breakdown(
+    by: str = typer.Option(
+        "tag", "--by", "-b", help="Comma-separated: type, region, size, tag"
+    ),
+    fmt: str = typer.Option(
+        "table",
+        "--format",
+        "-f",
+        callback=check_format,
+        help="Output format: table, ndjson, csv, json",
+    ),
+):
+    """Break down estimated costs along one or more dimensions."""
+    from dom.utils.costengine import DIMENSIONS, load_frame
+
+    dims = [dim.strip() for dim in by.split(",") if dim.strip()]
+    unknown = [dim for dim in dims if dim not in DIMENSIONS]
+    if unknown:
+        raise typer.BadParameter(
+            f"unknown dimension {unknown[0]!r}, choose from {', '.join(DIMENSIONS)}",
+            param_hint="--by",
+        )
+
+    client = get_client()
+    with phase("fetch catalog"):
+        catalog = get_catalog(client)
+    frame = load_frame(client, catalog)
+    with phase("transform groups"):
+        groups = frame.group_by(dims)
+
+    if fmt != "table":
+        with RowWriter(fmt, [*dims, "items", "monthly"]) as writer:
+            for group in groups:
+                row = dict(zip(dims, group.keys))
+                monthly = round(group.cost, 2)
+                writer.write({**row, "items": group.items, "monthly": monthly})
+        return
+
+    console.print(f"\n[bold]Costs by {', '.join(dims)}[/bold]\n")
+
+    if not groups:
+        console.print("[dim]No billable resources found[/dim]\n")
+        return
+
+    with phase("render groups"):
+        table = Table()
+        for dim in dims:
+            table.add_column(dim.capitalize(), style="cyan" if dim == dims[0] else None)
+        table.add_column("Items", justify="right")
+        table.add_column("Est. Monthly", justify="right")
+
+        for group in groups:
+            table.add_row(*group.keys, str(group.items), f"${group.cost:.2f}")
+
+        console.print(table)
+    console.print(f"\n[bold]Estimated Total: ${frame.total:.2f}/month[/bold]")
+    if "tag" in dims:
+        console.print(
+            "[dim]Resources with several tags count towards each of them.[/dim]"
+        )
+    if frame.skipped:
+        console.print(f"[yellow]Could not list: {', '.join(frame.skipped)}[/yellow]")
+    console.print()
@@ -1,11 +1,18 @@
 """Export commands - generate Terraform/Ansible from existing resources."""
 
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Tuple
 
 import typer
 from rich.console import Console
 
-from dom.utils import get_client
+from dom.utils import get_client, list_models
+from dom.utils.output import write_if_changed
+from dom.utils.profile import phase
+from dom.utils.terraform import import_blocks
 
 app = typer.Typer(no_args_is_help=True)
 console = Console()
@@ -16,21 +23,7 @@ TERRAFORM_DIR = Path("./terraform/generated")
 ANSIBLE_DIR = Path("./ansible/inventory")
 
 
-@app.command("terraform")
-def export_terraform(
-    output: Path = typer.Option(None, "--output", "-o", help="Output directory (default: ./terraform/generated)"),
-    resource_type: str = typer.Option("all", "--type", "-t", help="Resource type: all, droplets, volumes, domains"),
-):
-    if output is None:
-        output = TERRAFORM_DIR
-    """Generate Terraform configurations from existing resources."""
-    client = get_client()
-
-    output.mkdir(parents=True, exist_ok=True)
-
-    console.print(f"\n[bold]Exporting to Terraform[/bold] -> {output}\n")
-
-    tf_content = '''# Generated by dom export terraform
+TF_HEADER = """# Generated by dom export terraform
 # Review and modify before using!
 
 terraform {
@@ -51,106 +44,225 @@ variable "do_token" {
 provider "digitalocean" {
   token = var.do_token
 }
+"""
 
-'''
 
-    import_commands = []
+def _hcl(value: str) -> str:
+    """A quoted HCL string, with template sequences escaped."""
+    return json.dumps(value).replace("${", "$${").replace("%{", "%%{")
 
-    # Export Droplets
-    if resource_type in ["all", "droplets"]:
-        droplets = client.droplets.list().get("droplets", [])
 
-        for d in droplets:
-            name = d["name"].replace("-", "_").replace(".", "_")
-            tf_content += f'''
-# Droplet: {d["name"]}
-resource "digitalocean_droplet" "{name}" {{
-  name     = "{d["name"]}"
-  size     = "{d["size_slug"]}"
-  image    = "{d["image"]["slug"]}"
-  region   = "{d["region"]["slug"]}"
-  vpc_uuid = "{d.get("vpc_uuid", "")}"
-  tags     = {d.get("tags", [])}
-}}
-'''
-            import_commands.append(f"terraform import digitalocean_droplet.{name} {d['id']}")
-
-        console.print(f"  [green]Droplets:[/green] {len(droplets)}")
-
-    # Export Volumes
-    if resource_type in ["all", "volumes"]:
-        volumes = client.volumes.list().get("volumes", [])
-
-        for v in volumes:
-            name = v["name"].replace("-", "_").replace(".", "_")
-            tf_content += f'''
-# Volume: {v["name"]}
-resource "digitalocean_volume" "{name}" {{
-  name                    = "{v["name"]}"
-  region                  = "{v["region"]["slug"]}"
-  size                    = {v["size_gigabytes"]}
-  initial_filesystem_type = "{v.get("filesystem_type", "ext4")}"
-  description             = "{v.get("description", "")}"
-}}
-'''
-            import_commands.append(f"terraform import digitalocean_volume.{name} {v['id']}")
+def _hcl_list(values) -> str:
+    return "[" + ", ".join(_hcl(v) for v in values) + "]"
 
-        console.print(f"  [green]Volumes:[/green] {len(volumes)}")
 
-    # Export Domains
-    if resource_type in ["all", "domains"]:
-        domains = client.domains.list().get("domains", [])
+def _tf_droplet(d) -> str:
+    return f'''  name     = {_hcl(d.name)}
+  size     = {_hcl(d.size)}
+  image    = {_hcl(d.image)}
+  region   = {_hcl(d.region)}
+  vpc_uuid = {_hcl(d.vpc_uuid)}
+  tags     = {_hcl_list(d.tags)}
+'''
+
 
-        for domain in domains:
-            name = domain["name"].replace("-", "_").replace(".", "_")
-            tf_content += f'''
-# Domain: {domain["name"]}
-resource "digitalocean_domain" "{name}" {{
-  name = "{domain["name"]}"
-}}
+def _tf_volume(v) -> str:
+    return f'''  name                    = {_hcl(v.name)}
+  region                  = {_hcl(v.region)}
+  size                    = {v.size_gigabytes}
+  initial_filesystem_type = {_hcl(v.filesystem_type or "ext4")}
+  description             = {_hcl(v.description)}
 '''
-            import_commands.append(f"terraform import digitalocean_domain.{name} {domain['name']}")
 
-        console.print(f"  [green]Domains:[/green] {len(domains)}")
 
-    # Export Firewalls
-    if resource_type in ["all", "firewalls"]:
-        try:
-            firewalls = client.firewalls.list().get("firewalls", [])
+def _tf_domain(domain) -> str:
+    return f"  name = {_hcl(domain.name)}\n"
+
 
-            for fw in firewalls:
-                name = fw["name"].replace("-", "_").replace(".", "_")
-                tf_content += f'''
-# Firewall: {fw["name"]}
-resource "digitalocean_firewall" "{name}" {{
-  name = "{fw["name"]}"
+def _tf_firewall(fw) -> str:
+    return f'''  name = {_hcl(fw.name)}
   # TODO: Add inbound_rule and outbound_rule blocks
   # See: https://registry.terraform.io/providers/digitalocean/digitalocean/latest/docs/resources/firewall
-}}
 '''
-                import_commands.append(f"terraform import digitalocean_firewall.{name} {fw['id']}")
 
-            console.print(f"  [green]Firewalls:[/green] {len(firewalls)}")
-        except Exception:
-            pass
 
-    # Write main.tf
-    main_tf = output / "main.tf"
-    main_tf.write_text(tf_content)
-    console.print(f"\n  Written: {main_tf}")
+class TerraformType(NamedTuple):
+    """How one resource type is exported."""
+
+    title: str
+    resource: str  # Terraform resource type
+    body: Callable[[Any], str]
+    import_id: Callable[[Any], Any]
+
+
+# Exported types, one generated file each (<kind>.tf)
+TF_TYPES = {
+    "droplets": TerraformType(
+        "Droplets", "digitalocean_droplet", _tf_droplet, lambda d: d.id
+    ),
+    "volumes": TerraformType(
+        "Volumes", "digitalocean_volume", _tf_volume, lambda v: v.id
+    ),
+    "domains": TerraformType(
+        "Domains", "digitalocean_domain", _tf_domain, lambda d: d.name
+    ),
+    "firewalls": TerraformType(
+        "Firewalls", "digitalocean_firewall", _tf_firewall, lambda fw: fw.id
+    ),
+}
+
+
+def _tf_name(name: str) -> str:
+    label = re.sub(r"[^A-Za-z0-9_]", "_", name)
+    return label if label[:1].isalpha() or label[:1] == "_" else f"r_{label}"
+
+
+def _tf_resources(kind: str, records: list) -> List[Tuple[str, Any]]:
+    """(Terraform name, record) pairs in a stable order, names made unique."""
+    records = sorted(records, key=lambda r: (r.name, str(TF_TYPES[kind].import_id(r))))
+    seen: Dict[str, int] = {}
+    for r in records:
+        label = _tf_name(r.name)
+        seen[label] = seen.get(label, 0) + 1
+    named = []
+    for r in records:
+        label = _tf_name(r.name)
+        if seen[label] > 1:
+            import_id = str(TF_TYPES[kind].import_id(r))
+            label = f"{label}_{re.sub(r'[^A-Za-z0-9_]', '_', import_id)}"
+        named.append((label, r))
+    return named
+
+
+def _tf_chunks(kind: str, resources: List[Tuple[str, Any]]) -> Iterator[str]:
+    spec = TF_TYPES[kind]
+    yield f"# Generated by dom export terraform - {spec.title.lower()}\n"
+    for label, r in resources:
+        yield f'''
+# {spec.title[:-1]}: {r.name}
+resource "{spec.resource}" "{label}" {{
+{spec.body(r)}}}
+'''
+
 
-    # Write import script
-    if import_commands:
+class TerraformFile(NamedTuple):
+    kind: str
+    path: Path
+    resources: int  # not "count", which would shadow tuple.count
+    changed: bool
+    imports: List[Tuple[str, Any]]  # (resource address, import id)
+
+
+def _export_type(client, kind: str, output: Path) -> TerraformFile:
+    """Fetch one resource type and stream it to ``<kind>.tf``."""
+    spec = TF_TYPES[kind]
+    records = list_models(client, kind)
+    with phase(f"transform {kind}"):
+        resources = _tf_resources(kind, records)
+    path = output / f"{kind}.tf"
+    with phase(f"write {path.name}"):  # HCL is rendered as it is written
+        changed = write_if_changed(path, _tf_chunks(kind, resources))
+    imports = [
+        (f"{spec.resource}.{label}", spec.import_id(r)) for label, r in resources
+    ]
+    return TerraformFile(kind, path, len(resources), changed, imports)
+
+
+def _import_script(imports: List[Tuple[str, Any]]) -> Iterator[str]:
+    yield (
+        "#!/bin/bash\n"
+        "# Run these commands to import existing resources into Terraform state\n\n"
+    )
+    for address, import_id in imports:
+        yield f"terraform import {address} {import_id}\n"
+
+
+@app.command("terraform")
+def export_terraform(
+    output: Path = typer.Option(
+        None, "--output", "-o", help="Output directory (default: ./terraform/generated)"
+    ),
+    resource_type: str = typer.Option(
+        "all",
+        "--type",
+        "-t",
+        help="Resource type: all, droplets, volumes, domains, firewalls",
+    ),
+    with_import_blocks: bool = typer.Option(
+        False, "--import-blocks", help="Also write imports.tf (Terraform >= 1.5)"
+    ),
+):
+    """Generate Terraform configurations from existing resources.
+
+    Each resource type goes to its own file; files whose content did not
+    change are left untouched.
+    """
+    if output is None:
+        output = TERRAFORM_DIR
+    if resource_type != "all" and resource_type not in TF_TYPES:
+        raise typer.BadParameter(
+            f"choose from all, {', '.join(TF_TYPES)}", param_hint="--type"
+        )
+    kinds = list(TF_TYPES) if resource_type == "all" else [resource_type]
+    client = get_client()
+
+    output.mkdir(parents=True, exist_ok=True)
+
+    console.print(f"\n[bold]Exporting to Terraform[/bold] -> {output}\n")
+
+    # Every type is fetched and written at once; results are reported in order.
+    with ThreadPoolExecutor(max_workers=len(kinds)) as pool:
+        futures = [pool.submit(_export_type, client, kind, output) for kind in kinds]
+        files = []
+        for kind, future in zip(kinds, futures):
+            try:
+                files.append(future.result())
+            except Exception as e:
+                console.print(f"  [red]{TF_TYPES[kind].title}: {e}[/red]")
+                continue
+            title = TF_TYPES[kind].title
+            console.print(f"  [green]{title}:[/green] {files[-1].resources}")
+
+    with phase("write main.tf and imports"):
+        # main.tf used to hold every resource; keep only the provider setup there
+        main_tf = output / "main.tf"
+        changed = write_if_changed(main_tf, [TF_HEADER])
+        files.append(TerraformFile("main", main_tf, 0, changed, []))
+
+        imports = [entry for f in files for entry in f.imports]
         import_sh = output / "import.sh"
-        import_content = "#!/bin/bash\n# Run these commands to import existing resources into Terraform state\n\n"
-        import_content += "\n".join(import_commands)
-        import_sh.write_text(import_content)
-        console.print(f"  Written: {import_sh}")
+        imports_tf = output / "imports.tf"
+        stale = []
+        if imports:
+            changed = write_if_changed(import_sh, _import_script(imports))
+            files.append(TerraformFile("import", import_sh, 0, changed, []))
+        else:
+            stale.append(import_sh)
+        if imports and with_import_blocks:
+            changed = write_if_changed(imports_tf, import_blocks(imports))
+            files.append(TerraformFile("imports", imports_tf, 0, changed, []))
+        else:
+            stale.append(imports_tf)  # Terraform would still run its imports
+        removed = [path for path in stale if path.exists()]
+        for path in removed:
+            path.unlink()
+
+    console.print()
+    unchanged = 0
+    for f in files:
+        if f.changed:
+            console.print(f"  Written: {f.path}")
+        else:
+            unchanged += 1
+    for path in removed:
+        console.print(f"  Removed: {path}")
+    if unchanged:
+        console.print(f"  [dim]Unchanged: {unchanged} files[/dim]")
 
     console.print("\n[yellow]Next steps:[/yellow]")
     console.print("  1. Review generated files")
     console.print("  2. Run: terraform init")
-    console.print("  3. Run: bash import.sh")
+    console.print("  3. Run: dom tf import")
     console.print("  4. Run: terraform plan")
     console.print()
 
@@ -168,57 +280,64 @@ def export_ansible(
 
     console.print(f"\n[bold]Exporting to Ansible[/bold] -> {output}\n")
 
-    droplets = client.droplets.list().get("droplets", [])
+    droplets = list_models(client, "droplets")
 
     if not droplets:
         console.print("[yellow]No droplets found[/yellow]")
         return
 
     # Group by tags
-    groups: dict[str, list] = {"all": []}
+    with phase("transform droplets"):
+        groups: dict[str, list] = {"all": []}
 
-    for d in droplets:
-        ip = d["networks"]["v4"][0]["ip_address"] if d["networks"]["v4"] else None
-        if not ip:
-            continue
+        for d in droplets:
+            if not d.ip:
+                continue
 
-        host_entry = {
-            "name": d["name"],
-            "ip": ip,
-            "id": d["id"],
-            "region": d["region"]["slug"],
-        }
+            host_entry = {
+                "name": d.name,
+                "ip": d.ip,
+                "id": d.id,
+                "region": d.region,
+            }
 
-        groups["all"].append(host_entry)
+            groups["all"].append(host_entry)
 
-        for tag in d.get("tags", []):
-            if tag not in groups:
-                groups[tag] = []
-            groups[tag].append(host_entry)
+            for tag in d.tags:
+                if tag not in groups:
+                    groups[tag] = []
+                groups[tag].append(host_entry)
 
     # Generate INI inventory
-    inventory_content = "# Generated by dom export ansible\n\n"
-
-    for group, hosts in groups.items():
-        inventory_content += f"[{group}]\n"
-        for h in hosts:
-            inventory_content += f"{h['name']} ansible_host={h['ip']} # id={h['id']} region={h['region']}\n"
-        inventory_content += "\n"
+    with phase("render inventory.ini"):
+        inventory_content = "# Generated by dom export ansible\n\n"
+
+        for group, hosts in groups.items():
+            inventory_content += f"[{group}]\n"
+            for h in hosts:
+                inventory_content += (
+                    f"{h['name']} ansible_host={h['ip']}"
+                    f" # id={h['id']} region={h['region']}\n"
+                )
+            inventory_content += "\n"
 
     inventory_file = output / "inventory.ini"
-    inventory_file.write_text(inventory_content)
+    with phase("write inventory.ini"):
+        inventory_file.write_text(inventory_content)
     console.print(f"  Written: {inventory_file}")
 
     # Generate YAML inventory too
-    yaml_content = "# Generated by dom export ansible\nall:\n  hosts:\n"
-    for h in groups["all"]:
-        yaml_content += f"    {h['name']}:\n"
-        yaml_content += f"      ansible_host: {h['ip']}\n"
-        yaml_content += f"      do_id: {h['id']}\n"
-        yaml_content += f"      do_region: {h['region']}\n"
+    with phase("render inventory.yml"):
+        yaml_content = "# Generated by dom export ansible\nall:\n  hosts:\n"
+        for h in groups["all"]:
+            yaml_content += f"    {h['name']}:\n"
+            yaml_content += f"      ansible_host: {h['ip']}\n"
+            yaml_content += f"      do_id: {h['id']}\n"
+            yaml_content += f"      do_region: {h['region']}\n"
 
     yaml_file = output / "inventory.yml"
-    yaml_file.write_text(yaml_content)
+    with phase("write inventory.yml"):
+        yaml_file.write_text(yaml_content)
     console.print(f"  Written: {yaml_file}")
 
     console.print(f"\n  [green]Total hosts:[/green] {len(groups['all'])}")
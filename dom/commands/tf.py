@@ -1,12 +1,24 @@
 """Terraform wrapper commands."""
 
-import os
 import subprocess
 from pathlib import Path
 
 import typer
 from rich.console import Console
 
+from dom.utils.output import write_if_changed
+from dom.utils.terraform import (
+    DEFAULT_SHARDS,
+    backend_type,
+    import_blocks,
+    parse_import_blocks,
+    parse_import_script,
+    serial_import,
+    sharded_import,
+    supports_import_blocks,
+    terraform_version,
+)
+
 app = typer.Typer(no_args_is_help=True)
 console = Console()
 
@@ -46,26 +58,133 @@ def tf_apply(
 
 
 @app.command("import")
-def tf_import():
-    """Run import.sh to import existing resources."""
-    import_script = GENERATED_DIR / "import.sh"
+def tf_import(
+    directory: Path = typer.Option(
+        GENERATED_DIR,
+        "--dir",
+        "-d",
+        help="Working directory with the generated configuration",
+    ),
+    mode: str = typer.Option(
+        "auto",
+        "--mode",
+        "-m",
+        help="auto, blocks (Terraform >= 1.5), sharded or script",
+    ),
+    shards: int = typer.Option(
+        DEFAULT_SHARDS, "--shards", "-s", help="Parallel working copies in sharded mode"
+    ),
+    auto_approve: bool = typer.Option(False, "--yes", "-y", help="Skip confirmation"),
+):
+    """Import existing resources into Terraform state.
+
+    With Terraform >= 1.5 everything is imported in one plan/apply through
+    import blocks; older versions import in parallel shards.
+    """
+    if mode not in ("auto", "blocks", "sharded", "script"):
+        raise typer.BadParameter(
+            "choose from auto, blocks, sharded, script", param_hint="--mode"
+        )
 
-    if not import_script.exists():
+    import_script = directory / "import.sh"
+    imports_tf = directory / "imports.tf"
+
+    if not import_script.exists() and not imports_tf.exists():
         console.print(f"[red]Error:[/red] {import_script} not found")
         console.print("Run 'dom export terraform' first")
         raise typer.Exit(1)
 
+    if mode == "script":
+        if not import_script.exists():
+            console.print(f"[red]Error:[/red] {import_script} not found")
+            raise typer.Exit(1)
+        _run_import_script(import_script, directory)
+        return
+
+    if not (directory / ".terraform").is_dir():
+        if run_terraform(["init", "-input=false"], cwd=directory) != 0:
+            raise typer.Exit(1)
+
+    if mode == "auto":
+        version = terraform_version(directory)
+        mode = "blocks" if supports_import_blocks(version) else "sharded"
+        console.print(
+            f"[dim]Terraform {'.'.join(map(str, version))}: {mode} import[/dim]\n"
+        )
+
+    if mode == "blocks":
+        if not imports_tf.exists():
+            entries = parse_import_script(import_script)
+            write_if_changed(imports_tf, import_blocks(entries))
+            console.print(f"Written: {imports_tf}\n")
+        plan_file = "dom-import.tfplan"
+        plan = ["plan", "-input=false", f"-out={plan_file}"]
+        if run_terraform(plan, cwd=directory) != 0:
+            raise typer.Exit(1)
+        if not auto_approve and not typer.confirm("Apply the import plan?"):
+            console.print("[dim]Aborted[/dim]")
+            return
+        code = run_terraform(["apply", "-input=false", plan_file], cwd=directory)
+        (directory / plan_file).unlink(missing_ok=True)
+        if code != 0:
+            raise typer.Exit(code)
+        return
+
+    if import_script.exists():
+        entries = parse_import_script(import_script)
+    else:
+        entries = parse_import_blocks(imports_tf)
+    if imports_tf.exists():
+        # import blocks would break Terraform < 1.5
+        aside = imports_tf.with_name(imports_tf.name + ".disabled")
+        imports_tf.replace(aside)
+        console.print(
+            f"[yellow]Moved {imports_tf} to {aside}:"
+            " Terraform < 1.5 cannot read import blocks[/yellow]"
+        )
+
+    backend = backend_type(directory)
+    if backend != "local":
+        console.print(
+            f"[yellow]State is in the {backend} backend: importing"
+            f" {len(entries)} resources one by one, with locking"
+            " (sharding needs a local state)[/yellow]\n"
+        )
+        with console.status("Importing..."):
+            imported, failed = serial_import(directory, entries)
+        _report_imports(imported, failed)
+        return
+
+    console.print(
+        f"[bold]Importing {len(entries)} resources"
+        f" in {min(shards, len(entries))} shards[/bold]\n"
+    )
+    with console.status("Importing..."):
+        imported, failed = sharded_import(directory, entries, shards)
+    _report_imports(imported, failed)
+
+
+def _report_imports(imported: list, failed: list) -> None:
+    console.print(f"[green]Imported {len(imported)} resources[/green]")
+    if failed:
+        console.print(f"[red]Failed to import {len(failed)}:[/red]")
+        for entry, error in failed:
+            console.print(f"  [red]{entry.address}[/red] ({entry.id}): {error}")
+        raise typer.Exit(1)
+
+
+def _run_import_script(import_script: Path, cwd: Path) -> None:
+    """One ``terraform import`` per line, as the script does."""
     console.print(f"[bold]Running {import_script}[/bold]\n")
 
-    # Read and execute each line
     with open(import_script) as f:
         for line in f:
             line = line.strip()
             if line and not line.startswith("#"):
                 console.print(f"[dim]$ {line}[/dim]")
-                result = subprocess.run(line, shell=True, cwd=TERRAFORM_DIR)
+                result = subprocess.run(line, shell=True, cwd=cwd)
                 if result.returncode != 0:
-                    console.print(f"[yellow]Warning: command failed[/yellow]")
+                    console.print("[yellow]Warning: command failed[/yellow]")
 
 
 @app.command("output")
@@ -1,12 +1,23 @@
 """Main TUI Application."""
 
+import math
+from functools import partial
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from azure.core.exceptions import ResourceNotFoundError
 from textual.app import App, ComposeResult
 from textual.binding import Binding
-from textual.containers import Container, Horizontal, Vertical
-from textual.widgets import Header, Footer, Static, ListView, ListItem, Label, Button, DataTable
+from textual.containers import Container, Horizontal
 from textual.screen import Screen
+from textual.timer import Timer
+from textual.widgets import Button, DataTable, Footer, Header, Input, Static
+from textual.worker import Worker, WorkerState, get_current_worker
+
+from dom.utils import get_client, iter_models
+from dom.utils.models import Database, Droplet
+from dom.utils.pagination import MAX_PER_PAGE
 
-from dom.utils import get_client
+from .search import SearchIndex
 
 
 class DropletDetailScreen(Screen):
@@ -18,29 +29,32 @@ class DropletDetailScreen(Screen):
         Binding("r", "reboot", "Reboot"),
     ]
 
-    def __init__(self, droplet: dict):
+    def __init__(self, droplet: Droplet):
         super().__init__()
         self.droplet = droplet
 
     def compose(self) -> ComposeResult:
         yield Header()
         yield Container(
-            Static(f"[bold cyan]{self.droplet['name']}[/bold cyan]", classes="title"),
+            Static(f"[bold cyan]{self.droplet.name}[/bold cyan]", classes="title"),
             Static(""),
-            Static(f"[bold]ID:[/bold]       {self.droplet['id']}"),
-            Static(f"[bold]Status:[/bold]   {self._status_color(self.droplet['status'])}"),
-            Static(f"[bold]Region:[/bold]   {self.droplet['region']['slug']} ({self.droplet['region']['name']})"),
-            Static(f"[bold]Size:[/bold]     {self.droplet['size_slug']}"),
-            Static(f"[bold]vCPUs:[/bold]    {self.droplet['vcpus']}"),
-            Static(f"[bold]Memory:[/bold]   {self.droplet['memory']} MB"),
-            Static(f"[bold]Disk:[/bold]     {self.droplet['disk']} GB"),
-            Static(f"[bold]Image:[/bold]    {self.droplet['image']['slug'] or self.droplet['image']['name']}"),
+            Static(f"[bold]ID:[/bold]       {self.droplet.id}"),
+            Static(f"[bold]Status:[/bold]   {self._status_color(self.droplet.status)}"),
+            Static(
+                f"[bold]Region:[/bold]   {self.droplet.region}"
+                f" ({self.droplet.region_name})"
+            ),
+            Static(f"[bold]Size:[/bold]     {self.droplet.size}"),
+            Static(f"[bold]vCPUs:[/bold]    {self.droplet.vcpus}"),
+            Static(f"[bold]Memory:[/bold]   {self.droplet.memory} MB"),
+            Static(f"[bold]Disk:[/bold]     {self.droplet.disk} GB"),
+            Static(f"[bold]Image:[/bold]    {self.droplet.image}"),
             Static(""),
-            Static(f"[bold]Public IP:[/bold]  {self._get_ip('public')}"),
-            Static(f"[bold]Private IP:[/bold] {self._get_ip('private')}"),
+            Static(f"[bold]Public IP:[/bold]  {self.droplet.public_ip or '-'}"),
+            Static(f"[bold]Private IP:[/bold] {self.droplet.private_ip or '-'}"),
             Static(""),
-            Static(f"[bold]Tags:[/bold]     {', '.join(self.droplet.get('tags', [])) or '-'}"),
-            Static(f"[bold]Created:[/bold]  {self.droplet['created_at'][:10]}"),
+            Static(f"[bold]Tags:[/bold]     {', '.join(self.droplet.tags) or '-'}"),
+            Static(f"[bold]Created:[/bold]  {self.droplet.created_at[:10]}"),
             Static(""),
             Horizontal(
                 Button("SSH", id="ssh", variant="primary"),
@@ -57,30 +71,173 @@ class DropletDetailScreen(Screen):
         color = colors.get(status, "white")
         return f"[{color}]{status}[/{color}]"
 
-    def _get_ip(self, ip_type: str) -> str:
-        networks = self.droplet.get("networks", {}).get("v4", [])
-        for net in networks:
-            if net["type"] == ip_type:
-                return net["ip_address"]
-        return "-"
-
     def action_pop_screen(self):
         self.app.pop_screen()
 
     def action_ssh(self):
-        ip = self._get_ip("public")
-        if ip != "-":
-            self.app.exit(result=f"ssh root@{ip}")
+        if self.droplet.public_ip:
+            self.app.exit(result=f"ssh root@{self.droplet.public_ip}")
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "ssh":
             self.action_ssh()
         elif event.button.id == "reboot":
-            self.notify(f"Reboot {self.droplet['name']}? (not implemented yet)", severity="warning")
+            self.notify(
+                f"Reboot {self.droplet.name}? (not implemented yet)", severity="warning"
+            )
+
+
+class View(NamedTuple):
+    """A resource tab: the resource type it lists and how rows look."""
+
+    kind: str
+    columns: Tuple[str, ...]
+    row: Callable[[Any], Tuple[str, ...]]
+    fields: Callable[[Any], Tuple[str, ...]]  # what the search bar matches
+    key: str = "id"  # record field identifying a row across refreshes
+    busy: Optional[Callable[[Any], bool]] = None  # record changing state
+    get: Optional[Callable[[Any, str], Any]] = None  # one record by key, for live mode
+
+    def search_index(self, records: list) -> SearchIndex:
+        return SearchIndex(
+            [str(getattr(record, self.key)) for record in records],
+            (" ".join(self.fields(record)) for record in records),
+        )
+
+
+def _droplet_row(d: Droplet) -> Tuple[str, ...]:
+    color = "green" if d.status == "active" else "red"
+    status_display = f"[{color}]{d.status}[/]"
+    return (str(d.id), d.name, d.region, d.size, d.ip or "-", status_display)
+
+
+def _droplet_fields(d: Droplet) -> Tuple[str, ...]:
+    return (d.name, d.public_ip, d.private_ip, d.region, d.size, *d.tags)
+
+
+def _droplet_busy(d: Droplet) -> bool:
+    return d.status == "new" or d.locked
+
+
+def _get_droplet(client, key: str) -> Droplet:
+    return Droplet.from_api(client.droplets.get(int(key))["droplet"])
+
+
+def _volume_row(v) -> Tuple[str, ...]:
+    attached = ", ".join(str(d) for d in v.droplet_ids) or "-"
+    return (v.id[:8], v.name, str(v.size_gigabytes), v.region, attached)
+
+
+def _volume_fields(v) -> Tuple[str, ...]:
+    return (v.name, v.id, v.region, f"{v.size_gigabytes}gb", *v.tags)
+
+
+def _domain_row(d) -> Tuple[str, ...]:
+    return (d.name, str(d.ttl if d.ttl is not None else "-"))
+
+
+def _domain_fields(d) -> Tuple[str, ...]:
+    return (d.name,)
+
+
+def _firewall_row(fw) -> Tuple[str, ...]:
+    return (
+        fw.id[:8],
+        fw.name,
+        str(len(fw.droplet_ids)),
+        str(len(fw.inbound_rules)),
+        str(len(fw.outbound_rules)),
+    )
+
+
+def _firewall_fields(fw) -> Tuple[str, ...]:
+    return (fw.name, fw.id, *fw.tags)
+
+
+def _database_row(db) -> Tuple[str, ...]:
+    return (db.name, f"{db.engine} {db.version}", db.size, db.region, db.status)
+
+
+def _database_fields(db) -> Tuple[str, ...]:
+    return (db.name, db.engine, db.region, db.size, *db.tags)
+
+
+def _database_busy(db) -> bool:
+    return db.status in ("creating", "resizing", "migrating", "forking")
+
+
+def _get_database(client, key: str) -> Database:
+    return Database.from_api(client.databases.get_cluster(key)["database"])
+
+
+VIEWS = {
+    "droplets": View(
+        "droplets",
+        ("ID", "Name", "Region", "Size", "IP", "Status"),
+        _droplet_row,
+        _droplet_fields,
+        busy=_droplet_busy,
+        get=_get_droplet,
+    ),
+    "volumes": View(
+        "volumes",
+        ("ID", "Name", "Size (GB)", "Region", "Attached To"),
+        _volume_row,
+        _volume_fields,
+    ),
+    "domains": View(
+        "domains", ("Domain", "TTL"), _domain_row, _domain_fields, key="name"
+    ),
+    "firewalls": View(
+        "firewalls",
+        ("ID", "Name", "Droplets", "Inbound Rules", "Outbound Rules"),
+        _firewall_row,
+        _firewall_fields,
+    ),
+    "databases": View(
+        "databases",
+        ("Name", "Engine", "Size", "Region", "Status"),
+        _database_row,
+        _database_fields,
+        busy=_database_busy,
+        get=_get_database,
+    ),
+}
+
+# A refresh removing more rows than this rebuilds the table instead:
+# DataTable reindexes every row on each removal.
+REBUILD_REMOVALS = 64
+
+# Live mode polls the shown tab every LIVE_FAST seconds while some of its
+# resources are changing state, doubling the interval up to LIVE_IDLE
+# while nothing is. Fast polls fetch only the changing resources, by ID,
+# when that takes fewer requests than listing the tab again.
+LIVE_FAST = 5.0
+LIVE_IDLE = 60.0
+
+# Rows shown for a search; the count tells when there are more.
+SEARCH_LIMIT = 200
 
 
 class ResourceListScreen(Screen):
-    """Main screen with resource list."""
+    """Main screen with resource list.
+
+    Listings are fetched in thread workers, so the UI never waits on the
+    API: every tab is prefetched on mount, a tab whose data is still on its
+    way shows a loading indicator, and switching tabs cancels a refresh of
+    the tab being left.
+
+    Rows are keyed by resource ID: a refresh only adds, removes and updates
+    the rows that changed, and the cursor stays on the same resource.
+
+    In live mode the shown tab refreshes on its own (see LIVE_FAST).
+
+    ``/`` opens a search bar filtering the tab as you type. Matches come
+    from a SearchIndex built in the loading worker and are shown in a
+    second table, so closing the search brings back the full one as it was.
+    """
+
+    AUTO_FOCUS = "#resource-table"
 
     BINDINGS = [
         Binding("q", "quit", "Quit"),
@@ -88,170 +245,373 @@ class ResourceListScreen(Screen):
         Binding("d", "droplets", "Droplets"),
         Binding("v", "volumes", "Volumes"),
         Binding("f", "firewalls", "Firewalls"),
+        Binding("l", "live", "Live"),
+        Binding("slash", "search", "Search"),
+        Binding("escape", "close_search", "Close search", show=False),
     ]
 
-    def __init__(self):
+    def __init__(self, live: bool = False):
         super().__init__()
         self.client = None
+        self.live = live
+        self._interval = LIVE_FAST
+        self._poll_timer: Optional[Timer] = None
         self.current_view = "droplets"
-        self.resources = []
+        self.resources: list = []
+        self.loaded: Dict[str, list] = {}  # records per view, once fetched
+        self._loading: Dict[str, Worker] = {}  # latest load per view
+        self._shown: Optional[str] = None  # view whose rows are in the table
+        self._rows: Dict[str, Tuple[str, ...]] = {}  # cells shown, by row key
+        self._records: Dict[str, Any] = {}  # record behind each row key
+        # cursor key and scroll per view
+        self._positions: Dict[str, Tuple[Optional[str], float, float]] = {}
+        self._indexes: Dict[str, SearchIndex] = {}  # search index per loaded view
+        self._query = ""
+        # view whose columns the results table has
+        self._results_view: Optional[str] = None
 
     def compose(self) -> ComposeResult:
         yield Header()
         yield Container(
             Horizontal(
-                Button("Droplets", id="btn-droplets", variant="primary"),
-                Button("Volumes", id="btn-volumes"),
-                Button("Domains", id="btn-domains"),
-                Button("Firewalls", id="btn-firewalls"),
-                Button("Databases", id="btn-databases"),
+                *(Button(view.capitalize(), id=f"btn-{view}") for view in VIEWS),
                 classes="nav-buttons",
             ),
+            Input(placeholder="Search name, IP, tag, region, size", id="search"),
+            Static("", id="search-count"),
             DataTable(id="resource-table"),
+            DataTable(id="search-results", cursor_type="row"),
             id="main-container",
         )
         yield Footer()
 
     def on_mount(self) -> None:
         self.client = get_client()
-        self.load_droplets()
+        for view in VIEWS:
+            self.load(view)
+        self.show_view(self.current_view)
+
+    def load(self, view: str, refresh: bool = False, quiet: bool = False) -> Worker:
+        """Fetch ``view`` in a thread worker; the table updates when it is done.
+
+        A ``quiet`` load (live mode) shows no loading indicator.
+        """
+        worker = self.run_worker(
+            partial(self._fetch, view, refresh),
+            name=view,
+            group=f"refresh-{view}" if refresh else "prefetch",
+            description="live" if quiet else "",
+            exclusive=refresh,
+            exit_on_error=False,
+            thread=True,
+        )
+        self._loading[view] = worker
+        reloading = refresh or view not in self.loaded
+        if view == self.current_view and not quiet and reloading:
+            self.query_one("#resource-table", DataTable).loading = True
+        return worker
+
+    def load_busy(
+        self, view: str, get: Callable[[Any, str], Any], keys: List[str]
+    ) -> Worker:
+        """Refetch the records of ``view`` with these keys, quietly (live mode)."""
+        worker = self.run_worker(
+            partial(self._fetch_busy, view, get, keys, list(self.loaded[view])),
+            name=view,
+            group=f"refresh-{view}",
+            description="live",
+            exclusive=True,
+            exit_on_error=False,
+            thread=True,
+        )
+        self._loading[view] = worker
+        return worker
+
+    def _fetch_busy(
+        self, view: str, get: Callable[[Any, str], Any], keys: List[str], records: list
+    ) -> Optional[Tuple[list, SearchIndex]]:
+        # runs in a worker thread
+        worker = get_current_worker()
+        spec = VIEWS[view]
+        fresh: Dict[str, Any] = {}
+        for key in keys:
+            if worker.is_cancelled:
+                return None
+            try:
+                fresh[key] = get(self.client, key)
+            except ResourceNotFoundError:
+                fresh[key] = None  # deleted meanwhile
+        merged = []
+        for record in records:
+            key = str(getattr(record, spec.key))
+            record = fresh.get(key, record)
+            if record is not None:
+                merged.append(record)
+        return merged, spec.search_index(merged)
+
+    def _fetch(self, view: str, refresh: bool) -> Optional[Tuple[list, SearchIndex]]:
+        # runs in a worker thread
+        worker = get_current_worker()
+        records = []
+        for record in iter_models(self.client, VIEWS[view].kind, refresh=refresh):
+            if worker.is_cancelled:
+                return None  # closes the listing; the cache keeps the old one
+            records.append(record)
+        return records, VIEWS[view].search_index(records)
+
+    def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
+        worker = event.worker
+        view = worker.name
+        if self._loading.get(view) is not worker:
+            return
+        if event.state in (WorkerState.PENDING, WorkerState.RUNNING):
+            return
+        del self._loading[view]
+        if event.state == WorkerState.SUCCESS and worker.result is not None:
+            self.loaded[view], self._indexes[view] = worker.result
+            if view == self.current_view:
+                self._render_view(view)
+                if worker.group.startswith("refresh-") and worker.description != "live":
+                    self.notify("Refreshed!")
+        elif event.state == WorkerState.ERROR:
+            self.notify(f"Error loading {view}: {worker.error}", severity="error")
+        if view == self.current_view:
+            self.query_one("#resource-table", DataTable).loading = False
+            if self.live:
+                self._schedule_poll()
+
+    def _schedule_poll(self) -> None:
+        """Set the next live refresh of the shown tab."""
+        if self._poll_timer is not None:
+            self._poll_timer.stop()
+        spec = VIEWS[self.current_view]
+        records = self.loaded.get(self.current_view, ())
+        if spec.busy is not None and any(spec.busy(record) for record in records):
+            self._interval = LIVE_FAST
+        else:
+            self._interval = min(self._interval * 2, LIVE_IDLE)
+        self._poll_timer = self.set_timer(self._interval, self._poll)
+        self.app.sub_title = f"live, every {self._interval:g}s"
+
+    def _poll(self) -> None:
+        view = self.current_view
+        # a load in flight reschedules when it completes
+        if view in self._loading:
+            return
+        spec = VIEWS[view]
+        records = self.loaded.get(view, [])
+        busy = []
+        if spec.busy is not None:
+            busy = [str(getattr(r, spec.key)) for r in records if spec.busy(r)]
+        pages = math.ceil(len(records) / MAX_PER_PAGE)
+        if spec.get is not None and busy and len(busy) < pages:
+            self.load_busy(view, spec.get, busy)
+        else:
+            self.load(view, refresh=True, quiet=True)
+
+    def action_live(self) -> None:
+        self.live = not self.live
+        if self.live:
+            self._interval = LIVE_FAST
+            self._poll()
+        else:
+            if self._poll_timer is not None:
+                self._poll_timer.stop()
+            self.app.sub_title = ""
+        self.notify("Live mode on" if self.live else "Live mode off")
+
+    def show_view(self, view: str) -> None:
+        """Switch to ``view``, showing its data right away if it is loaded."""
+        previous, self.current_view = self.current_view, view
+        if previous != view:
+            self.workers.cancel_group(self, f"refresh-{previous}")
+        for btn in self.query(".nav-buttons Button").results(Button):
+            btn.variant = "primary" if btn.id == f"btn-{view}" else "default"
+
+        if self.live and previous != view:
+            # the tab may hold prefetched data by now stale: poll it soon
+            self._interval = LIVE_FAST / 2
+            if view not in self._loading:
+                self._schedule_poll()
 
-    def load_droplets(self) -> None:
-        self.current_view = "droplets"
-        table = self.query_one("#resource-table", DataTable)
-        table.clear(columns=True)
-        table.cursor_type = "row"
-        table.add_columns("ID", "Name", "Region", "Size", "IP", "Status")
-
-        try:
-            droplets = self.client.droplets.list().get("droplets", [])
-            self.resources = droplets
-            for d in droplets:
-                ip = d["networks"]["v4"][0]["ip_address"] if d["networks"]["v4"] else "-"
-                status = d["status"]
-                status_display = f"[green]{status}[/]" if status == "active" else f"[red]{status}[/]"
-                table.add_row(str(d["id"]), d["name"], d["region"]["slug"], d["size_slug"], ip, status_display)
-        except Exception as e:
-            self.notify(f"Error: {e}", severity="error")
-
-    def load_volumes(self) -> None:
-        self.current_view = "volumes"
         table = self.query_one("#resource-table", DataTable)
-        table.clear(columns=True)
-        table.cursor_type = "row"
-        table.add_columns("ID", "Name", "Size (GB)", "Region", "Attached To")
-
-        try:
-            volumes = self.client.volumes.list().get("volumes", [])
-            self.resources = volumes
-            for v in volumes:
-                attached = ", ".join(str(d) for d in v.get("droplet_ids", [])) or "-"
-                table.add_row(v["id"][:8], v["name"], str(v["size_gigabytes"]), v["region"]["slug"], attached)
-        except Exception as e:
-            self.notify(f"Error: {e}", severity="error")
-
-    def load_domains(self) -> None:
-        self.current_view = "domains"
+        if view in self.loaded:
+            self._render_view(view)
+            table.loading = False
+            return
+        self._save_position()
+        self._clear(table)
+        if view not in self._loading:
+            self.load(view)
+        table.loading = True
+
+    def _render_view(self, view: str) -> None:
+        spec = VIEWS[view]
+        records = self.loaded[view]
         table = self.query_one("#resource-table", DataTable)
+        self.resources = records
+        self._records = {str(getattr(record, spec.key)): record for record in records}
+        rows = {key: spec.row(record) for key, record in self._records.items()}
+
+        if self._shown != view:
+            self._save_position()
+            self._rebuild(table, spec, rows, *self._positions.get(view, (None, 0, 0)))
+        else:
+            cursor = self._cursor_key(table)
+            removed = [key for key in self._rows if key not in rows]
+            if len(removed) > REBUILD_REMOVALS:
+                self._rebuild(table, spec, rows, cursor, table.scroll_x, table.scroll_y)
+            else:
+                self._update_rows(table, spec, rows, removed)
+                if cursor is not None and cursor in rows:
+                    table.move_cursor(row=table.get_row_index(cursor), scroll=False)
+        self._shown = view
+        if self._query:
+            self._filter(self._query)
+
+    def _update_rows(
+        self, table: DataTable, spec: View, rows: dict, removed: list
+    ) -> None:
+        """Apply the difference between the shown rows and ``rows``."""
+        for key in removed:
+            table.remove_row(key)
+        shown = self._rows
+        for key, cells in rows.items():
+            old = shown.get(key)
+            if old is None:
+                table.add_row(*cells, key=key)  # new resources go at the bottom
+            elif old != cells:
+                for column, before, after in zip(spec.columns, old, cells):
+                    if before != after:
+                        # only a wider cell needs the column width recomputed
+                        wider = len(after) > len(before)
+                        table.update_cell(key, column, after, update_width=wider)
+        self._rows = rows
+
+    def _rebuild(
+        self,
+        table: DataTable,
+        spec: View,
+        rows: dict,
+        cursor: Optional[str],
+        x: float,
+        y: float,
+    ) -> None:
         table.clear(columns=True)
         table.cursor_type = "row"
-        table.add_columns("Domain", "TTL")
-
-        try:
-            domains = self.client.domains.list().get("domains", [])
-            self.resources = domains
-            for d in domains:
-                table.add_row(d["name"], str(d.get("ttl", "-")))
-        except Exception as e:
-            self.notify(f"Error: {e}", severity="error")
-
-    def load_firewalls(self) -> None:
-        self.current_view = "firewalls"
-        table = self.query_one("#resource-table", DataTable)
+        for column in spec.columns:
+            table.add_column(column, key=column)
+        for key, cells in rows.items():
+            table.add_row(*cells, key=key)
+        self._rows = rows
+        if cursor is not None and cursor in rows:
+            table.move_cursor(row=table.get_row_index(cursor), scroll=False)
+        # the scrollable size is known only after the next layout
+        table.call_after_refresh(table.scroll_to, x, y, animate=False)
+
+    def _clear(self, table: DataTable) -> None:
         table.clear(columns=True)
-        table.cursor_type = "row"
-        table.add_columns("ID", "Name", "Droplets", "Inbound Rules", "Outbound Rules")
-
-        try:
-            firewalls = self.client.firewalls.list().get("firewalls", [])
-            self.resources = firewalls
-            for fw in firewalls:
-                table.add_row(
-                    fw["id"][:8],
-                    fw["name"],
-                    str(len(fw.get("droplet_ids", []))),
-                    str(len(fw.get("inbound_rules", []))),
-                    str(len(fw.get("outbound_rules", []))),
-                )
-        except Exception as e:
-            self.notify(f"Error: {e}", severity="error")
-
-    def load_databases(self) -> None:
-        self.current_view = "databases"
+        self.resources = []
+        self._records = {}
+        self._rows = {}
+        self._shown = None
+        if self._query:
+            self._filter(self._query)
+
+    @staticmethod
+    def _cursor_key(table: DataTable) -> Optional[str]:
+        if not table.row_count:
+            return None
+        return table.coordinate_to_cell_key(table.cursor_coordinate).row_key.value
+
+    def _save_position(self) -> None:
+        """Remember where the cursor and scroll are in the view being left."""
+        if self._shown is not None:
+            table = self.query_one("#resource-table", DataTable)
+            position = (self._cursor_key(table), table.scroll_x, table.scroll_y)
+            self._positions[self._shown] = position
+
+    def action_search(self) -> None:
+        self.query_one("#main-container").add_class("-searching")
+        self.query_one("#search", Input).focus()
+
+    def action_close_search(self) -> None:
+        container = self.query_one("#main-container")
+        if not container.has_class("-searching"):
+            return
         table = self.query_one("#resource-table", DataTable)
-        table.clear(columns=True)
-        table.cursor_type = "row"
-        table.add_columns("Name", "Engine", "Size", "Region", "Status")
-
-        try:
-            databases = self.client.databases.list_clusters().get("databases", [])
-            self.resources = databases
-            for db in databases:
-                table.add_row(
-                    db["name"],
-                    f"{db['engine']} {db['version']}",
-                    db["size"],
-                    db["region"],
-                    db["status"],
-                )
-        except Exception as e:
-            self.notify(f"Error: {e}", severity="error")
+        # land on the result that was highlighted
+        results = self.query_one("#search-results", DataTable)
+        selected = self._cursor_key(results) if self._query else None
+        self.query_one("#search", Input).value = ""
+        self._filter("")
+        container.remove_class("-searching")
+        if selected is not None and selected in self._rows:
+            table.move_cursor(row=table.get_row_index(selected))
+        table.focus()
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        if event.input.id == "search":
+            self._filter(event.value)
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        if event.input.id == "search":
+            target = "#search-results" if self._query else "#resource-table"
+            self.query_one(target, DataTable).focus()
+
+    def _filter(self, query: str) -> None:
+        """Show the rows of the current tab matching ``query``."""
+        self._query = query.strip()
+        self.query_one("#main-container").set_class(bool(self._query), "-filtered")
+        count = self.query_one("#search-count", Static)
+        if not self._query:
+            count.update("")
+            return
+
+        results = self.query_one("#search-results", DataTable)
+        spec = VIEWS[self.current_view]
+        if self._results_view != self.current_view:
+            results.clear(columns=True)
+            for column in spec.columns:
+                results.add_column(column, key=column)
+            self._results_view = self.current_view
+        else:
+            results.clear()
+
+        index = None
+        if self._shown == self.current_view:
+            index = self._indexes.get(self.current_view)
+        keys = index.search(self._query, SEARCH_LIMIT + 1) if index is not None else []
+        for key in keys[:SEARCH_LIMIT]:
+            results.add_row(*self._rows[key], key=key)
+        if len(keys) > SEARCH_LIMIT:
+            count.update(
+                f"[dim]First {SEARCH_LIMIT} matches, keep typing to narrow down[/dim]"
+            )
+        else:
+            count.update(f"[dim]{len(keys)} of {len(index or ())} match[/dim]")
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
-        # Reset all buttons
-        for btn in self.query(".nav-buttons Button"):
-            btn.variant = "default"
-        event.button.variant = "primary"
-
-        if event.button.id == "btn-droplets":
-            self.load_droplets()
-        elif event.button.id == "btn-volumes":
-            self.load_volumes()
-        elif event.button.id == "btn-domains":
-            self.load_domains()
-        elif event.button.id == "btn-firewalls":
-            self.load_firewalls()
-        elif event.button.id == "btn-databases":
-            self.load_databases()
+        view = (event.button.id or "").removeprefix("btn-")
+        if view in VIEWS:
+            self.show_view(view)
 
     def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
-        if self.current_view == "droplets" and self.resources:
-            row_index = event.cursor_row
-            if 0 <= row_index < len(self.resources):
-                droplet = self.resources[row_index]
-                self.app.push_screen(DropletDetailScreen(droplet))
+        record = self._records.get(event.row_key.value or "")
+        if self.current_view == "droplets" and record is not None:
+            self.app.push_screen(DropletDetailScreen(record))
 
     def action_refresh(self) -> None:
-        if self.current_view == "droplets":
-            self.load_droplets()
-        elif self.current_view == "volumes":
-            self.load_volumes()
-        elif self.current_view == "domains":
-            self.load_domains()
-        elif self.current_view == "firewalls":
-            self.load_firewalls()
-        elif self.current_view == "databases":
-            self.load_databases()
-        self.notify("Refreshed!")
+        self.load(self.current_view, refresh=True)
 
     def action_droplets(self) -> None:
-        self.load_droplets()
+        self.show_view("droplets")
 
     def action_volumes(self) -> None:
-        self.load_volumes()
+        self.show_view("volumes")
 
     def action_firewalls(self) -> None:
-        self.load_firewalls()
+        self.show_view("firewalls")
 
 
 class DOManagerApp(App):
@@ -273,10 +633,27 @@ class DOManagerApp(App):
         margin-right: 1;
     }
 
-    #resource-table {
+    #resource-table, #search-results {
         height: 100%;
     }
 
+    #search, #search-count, #search-results {
+        display: none;
+    }
+
+    .-searching #search, .-searching #search-count, .-filtered #search-results {
+        display: block;
+    }
+
+    .-filtered #resource-table {
+        display: none;
+    }
+
+    #search-count {
+        height: 1;
+        padding: 0 1;
+    }
+
     #detail-container {
         padding: 2;
     }
@@ -300,8 +677,12 @@ class DOManagerApp(App):
         Binding("q", "quit", "Quit"),
     ]
 
+    def __init__(self, live: bool = False):
+        super().__init__()
+        self.live = live
+
     def on_mount(self) -> None:
-        self.push_screen(ResourceListScreen())
+        self.push_screen(ResourceListScreen(live=self.live))
 
 
 def run_tui():
@@ -0,0 +1,93 @@
+"""In-memory search index behind the TUI filter bar.
+
+Each record is reduced to one lowercase string of its searchable fields
+(name, IPs, tags, region, size). A trigram index maps every
+three-character substring to the rows containing it, so a query only
+checks the rows listed under its rarest trigram instead of every row.
+A query is a list of whitespace-separated terms, all of which must
+appear; terms shorter than a trigram fall back to a plain scan.
+
+When no row contains the terms, the search turns fuzzy: a term then
+matches a field holding its characters in order, so "wb19" finds
+"web-19" and "stging" finds "staging". Fuzzy terms run as one regular
+expression over all rows joined into a single string, and only for
+queries with no exact match.
+"""
+
+import re
+from bisect import bisect_right
+from collections import defaultdict
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Sequence
+
+GRAM = 3
+
+
+class SearchIndex:
+    """Substring search over a fixed list of rows, identified by key."""
+
+    def __init__(self, keys: Sequence[str], texts: Iterable[str]):
+        self.keys = list(keys)
+        self.texts = [text.lower() for text in texts]
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for row, text in enumerate(self.texts):
+            for gram in {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}:
+                postings[gram].append(row)  # rows ascending: results keep list order
+        self._postings = dict(postings)
+        self._starts: List[int] = []
+        offset = 0
+        for text in self.texts:
+            self._starts.append(offset)
+            offset += len(text) + 1
+        self._joined = "\n".join(text.replace("\n", " ") for text in self.texts)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """Keys of the rows matching every term of ``query``, in row order.
+
+        Exact (substring) matches if there are any, else fuzzy ones. With
+        ``limit``, stops after that many matches.
+        """
+        terms = query.lower().split()
+        if not terms:
+            return self.keys[:limit]
+        keys = self._exact(terms, limit)
+        if keys or all(len(term) < 2 for term in terms):
+            return keys
+        return self._fuzzy(terms, limit)
+
+    def _exact(self, terms: List[str], limit: Optional[int]) -> List[str]:
+        rows: Sequence[int] = range(len(self.texts))
+        for term in terms:
+            for i in range(len(term) - GRAM + 1):
+                posting = self._postings.get(term[i:i + GRAM])
+                if posting is None:
+                    return []
+                if len(posting) < len(rows):
+                    rows = posting
+
+        texts, keys = self.texts, self.keys
+        if len(terms) == 1:
+            term = terms[0]
+            matches = (row for row in rows if term in texts[row])
+        else:
+            matches = (row for row in rows if all(term in texts[row] for term in terms))
+        return [keys[row] for row in islice(matches, limit)]
+
+    def _fuzzy(self, terms: List[str], limit: Optional[int]) -> List[str]:
+        # the characters of a term in order, within one field
+        patterns = [re.compile("[^ \n]*?".join(map(re.escape, term))) for term in terms]
+        first, rest = patterns[0], patterns[1:]
+        texts, starts, keys = self.texts, self._starts, self.keys
+        found: List[str] = []
+        match = first.search(self._joined)
+        while match and (limit is None or len(found) < limit):
+            row = bisect_right(starts, match.start()) - 1
+            if all(pattern.search(texts[row]) for pattern in rest):
+                found.append(keys[row])
+            if row + 1 == len(starts):
+                break
+            match = first.search(self._joined, starts[row + 1])
+        return found
@@ -1,5 +1,28 @@
 """Utility modules."""
 
-from .client import get_client, handle_api_error, console
+import importlib
 
-__all__ = ["get_client", "handle_api_error", "console"]
+# Re-exported names and the submodule defining them. They are resolved on
+# first access, so importing a light submodule (e.g. dom.utils.cache) does
+# not pull in pydo.
+_EXPORTS = {
+    "get_client": "client",
+    "handle_api_error": "client",
+    "console": "client",
+    "count_resources": "resources",
+    "get_account": "resources",
+    "invalidate": "resources",
+    "iter_models": "resources",
+    "iter_resources": "resources",
+    "list_models": "resources",
+    "list_resources": "resources",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(f".{_EXPORTS[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,114 @@
+"""Named DigitalOcean accounts for multi-account commands.
+
+Accounts are read from an INI file, ``$XDG_CONFIG_HOME/dom/accounts.ini``
+(``~/.config/dom/accounts.ini``) or ``DOM_ACCOUNTS_FILE``, one section per
+account::
+
+    [acme]
+    token_env = ACME_DO_TOKEN   # read the token from this variable...
+
+    [beta]
+    token = dop_v1_...          # ...or store it in the file (chmod 600)
+    endpoint = https://api.digitalocean.com
+
+Commands taking ``--accounts a,b`` or ``--all-accounts`` fetch every
+account at once with ``in_parallel``. Each token has its own client, rate
+limiter and inventory cache namespace, so accounts do not share a budget
+and the wall time is about that of the slowest account.
+"""
+
+import configparser
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from .credentials import get_endpoint
+
+# Accounts fetched at the same time; each one also runs its own requests
+# in parallel.
+MAX_PARALLEL_ACCOUNTS = 16
+
+ACCOUNTS_HELP = "Comma-separated account names from the accounts file"
+ALL_ACCOUNTS_HELP = "Every account in the accounts file"
+
+
+class Account(NamedTuple):
+    name: str
+    token: str
+    endpoint: str
+
+
+def accounts_file() -> Path:
+    override = os.getenv("DOM_ACCOUNTS_FILE")
+    if override:
+        return Path(override)
+    base = os.getenv("XDG_CONFIG_HOME") or os.path.join(Path.home(), ".config")
+    return Path(base) / "dom" / "accounts.ini"
+
+
+def load_accounts(path: Optional[Path] = None) -> Dict[str, Account]:
+    """Accounts of the file, in file order; raises ``ValueError`` if unusable."""
+    path = path or accounts_file()
+    parser = configparser.ConfigParser(inline_comment_prefixes=("#", ";"))
+    try:
+        with open(path) as f:
+            parser.read_file(f)
+    except OSError as e:
+        raise ValueError(f"cannot read accounts file {path}: {e.strerror}") from None
+    except configparser.Error as e:
+        raise ValueError(f"invalid accounts file {path}: {e}") from None
+
+    accounts = {}
+    for name in parser.sections():
+        section = parser[name]
+        token = section.get("token")
+        if not token and section.get("token_env"):
+            token = os.getenv(section["token_env"])
+            if not token:
+                raise ValueError(f"account {name}: {section['token_env']} is not set")
+        if not token:
+            raise ValueError(f"account {name}: set token or token_env")
+        accounts[name] = Account(name, token, section.get("endpoint") or get_endpoint())
+    return accounts
+
+
+def select(names: Optional[str], all_accounts: bool = False) -> List[Account]:
+    """Accounts named in ``names`` (comma-separated), or all of them.
+
+    An empty list means the single account from the environment.
+    """
+    if not names and not all_accounts:
+        return []
+    accounts = load_accounts()
+    if all_accounts:
+        if not accounts:
+            raise ValueError(f"no accounts in {accounts_file()}")
+        return list(accounts.values())
+    wanted = [name.strip() for name in (names or "").split(",") if name.strip()]
+    unknown = [name for name in wanted if name not in accounts]
+    if unknown:
+        choices = ", ".join(accounts) or "(none)"
+        raise ValueError(f"unknown account {unknown[0]!r}, choose from {choices}")
+    return [accounts[name] for name in dict.fromkeys(wanted)]
+
+
+def client_for(account: Account):
+    """The shared pydo client of ``account``."""
+    from .client import get_client
+
+    return get_client(account.token, account.endpoint)
+
+
+def in_parallel(
+    accounts: List[Account], fn: Callable[[Account], Any]
+) -> Iterator[Tuple[Account, Future]]:
+    """Run ``fn(account)`` for every account at once.
+
+    Yields ``(account, future)`` in the order given, so callers can report
+    each account as soon as it and the ones before it are done.
+    """
+    workers = max(1, min(len(accounts), MAX_PARALLEL_ACCOUNTS))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fn, account) for account in accounts]
+        yield from zip(accounts, futures)
@@ -0,0 +1,300 @@
+"""Read-only asyncio client for the DigitalOcean API.
+
+pydo's ``Client`` is synchronous, so parallel work on top of it needs
+threads. ``AsyncClient`` covers the read endpoints dom lists (see
+``dom.utils.resources.RESOURCES``) plus account and balance, over a single
+pooled keep-alive ``httpx.AsyncClient`` configured like the shared sync
+transport (pool size, timeouts, gzip, optional HTTP/2; see
+``dom.utils.transport``). It returns the same dict shapes as
+the pydo path and reads through the same inventory cache.
+
+From a Typer command::
+
+    droplets = aio.run(aio.fetch("droplets"))
+
+From an async context (e.g. a Textual worker)::
+
+    async with aio.get_async_client() as client:
+        droplets = await client.list_resources("droplets")
+"""
+
+import asyncio
+import math
+import time
+from typing import Any, AsyncIterator, Coroutine, Dict, Iterable, Optional, TypeVar
+
+import httpx
+
+from . import archive, profile
+from . import cache as inventory_cache
+from .cache import account_key
+from .credentials import get_endpoint, get_token
+from .models import MODELS
+from .pagination import DEFAULT_CONCURRENCY, MAX_PER_PAGE
+from .ratelimit import MAX_RETRIES, RETRY_STATUSES, get_limiter
+from .resources import RESOURCES
+from .transport import async_client_options
+
+T = TypeVar("T")
+
+
+class ArchiveTransport(httpx.AsyncBaseTransport):
+    """httpx counterpart of ``dom.utils.transport.ArchiveAdapter``."""
+
+    def __init__(
+        self, store: "archive.Archive", inner: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.store = store
+        self.inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        authorization = request.headers.get("Authorization")
+        if self.store.replaying:
+            recorded = self.store.replay(
+                request.method, str(request.url), request.content, authorization
+            )
+            return httpx.Response(
+                recorded.status, headers=recorded.headers, content=recorded.body,
+                request=request,
+            )
+        if self.inner is None:
+            raise RuntimeError("recording needs a transport to send requests through")
+        response = await self.inner.handle_async_request(request)
+        content = await response.aread()  # decoded, as the archive keeps it
+        self.store.record(
+            request.method, str(request.url), request.content,
+            response.status_code, response.headers, content, authorization,
+        )
+        headers = [
+            (k, v) for k, v in response.headers.items()
+            if k.lower() not in ("content-encoding", "content-length")
+        ]
+        return httpx.Response(
+            response.status_code, headers=headers, content=content, request=request
+        )
+
+    async def aclose(self) -> None:
+        if self.inner is not None:
+            await self.inner.aclose()
+
+
+class AsyncClient:
+    """Pooled, read-only asyncio DigitalOcean client."""
+
+    def __init__(
+        self,
+        token: str,
+        endpoint: str,
+        *,
+        max_connections: Optional[int] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        **options: Any,
+    ):
+        self.dom_account = account_key(token, endpoint)
+        self.limiter = get_limiter(self.dom_account)
+        settings = async_client_options(max_connections)
+        settings["headers"].update(
+            {"Authorization": f"Bearer {token}", "Accept": "application/json"}
+        )
+        settings.update(options)
+        store = archive.active()
+        if transport is None and store is not None:
+            inner = None if store.replaying else httpx.AsyncHTTPTransport(
+                limits=settings["limits"], http2=settings["http2"]
+            )
+            transport = ArchiveTransport(store, inner)
+        self._http = httpx.AsyncClient(
+            base_url=endpoint, transport=transport, **settings
+        )
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def request(
+        self, path: str, headers: Optional[Dict[str, str]] = None, **params: Any
+    ) -> httpx.Response:
+        """GET ``path`` and return the raw response, whatever its status.
+
+        Requests are paced by the account's rate limiter; 429/5xx responses
+        and connection errors are retried with backoff.
+        """
+        tracer = profile.active()
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            await self.limiter.acquire_async()
+            try:
+                response = await self._http.get(
+                    path, params=params or None, headers=headers
+                )
+            except httpx.TransportError:
+                if attempt >= MAX_RETRIES:
+                    if tracer:
+                        page = params.get("page")
+                        tracer.call("GET", path, page, None, started, 0, attempt)
+                    raise
+                await asyncio.sleep(self.limiter.backoff(attempt))
+                attempt += 1
+                continue
+
+            self.limiter.observe(response.status_code, response.headers)
+            if response.status_code not in RETRY_STATUSES or attempt >= MAX_RETRIES:
+                if tracer:
+                    tracer.call(
+                        "GET", path, params.get("page"), response.status_code, started,
+                        response.num_bytes_downloaded, attempt,
+                    )
+                return response
+            await asyncio.sleep(self.limiter.backoff(attempt, response.headers))
+            attempt += 1
+
+    async def get(self, path: str, **params: Any) -> dict:
+        """GET ``path`` and return the decoded JSON body."""
+        response = await self.request(path, **params)
+        response.raise_for_status()
+        body: dict = response.json()
+        return body
+
+    async def paginate(
+        self,
+        path: str,
+        key: str,
+        *,
+        per_page: int = MAX_PER_PAGE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        **params: Any,
+    ) -> AsyncIterator[dict]:
+        """Yield every item of a paginated endpoint, in page order.
+
+        Mirrors ``dom.utils.pagination.paginate``: the first page gives
+        ``meta.total``, the rest are fetched concurrently, at most
+        ``concurrency`` at a time.
+        """
+        first = await self.get(path, per_page=per_page, page=1, **params)
+        items = first.get(key, [])
+        for item in items:
+            yield item
+
+        total = (first.get("meta") or {}).get("total")
+        if total is None:
+            page = 1
+            while len(items) >= per_page:
+                page += 1
+                body = await self.get(path, per_page=per_page, page=page, **params)
+                items = body.get(key, [])
+                for item in items:
+                    yield item
+            return
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def fetch(page: int) -> list:
+            async with semaphore:
+                body = await self.get(path, per_page=per_page, page=page, **params)
+            items: list = body.get(key, [])
+            return items
+
+        last_page = math.ceil(total / per_page)
+        tasks = [asyncio.ensure_future(fetch(page)) for page in range(2, last_page + 1)]
+        try:
+            for task in tasks:
+                for item in await task:
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def iter_resources(
+        self,
+        kind: str,
+        *args: Any,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        refresh: bool = False,
+        **params: Any,
+    ) -> AsyncIterator[dict]:
+        """Async counterpart of ``dom.utils.resources.iter_resources``."""
+        key_params = inventory_cache.params_key(*args, **params)
+        cached = inventory_cache.lookup(self.dom_account, kind, key_params, refresh)
+        if cached is not None:
+            for item in cached:
+                yield item
+            return
+
+        resource = RESOURCES[kind]
+        path = resource.path.format(*args)
+        if resource.paginated:
+            source = self.paginate(
+                path, resource.key, concurrency=concurrency, **params
+            )
+        else:
+            source = _aiter((await self.get(path, **params)).get(resource.key, []))
+        writer = inventory_cache.writer(self.dom_account, kind, key_params)
+        try:
+            async for item in source:
+                if writer:
+                    writer.add(item)
+                yield item
+        except BaseException:
+            if writer:
+                writer.discard()
+            raise
+        if writer:
+            writer.commit()
+
+    async def list_resources(self, kind: str, *args: Any, **params: Any) -> list:
+        """Fetch every ``kind`` resource into a list."""
+        return [item async for item in self.iter_resources(kind, *args, **params)]
+
+    async def list_models(self, kind: str, *args: Any, **params: Any) -> list:
+        """Fetch every ``kind`` resource as compact records."""
+        from_api = MODELS[kind].from_api
+        items = self.iter_resources(kind, *args, **params)
+        return [from_api(item) async for item in items]
+
+    async def gather_resources(
+        self, kinds: Iterable[str], **params: Any
+    ) -> Dict[str, Any]:
+        """Fetch several resource types at once.
+
+        Returns ``{kind: list}``; a type that failed maps to its exception
+        so one bad endpoint does not hide the others.
+        """
+        kinds = list(kinds)
+        results = await asyncio.gather(
+            *(self.list_resources(kind, **params) for kind in kinds),
+            return_exceptions=True,
+        )
+        return dict(zip(kinds, results))
+
+    async def account(self) -> dict:
+        return await self.get("/v2/account")
+
+    async def balance(self) -> dict:
+        return await self.get("/v2/customers/my/balance")
+
+
+async def _aiter(items: Iterable[T]) -> AsyncIterator[T]:
+    for item in items:
+        yield item
+
+
+def get_async_client(token: Optional[str] = None, **kwargs: Any) -> AsyncClient:
+    """Get an authenticated ``AsyncClient``; close it with ``aclose()``."""
+    return AsyncClient(token or get_token(), get_endpoint(), **kwargs)
+
+
+async def fetch(kind: str, *args: Any, **params: Any) -> list:
+    """List ``kind`` with a short-lived client."""
+    async with get_async_client() as client:
+        return await client.list_resources(kind, *args, **params)
+
+
+def run(awaitable: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion from synchronous (Typer) code."""
+    return asyncio.run(awaitable)
@@ -0,0 +1,286 @@
+"""Record API traffic to an archive and replay it offline.
+
+``dom --record run.dom.gz <command>`` keeps every API response the command
+gets, through pydo or the async client, and writes them to a gzipped JSON
+archive when it ends. ``dom --replay run.dom.gz <command>`` then answers
+the same requests from the archive: no network, no token, no rate-limit
+pacing and no inventory cache, so a customer's run can be reproduced and
+profiled anywhere.
+
+Responses are keyed by method, path, sorted query string and a hash of
+the request body; the host is left out so an archive replays against any
+endpoint. Requests sent with another token than the environment's (the
+accounts of ``--accounts``) also carry a fingerprint of that token, so
+accounts listing the same paths keep their own responses. A request made
+several times (a listing re-read after a delete) replays its responses
+in order, then repeats the last one. Retried attempts (429/5xx followed
+by a success) keep only the final response.
+
+Before anything is written, secrets are scrubbed: request headers are
+never stored, response headers are limited to ``KEPT_HEADERS``, and in
+bodies the values of secret-looking keys (passwords, tokens, URIs,
+kubeconfigs...), credentials embedded in URLs and the API token itself
+are replaced by ``REDACTED``.
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+ARCHIVE_VERSION = 1
+REDACTED = "REDACTED"
+
+KEPT_HEADERS = frozenset({
+    "content-type", "etag", "link", "retry-after",
+    "ratelimit-limit", "ratelimit-remaining", "ratelimit-reset",
+})
+# Replayed responses must not drive the rate limiter.
+REPLAY_DROPPED_HEADERS = frozenset(
+    {"ratelimit-limit", "ratelimit-remaining", "ratelimit-reset", "retry-after"}
+)
+RETRIED_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Stands in for the token under --replay, which never reaches the API.
+REPLAY_TOKEN = "replay"
+# Answer for a request the archive has no response for; not retried.
+MISSING_STATUS = 501
+
+_SECRET_KEY = re.compile(
+    r"(password|passwd|secret|token|private_key|api_key|access_key|credential|kubeconfig|"
+    r"(^|_)certificate(_chain)?$|(^|_)uri$|connection_string)",
+    re.IGNORECASE,
+)
+_URL_CREDENTIALS = re.compile(r"(?<=://)[^/@\s:]+:[^/@\s]+@")
+
+
+class Recorded(NamedTuple):
+    """One archived response."""
+
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+
+def request_key(
+    method: str, url: str, body: Optional[bytes] = None, account: str = ""
+) -> str:
+    """Archive key of a request, e.g. ``GET /v2/droplets?page=2&per_page=200``."""
+    parts = urlsplit(url)
+    key = f"{method.upper()} {parts.path}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    if query:
+        key += f"?{query}"
+    if body:
+        if isinstance(body, str):
+            body = body.encode()
+        key += f" #{hashlib.sha1(body).hexdigest()[:12]}"
+    if account:
+        key += f" @{account}"
+    return key
+
+
+def token_fingerprint(authorization: Optional[str]) -> str:
+    """Short, non-reversible id of the bearer token in an Authorization header."""
+    token = (authorization or "").partition(" ")[2]
+    return hashlib.sha256(token.encode()).hexdigest()[:12] if token else ""
+
+
+def scrub(value, secrets: Iterable[str] = ()):
+    """``value`` (decoded JSON) with secret-looking fields redacted."""
+    secrets = [s for s in secrets if s]
+    if isinstance(value, dict):
+        return {
+            k: REDACTED
+            if _SECRET_KEY.search(k) and v not in (None, "", [], {})
+            else scrub(v, secrets)
+            for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [scrub(v, secrets) for v in value]
+    if isinstance(value, str):
+        return _scrub_text(value, secrets)
+    return value
+
+
+def _scrub_text(text: str, secrets: List[str]) -> str:
+    text = _URL_CREDENTIALS.sub(f"{REDACTED}@", text)
+    for secret in secrets:
+        text = text.replace(secret, REDACTED)
+    return text
+
+
+def _scrub_body(body: bytes, content_type: str, secrets: List[str]) -> bytes:
+    if not body:
+        return body
+    if "json" in content_type:
+        try:
+            scrubbed = scrub(json.loads(body), secrets)
+            return json.dumps(scrubbed, separators=(",", ":")).encode()
+        except ValueError:
+            pass
+    try:
+        return _scrub_text(body.decode(), secrets).encode()
+    except UnicodeDecodeError:
+        return body
+
+
+class Archive:
+    """Responses by request key, recorded from or replayed to the API clients."""
+
+    def __init__(
+        self,
+        replaying: bool = False,
+        secrets: Iterable[str] = (),
+        token: Optional[str] = None,
+    ):
+        self.replaying = replaying
+        self.secrets = [s for s in secrets if s]
+        # requests with this token are keyed without an account fingerprint
+        token = REPLAY_TOKEN if replaying else token
+        self._default = token_fingerprint(f"Bearer {token}") if token else ""
+        self.responses: Dict[str, List[Recorded]] = {}
+        self.missing: List[str] = []
+        self._served: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(responses) for responses in self.responses.values())
+
+    def account(self, authorization: Optional[str]) -> str:
+        """Fingerprint of the request's token, or "" for the default account."""
+        fingerprint = token_fingerprint(authorization)
+        return "" if fingerprint == self._default else fingerprint
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        body,
+        status: int,
+        headers: Mapping[str, str],
+        content: bytes,
+        authorization: Optional[str] = None,
+    ) -> None:
+        key = request_key(method, url, body, self.account(authorization))
+        kept = {
+            name.lower(): value
+            for name, value in headers.items()
+            if name.lower() in KEPT_HEADERS
+        }
+        content_type = kept.get("content-type", "")
+        entry = Recorded(status, kept, _scrub_body(content, content_type, self.secrets))
+        with self._lock:
+            responses = self.responses.setdefault(key, [])
+            if responses and responses[-1].status in RETRIED_STATUSES:
+                responses[-1] = entry  # a retry of the same request
+            else:
+                responses.append(entry)
+
+    def replay(
+        self, method: str, url: str, body=None, authorization: Optional[str] = None
+    ) -> Recorded:
+        """Next recorded response for the request, or a 501 naming the missing key."""
+        key = request_key(method, url, body, self.account(authorization))
+        with self._lock:
+            responses = self.responses.get(key)
+            if not responses:
+                self.missing.append(key)
+                message = f"dom replay: no response recorded for {key}"
+                error = {"id": "not_recorded", "message": message}
+                return Recorded(MISSING_STATUS, {"content-type": "application/json"},
+                                json.dumps(error).encode())
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+            return responses[min(served, len(responses) - 1)]
+
+    def save(self, path: Path) -> None:
+        """Write the archive, gzipped, replacing ``path`` atomically."""
+        entries = {}
+        for key, responses in self.responses.items():
+            entries[key] = [_encode(r) for r in responses]
+        data = {
+            "version": ARCHIVE_VERSION,
+            "recorded_at": time.time(),
+            "responses": entries,
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        with os.fdopen(fd, "wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+                f.write(json.dumps(data, separators=(",", ":")).encode())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "Archive":
+        """Read an archive for replay; raises ``ValueError`` if it is not one."""
+        try:
+            with gzip.open(path, "rb") as f:
+                data = json.loads(f.read())
+        except (OSError, EOFError, ValueError) as e:
+            raise ValueError(f"not a dom archive ({e})") from None
+        if not isinstance(data, dict) or data.get("version") != ARCHIVE_VERSION:
+            raise ValueError("not a dom archive, or one written by another dom version")
+        archive = cls(replaying=True)
+        for key, responses in data["responses"].items():
+            archive.responses[key] = [_decode(r) for r in responses]
+        return archive
+
+
+def _encode(r: Recorded) -> dict:
+    try:
+        return {"status": r.status, "headers": r.headers, "body": r.body.decode()}
+    except UnicodeDecodeError:
+        body64 = base64.b64encode(r.body).decode()
+        return {"status": r.status, "headers": r.headers, "body64": body64}
+
+
+def _decode(entry: dict) -> Recorded:
+    if "body64" in entry:
+        body = base64.b64decode(entry["body64"])
+    else:
+        body = entry["body"].encode()
+    headers = {
+        k: v for k, v in entry["headers"].items() if k not in REPLAY_DROPPED_HEADERS
+    }
+    return Recorded(entry["status"], headers, body)
+
+
+_active: Optional[Archive] = None
+
+
+def start_recording(
+    secrets: Iterable[str] = (), token: Optional[str] = None
+) -> Archive:
+    global _active
+    _active = Archive(secrets=secrets, token=token)
+    return _active
+
+
+def start_replay(path: Path) -> Archive:
+    global _active
+    _active = Archive.load(path)
+    return _active
+
+
+def stop() -> Optional[Archive]:
+    """Leave record/replay mode and return the archive."""
+    global _active
+    archive, _active = _active, None
+    return archive
+
+
+def active() -> Optional[Archive]:
+    """The archive being recorded or replayed, if any."""
+    return _active
+
+
+def is_replaying() -> bool:
+    return _active is not None and _active.replaying
@@ -0,0 +1,183 @@
+"""Parallel bulk deletion with a resumable journal.
+
+``bulk_delete`` runs deletes on a bounded thread pool (every request still
+goes through the account's rate limiter, which retries it on 429 only),
+retries deletes refused because the resource is busy,
+shows a live progress bar and appends each outcome to a JSONL
+journal under the cache directory. If a run is interrupted, the next run
+of the same cleanup skips everything the journal records as deleted; the
+journal is removed once a run finishes with nothing left to do.
+
+A resource that is already gone (404) counts as deleted.
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+from rich.console import Console
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    TextColumn,
+    TimeElapsedColumn,
+)
+
+from .cache import cache_dir
+from .ratelimit import BACKOFF_BASE, BACKOFF_CAP
+
+DEFAULT_BULK_CONCURRENCY = 8
+BULK_RETRIES = 3
+
+# Answer while a resource is still busy (e.g. a volume being detached).
+# Rate limiting and server errors are retried by RateLimitPolicy already.
+BUSY_STATUS = 409
+
+
+class Target(NamedTuple):
+    """A resource to delete: its API id and a name for humans."""
+
+    id: str
+    name: str
+
+
+class BulkReport(NamedTuple):
+    deleted: List[Target]
+    failed: List[Tuple[Target, str]]
+    resumed: List[Target]  # deleted by an earlier, interrupted run
+
+
+def journal_path(account: str, kind: str) -> Path:
+    return cache_dir() / "journal" / f"{kind}-{account}.jsonl"
+
+
+class Journal:
+    """Append-only record of deletion outcomes."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def deleted(self) -> Set[str]:
+        """Ids recorded as deleted by previous runs."""
+        done: Set[str] = set()
+        if not self.path.exists():
+            return done
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # a line cut short by the interruption
+                if entry.get("status") == "deleted":
+                    done.add(entry["id"])
+        return done
+
+    def record(self, target: Target, status: str, error: str = "") -> None:
+        entry = {
+            "id": target.id, "name": target.name, "status": status, "at": time.time()
+        }
+        if error:
+            entry["error"] = error
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+def _busy(error: Exception) -> bool:
+    return isinstance(error, HttpResponseError) and error.status_code == BUSY_STATUS
+
+
+def _delete_one(delete: Callable[[str], Any], target: Target, retries: int) -> None:
+    attempt = 0
+    while True:
+        try:
+            delete(target.id)
+            return
+        except ResourceNotFoundError:
+            return  # already gone
+        except Exception as e:
+            if attempt >= retries or not _busy(e):
+                raise
+            time.sleep(min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+            attempt += 1
+
+
+def bulk_delete(
+    targets: Sequence[Target],
+    delete: Callable[[str], Any],
+    journal: Journal,
+    *,
+    label: str = "Deleting",
+    concurrency: int = DEFAULT_BULK_CONCURRENCY,
+    retries: int = BULK_RETRIES,
+    console: Optional[Console] = None,
+) -> BulkReport:
+    """Delete ``targets`` with ``delete(id)``, at most ``concurrency`` at a time."""
+    done = journal.deleted()
+    resumed = [t for t in targets if t.id in done]
+    pending = [t for t in targets if t.id not in done]
+    deleted: List[Target] = []
+    failed: List[Tuple[Target, str]] = []
+
+    progress = Progress(
+        TextColumn("{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TextColumn("[red]{task.fields[failed]} failed"),
+        TimeElapsedColumn(),
+        console=console,
+        transient=True,
+    )
+    with progress, ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        task = progress.add_task(label, total=len(pending), failed=0)
+        futures = {pool.submit(_delete_one, delete, t, retries): t for t in pending}
+        try:
+            for future in as_completed(futures):
+                target = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    message = str(e).splitlines()[0] if str(e) else type(e).__name__
+                    failed.append((target, message))
+                    journal.record(target, "failed", message)
+                else:
+                    deleted.append(target)
+                    journal.record(target, "deleted")
+                progress.update(task, advance=1, failed=len(failed))
+        except BaseException:
+            # Ctrl-C: stop scheduling; the journal has everything done so far
+            for future in futures:
+                future.cancel()
+            raise
+
+    if not failed:
+        journal.clear()
+    order = {t.id: i for i, t in enumerate(targets)}
+    deleted.sort(key=lambda t: order[t.id])
+    failed.sort(key=lambda f: order[f[0].id])
+    return BulkReport(deleted, failed, resumed)
+
+
+def print_report(console: Console, report: BulkReport, noun: str) -> None:
+    """Final summary of a bulk deletion."""
+    if report.resumed:
+        console.print(
+            f"[dim]{len(report.resumed)} {noun} already deleted"
+            " by an interrupted run[/dim]"
+        )
+    console.print(f"[green]Deleted {len(report.deleted)} {noun}[/green]")
+    if report.failed:
+        console.print(f"[red]Failed to delete {len(report.failed)} {noun}:[/red]")
+        for target, error in report.failed:
+            console.print(f"  [red]{target.name}[/red] ({target.id}): {error}")
+        console.print("[dim]Run the command again to retry them.[/dim]")
@@ -0,0 +1,367 @@
+"""On-disk inventory cache.
+
+Listings are stored in a SQLite database under the XDG cache directory
+(``$XDG_CACHE_HOME/dom/inventory.db``, override with ``DOM_CACHE_DIR``).
+Each listing is keyed by account, resource type and query parameters and
+expires after a per-type TTL, configurable with ``DOM_CACHE_TTL_<TYPE>``
+(seconds, e.g. ``DOM_CACHE_TTL_DROPLETS=60``). ``DOM_CACHE=off`` disables
+the cache entirely.
+
+The database runs in WAL mode with a busy timeout so several ``dom``
+processes can read and refresh it at the same time.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterator, NamedTuple, Optional
+
+# Seconds a cached listing stays fresh, per resource type.
+DEFAULT_TTLS = {
+    "droplets": 300,
+    "volumes": 300,
+    "domains": 3600,
+    "domain_records": 3600,
+    "firewalls": 900,
+    "load_balancers": 900,
+    "databases": 900,
+    "kubernetes": 900,
+    "apps": 900,
+    "snapshots": 3600,
+    "floating_ips": 900,
+    "sizes": 7 * 86400,  # the price catalog; prices rarely change
+    "account": 3600,  # a one-item listing, for `dom status`
+}
+FALLBACK_TTL = 300
+
+# Items a ListingWriter buffers before writing them out.
+WRITE_BATCH = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    account TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    params TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (account, kind, params)
+);
+CREATE TABLE IF NOT EXISTS items (
+    account TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    params TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (account, kind, params, seq)
+);
+CREATE TABLE IF NOT EXISTS zone_pages (
+    account TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    etag TEXT,
+    hash TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (account, domain, page)
+);
+"""
+
+
+class ZonePage(NamedTuple):
+    """A stored page of DNS records with its validators."""
+
+    etag: Optional[str]
+    hash: str
+    data: str
+
+
+class OfflineCacheMissError(Exception):
+    """Raised in offline mode when a listing is not in the cache."""
+
+    def __init__(self, kind: str):
+        super().__init__(f"no cached {kind}; run once without --offline")
+        self.kind = kind
+
+
+# Process-wide mode, set from the CLI's --refresh/--offline flags; the
+# cache is bypassed while recording or replaying API traffic.
+_mode = {"refresh": False, "offline": False, "enabled": True}
+
+
+def configure(
+    refresh: bool = False, offline: bool = False, enabled: bool = True
+) -> None:
+    """Set the cache mode for this process."""
+    _mode["refresh"] = refresh
+    _mode["offline"] = offline
+    _mode["enabled"] = enabled
+
+
+def is_offline() -> bool:
+    return _mode["offline"]
+
+
+def is_refresh() -> bool:
+    return _mode["refresh"]
+
+
+def cache_dir() -> Path:
+    """Directory holding the cache database."""
+    override = os.getenv("DOM_CACHE_DIR")
+    if override:
+        return Path(override)
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(Path.home(), ".cache")
+    return Path(base) / "dom"
+
+
+def ttl_for(kind: str) -> float:
+    """TTL in seconds for ``kind``, honouring DOM_CACHE_TTL_<KIND>."""
+    override = os.getenv(f"DOM_CACHE_TTL_{kind.upper()}")
+    if override is not None:
+        return float(override)
+    return DEFAULT_TTLS.get(kind, FALLBACK_TTL)
+
+
+def account_key(token: str, endpoint: str = "") -> str:
+    """Stable, non-reversible cache namespace for a token."""
+    return hashlib.sha256(f"{endpoint}\0{token}".encode()).hexdigest()[:16]
+
+
+def params_key(*args: Any, **params: Any) -> str:
+    """Canonical string for the arguments of a listing."""
+    return json.dumps([list(args), params], sort_keys=True, default=str)
+
+
+class InventoryCache:
+    """SQLite-backed store of resource listings."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shareable across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def fetched_at(self, account: str, kind: str, params: str) -> Optional[float]:
+        row = self._conn().execute(
+            "SELECT fetched_at FROM listings WHERE account=? AND kind=? AND params=?",
+            (account, kind, params),
+        ).fetchone()
+        return row[0] if row else None
+
+    def is_fresh(self, account: str, kind: str, params: str, ttl: float) -> bool:
+        fetched = self.fetched_at(account, kind, params)
+        return fetched is not None and time.time() - fetched < ttl
+
+    def count(self, account: str, kind: str, params: str) -> int:
+        row = self._conn().execute(
+            "SELECT COUNT(*) FROM items WHERE account=? AND kind=? AND params=?",
+            (account, kind, params),
+        ).fetchone()
+        return int(row[0])
+
+    def read(self, account: str, kind: str, params: str) -> Iterator[dict]:
+        """Stream the cached items of a listing, in their original order."""
+        conn = self._conn()
+        rows = conn.execute(
+            "SELECT data FROM items WHERE account=? AND kind=? AND params=?"
+            " ORDER BY seq",
+            (account, kind, params),
+        )
+        for (data,) in rows:
+            yield json.loads(data)
+
+    def write(self, account: str, kind: str, params: str, items: list) -> None:
+        """Atomically replace a listing."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            key = (account, kind, params)
+            conn.execute(
+                "DELETE FROM items WHERE account=? AND kind=? AND params=?", key
+            )
+            conn.executemany(
+                "INSERT INTO items VALUES (?, ?, ?, ?, ?)",
+                ((*key, seq, json.dumps(item)) for seq, item in enumerate(items)),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO listings VALUES (?, ?, ?, ?)",
+                (*key, time.time()),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def publish(self, account: str, kind: str, params: str, staged: str) -> None:
+        """Atomically replace a listing with the items staged under ``staged``."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            key = (account, kind, params)
+            conn.execute(
+                "DELETE FROM items WHERE account=? AND kind=? AND params=?", key
+            )
+            conn.execute(
+                "UPDATE items SET params=? WHERE account=? AND kind=? AND params=?",
+                (params, account, kind, staged),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO listings VALUES (?, ?, ?, ?)",
+                (*key, time.time()),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def zone_page(self, account: str, domain: str, page: int) -> Optional[ZonePage]:
+        row = self._conn().execute(
+            "SELECT etag, hash, data FROM zone_pages"
+            " WHERE account=? AND domain=? AND page=?",
+            (account, domain, page),
+        ).fetchone()
+        return ZonePage(*row) if row else None
+
+    def put_zone_page(
+        self, account: str, domain: str, page: int, zone_page: ZonePage
+    ) -> None:
+        self._conn().execute(
+            "INSERT OR REPLACE INTO zone_pages VALUES (?, ?, ?, ?, ?, ?)",
+            (account, domain, page, *zone_page),
+        )
+
+    def trim_zone(self, account: str, domain: str, last_page: int) -> None:
+        """Forget stored pages past the end of a zone that shrank."""
+        self._conn().execute(
+            "DELETE FROM zone_pages WHERE account=? AND domain=? AND page>?",
+            (account, domain, last_page),
+        )
+
+    def invalidate(self, account: str, kind: Optional[str] = None) -> None:
+        """Drop cached listings for an account, optionally of one type."""
+        where, args = "account=?", [account]
+        if kind is not None:
+            where += " AND kind=?"
+            args.append(kind)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(f"DELETE FROM items WHERE {where}", args)
+            conn.execute(f"DELETE FROM listings WHERE {where}", args)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+
+class ListingWriter:
+    """Stream a listing into the cache as it is fetched.
+
+    Items are written in batches under a staging key that readers never
+    see, so memory stays flat however long the listing is. ``commit``
+    publishes them atomically; ``discard`` drops them (e.g. when the
+    listing was not read to the end).
+    """
+
+    def __init__(self, cache: InventoryCache, account: str, kind: str, params: str):
+        self.cache = cache
+        self.key = (account, kind, params)
+        self.staged = f"{params}#staged-{uuid.uuid4().hex}"
+        self.seq = 0
+        self.batch: list = []
+
+    def add(self, item: Any) -> None:
+        self.batch.append(json.dumps(item))
+        if len(self.batch) >= WRITE_BATCH:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self.batch:
+            return
+        account, kind, _ = self.key
+        start = self.seq
+        self.cache._conn().executemany(
+            "INSERT INTO items VALUES (?, ?, ?, ?, ?)",
+            (
+                (account, kind, self.staged, start + i, data)
+                for i, data in enumerate(self.batch)
+            ),
+        )
+        self.seq += len(self.batch)
+        self.batch = []
+
+    def commit(self) -> None:
+        self._flush()
+        self.cache.publish(*self.key, self.staged)
+
+    def discard(self) -> None:
+        self.batch = []
+        account, kind, _ = self.key
+        self.cache._conn().execute(
+            "DELETE FROM items WHERE account=? AND kind=? AND params=?",
+            (account, kind, self.staged),
+        )
+
+
+_caches: Dict[Path, InventoryCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache() -> Optional[InventoryCache]:
+    """The cache for the current cache directory, or None if disabled."""
+    disabled = os.getenv("DOM_CACHE", "").lower() in ("0", "off", "false", "no")
+    if not _mode["enabled"] or disabled:
+        return None
+    path = cache_dir() / "inventory.db"
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = InventoryCache(path)
+        return _caches[path]
+
+
+def lookup(
+    account: Optional[str], kind: str, params: str, refresh: bool = False
+) -> Optional[Iterator[dict]]:
+    """Cached items to serve instead of calling the API, or None to fetch.
+
+    Fresh listings are served unless ``refresh`` (or --refresh) is set.
+    In offline mode stale listings are served too, and a missing one
+    raises ``OfflineCacheMissError``.
+    """
+    cache = get_cache()
+    if cache is not None and account is not None and not (refresh or is_refresh()):
+        if cache.is_fresh(account, kind, params, ttl_for(kind)):
+            return cache.read(account, kind, params)
+        if is_offline() and cache.fetched_at(account, kind, params) is not None:
+            return cache.read(account, kind, params)
+    if is_offline():
+        raise OfflineCacheMissError(kind)
+    return None
+
+
+def writer(account: Optional[str], kind: str, params: str) -> Optional[ListingWriter]:
+    """A writer streaming a listing being fetched into the cache, if enabled."""
+    cache = get_cache()
+    if cache is None or account is None:
+        return None
+    return ListingWriter(cache, account, kind, params)
+
+
+def store(account: Optional[str], kind: str, params: str, items: list) -> None:
+    """Save a freshly fetched listing, if the cache is enabled."""
+    cache = get_cache()
+    if cache is not None and account is not None:
+        cache.write(account, kind, params, items)
@@ -1,34 +1,87 @@
 """DigitalOcean API client wrapper."""
 
-import os
+import functools
 import sys
+import threading
+from typing import Optional
 
+from azure.core.pipeline.policies import SansIOHTTPPolicy
 from pydo import Client
 from rich.console import Console
 
+from .credentials import DEFAULT_ENDPOINT, current_account, get_endpoint, get_token  # noqa: F401
+from .ratelimit import RateLimitPolicy, get_limiter
+from .transport import TimeoutPolicy, get_transport
+
 console = Console()
 
 
-def get_client() -> Client:
-    """Get authenticated DigitalOcean client."""
-    token = os.getenv("DIGITALOCEAN_TOKEN") or os.getenv("DO_TOKEN")
+class TokenAuthPolicy(SansIOHTTPPolicy):
+    """Attach the API token as a bearer Authorization header.
+
+    pydo's stock credential policy refuses plain-http endpoints, which rules
+    out pointing the client at a local stand-in API.
+    """
+
+    def __init__(self, token: str):
+        super().__init__()
+        self._token = token
+
+    def on_request(self, request):
+        request.http_request.headers["Authorization"] = f"Bearer {self._token}"
+
+
+class AccountClient(Client):
+    """pydo client that knows which account it talks to."""
+
+    # Namespace for this account's entries in the inventory cache
+    dom_account: str
+
+
+_clients: dict = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(token: Optional[str] = None, endpoint: Optional[str] = None) -> Client:
+    """Get authenticated DigitalOcean client.
 
-    if not token:
-        console.print(
-            "[red]Error:[/red] DIGITALOCEAN_TOKEN or DO_TOKEN environment variable not set.\n"
-            "Export your token: export DIGITALOCEAN_TOKEN='your-token-here'"
-        )
-        sys.exit(1)
+    Clients are shared per token and endpoint, and all of them send
+    through the process-wide pooled transport.
+    """
+    token = token or get_token()
+    endpoint = endpoint or get_endpoint()
+    account = current_account(token, endpoint)
 
-    return Client(token=token)
+    with _clients_lock:
+        client = _clients.get(account)
+        if client is None:
+            client = AccountClient(
+                token=token,
+                endpoint=endpoint,
+                transport=get_transport(),
+                authentication_policy=TokenAuthPolicy(token),
+                per_call_policies=[TimeoutPolicy()],
+                # paces requests and retries 429/5xx in place of azure-core's retries
+                retry_policy=RateLimitPolicy(get_limiter(account)),
+            )
+            client.dom_account = account
+            _clients[account] = client
+        return client
 
 
 def handle_api_error(func):
     """Decorator to handle API errors gracefully."""
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
         try:
             return func(*args, **kwargs)
         except Exception as e:
-            console.print(f"[red]API Error:[/red] {e}")
+            if getattr(e, "status_code", None) == 429:
+                console.print(
+                    "[red]API Error:[/red] rate limit still exceeded after retries,"
+                    " try again later"
+                )
+            else:
+                console.print(f"[red]API Error:[/red] {e}")
             sys.exit(1)
     return wrapper
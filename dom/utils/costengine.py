@@ -0,0 +1,227 @@
+"""Columnar cost aggregation.
+
+The billable inventory (droplets, volumes, snapshots, load balancers,
+database and Kubernetes clusters, unassigned reserved IPs) is loaded once
+into NumPy columns: one integer code per item for each dimension, plus
+the monthly cost. Group-bys over any combination of ``type``, ``region``,
+``size`` and ``tag`` are then a single vectorized ``bincount`` over a
+combined key, linear in the number of items.
+
+Tags are many-to-many: an item with two tags counts towards both, and
+untagged items are grouped under ``untagged``. Only group-bys that include
+``tag`` expand items per tag, so the other totals are never
+double-counted.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from . import profile
+from .pricing import PriceCatalog
+from .resources import iter_models
+
+DIMENSIONS = ("type", "region", "size", "tag")
+UNTAGGED = "untagged"
+
+# Resource types with a monthly price.
+BILLABLE = (
+    "droplets", "volumes", "snapshots", "load_balancers", "databases", "kubernetes",
+    "floating_ips",
+)
+
+# Largest combined key space aggregated densely with bincount; sparser
+# combinations are compacted with np.unique first.
+DENSE_LIMIT = 1 << 22
+
+
+class CostGroup(NamedTuple):
+    """Total of one group: its dimension values, item count and cost."""
+
+    keys: Tuple[str, ...]
+    items: int
+    cost: float
+
+
+class _Codes:
+    """String to integer code mapping for one dimension."""
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def code(self, value: str) -> int:
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class CostFrame:
+    """Billable items as columns, ready for grouped sums."""
+
+    def __init__(self):
+        self.codes = {dim: _Codes() for dim in DIMENSIONS}
+        self._columns: Dict[str, list] = {
+            "type": [], "region": [], "size": [], "cost": []
+        }
+        self._tag_items: list = []
+        self._tag_codes: list = []
+        self._arrays: Dict[str, np.ndarray] = {}
+        self.skipped: List[str] = []  # resource types that could not be listed
+
+    def add(
+        self, kind: str, region: str, size: str, tags: Iterable[str], cost: float
+    ) -> None:
+        item = len(self._columns["cost"])
+        columns, codes = self._columns, self.codes
+        columns["type"].append(codes["type"].code(kind))
+        columns["region"].append(codes["region"].code(region))
+        columns["size"].append(codes["size"].code(size))
+        columns["cost"].append(cost)
+        tag_codes = codes["tag"]
+        tagged = False
+        for tag in tags:
+            self._tag_items.append(item)
+            self._tag_codes.append(tag_codes.code(tag))
+            tagged = True
+        if not tagged:
+            self._tag_items.append(item)
+            self._tag_codes.append(tag_codes.code(UNTAGGED))
+        self._arrays = {}
+
+    def __len__(self) -> int:
+        return len(self._columns["cost"])
+
+    def _array(self, name: str) -> np.ndarray:
+        if name not in self._arrays:
+            if name == "cost":
+                data = np.asarray(self._columns["cost"], dtype=np.float64)
+            elif name == "tag_item":
+                data = np.asarray(self._tag_items, dtype=np.int64)
+            elif name == "tag":
+                data = np.asarray(self._tag_codes, dtype=np.int64)
+            else:
+                data = np.asarray(self._columns[name], dtype=np.int64)
+            self._arrays[name] = data
+        return self._arrays[name]
+
+    @property
+    def total(self) -> float:
+        return float(self._array("cost").sum())
+
+    def group_by(self, by: Sequence[str]) -> List[CostGroup]:
+        """Sum cost and count items per combination of ``by``.
+
+        Groups come costliest first, ties in key order.
+        """
+        unknown = [dim for dim in by if dim not in DIMENSIONS]
+        if unknown:
+            choices = ", ".join(DIMENSIONS)
+            raise ValueError(
+                f"unknown dimension {unknown[0]!r} (choose from {choices})"
+            )
+        if not len(self):
+            return []
+
+        if "tag" in by:
+            rows = self._array("tag_item")
+            columns = {dim: self._array(dim)[rows] for dim in by if dim != "tag"}
+            columns["tag"] = self._array("tag")
+            cost = self._array("cost")[rows]
+        else:
+            columns = {dim: self._array(dim) for dim in by}
+            cost = self._array("cost")
+
+        # one combined key per row, mixed-radix over the dimension cardinalities
+        radices = [len(self.codes[dim].values) for dim in by]
+        key = np.zeros(len(cost), dtype=np.int64)
+        for dim, radix in zip(by, radices):
+            key = key * radix + columns[dim]
+
+        space = int(np.prod(radices, dtype=np.float64)) if radices else 1
+        if space <= max(DENSE_LIMIT, len(key)):
+            counts = np.bincount(key, minlength=space)
+            sums = np.bincount(key, weights=cost, minlength=space)
+            groups = np.flatnonzero(counts)
+            counts, sums = counts[groups], sums[groups]
+        else:
+            groups, inverse = np.unique(key, return_inverse=True)
+            counts = np.bincount(inverse)
+            sums = np.bincount(inverse, weights=cost)
+
+        # decode combined keys back to per-dimension codes
+        decoded = []
+        rest = groups
+        for dim, radix in reversed(list(zip(by, radices))):
+            decoded.append((dim, rest % radix))
+            rest = rest // radix
+        decoded.reverse()
+
+        values = [self.codes[dim].values for dim in by]
+        labels = [
+            [vals[code] for code in codes.tolist()]
+            for vals, (_, codes) in zip(values, decoded)
+        ]
+        keys = zip(*labels) if by else [()] * len(groups)
+        result = [
+            CostGroup(key, items, cost)
+            for key, items, cost in zip(keys, counts.tolist(), sums.tolist())
+        ]
+        result.sort(key=lambda group: (-group.cost, group.keys))
+        return result
+
+
+def _items(kind: str, records: Iterable, catalog: PriceCatalog):
+    """(region, size, tags, cost) for each billable record of ``kind``."""
+    for r in records:
+        if kind == "droplets":
+            yield r.region, r.size, r.tags, catalog.droplet(r)
+        elif kind == "volumes":
+            cost = catalog.volume(r.size_gigabytes)
+            yield r.region, f"{r.size_gigabytes}gb", r.tags, cost
+        elif kind == "snapshots":
+            region = r.regions[0] if r.regions else ""
+            cost = catalog.snapshot(r.size_gigabytes)
+            yield region, f"{r.size_gigabytes:g}gb", r.tags, cost
+        elif kind == "load_balancers":
+            size = r.size or f"{r.size_unit}-node"
+            yield r.region, size, (r.tag,) if r.tag else (), catalog.load_balancer(r)
+        elif kind == "databases":
+            yield r.region, r.size, r.tags, catalog.database(r)
+        elif kind == "kubernetes":
+            yield r.region, f"{r.node_count}-node", r.tags, catalog.kubernetes(r)
+        elif kind == "floating_ips":
+            if r.droplet_id is None:
+                yield r.region, "", (), catalog.floating_ip(assigned=False)
+
+
+def load_frame(
+    client, catalog: PriceCatalog, kinds: Sequence[str] = BILLABLE
+) -> CostFrame:
+    """Fetch the billable inventory (all types at once) into a CostFrame.
+
+    A type that cannot be listed (e.g. no access to it) is skipped and
+    recorded in ``frame.skipped``.
+    """
+    def fetch(kind):
+        try:
+            with profile.phase(f"fetch {kind}"):
+                return list(iter_models(client, kind))
+        except Exception:
+            return None
+
+    with ThreadPoolExecutor(max_workers=len(kinds)) as pool:
+        listings = list(pool.map(fetch, kinds))
+
+    frame = CostFrame()
+    with profile.phase("transform prices"):
+        for kind, records in zip(kinds, listings):
+            if records is None:
+                frame.skipped.append(kind)
+                continue
+            for region, size, tags, cost in _items(kind, records, catalog):
+                frame.add(kind, region, size, tags, cost)
+    return frame
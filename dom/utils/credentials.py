@@ -0,0 +1,49 @@
+"""API token and endpoint from the environment.
+
+Kept apart from ``dom.utils.client`` so that code serving the local cache
+can work out the account without importing pydo.
+"""
+
+import os
+import sys
+from typing import Optional
+
+from rich.console import Console
+
+from . import archive
+from .cache import account_key
+
+console = Console()
+
+DEFAULT_ENDPOINT = "https://api.digitalocean.com"
+
+
+def find_token() -> Optional[str]:
+    return os.getenv("DIGITALOCEAN_TOKEN") or os.getenv("DO_TOKEN")
+
+
+def get_token() -> str:
+    """Read the API token from the environment, exiting if it is missing."""
+    if archive.is_replaying():
+        return archive.REPLAY_TOKEN
+    token = find_token()
+
+    if not token:
+        console.print(
+            "[red]Error:[/red] DIGITALOCEAN_TOKEN or DO_TOKEN environment variable"
+            " not set.\n"
+            "Export your token: export DIGITALOCEAN_TOKEN='your-token-here'"
+        )
+        sys.exit(1)
+
+    return token
+
+
+def get_endpoint() -> str:
+    """API base URL, overridable with DIGITALOCEAN_API_URL."""
+    return os.getenv("DIGITALOCEAN_API_URL") or DEFAULT_ENDPOINT
+
+
+def current_account(token: Optional[str] = None, endpoint: Optional[str] = None) -> str:
+    """Inventory cache namespace of the configured token and endpoint."""
+    return account_key(token or get_token(), endpoint or get_endpoint())
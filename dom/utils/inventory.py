@@ -0,0 +1,154 @@
+"""Ansible dynamic inventory built from the droplet listing.
+
+``dom ans inventory --list`` prints the JSON Ansible's script inventory
+plugin expects: one group per tag, region, size and VPC, plus ``_meta``
+with every host's variables, so Ansible never calls ``--host``.
+
+The JSON is saved under the cache directory next to the droplet listing
+it was built from. While that listing is fresh (or in offline mode) the
+saved JSON is printed as is: no API call, no pydo import and no parsing,
+which keeps ``ansible-playbook`` startup in the milliseconds.
+"""
+
+import fnmatch
+import json
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from . import cache as inventory_cache
+from .credentials import current_account
+
+# Bump when the layout of the generated JSON changes.
+INVENTORY_VERSION = 1
+
+
+def group_name(prefix: str, value: str) -> str:
+    """Ansible-safe group name, e.g. ``size_s_1vcpu_1gb``."""
+    return re.sub(r"[^A-Za-z0-9_]", "_", f"{prefix}_{value}")
+
+
+def host_vars(droplet) -> dict:
+    return {
+        "ansible_host": droplet.ip,
+        "do_id": droplet.id,
+        "do_name": droplet.name,
+        "do_status": droplet.status,
+        "do_region": droplet.region,
+        "do_size": droplet.size,
+        "do_image": droplet.image,
+        "do_public_ip": droplet.public_ip,
+        "do_private_ip": droplet.private_ip,
+        "do_vpc_uuid": droplet.vpc_uuid,
+        "do_tags": list(droplet.tags),
+    }
+
+
+def build_inventory(droplets: Iterable) -> dict:
+    """Script-plugin JSON for ``droplets``; droplets without an IP are left out."""
+    hostvars: Dict[str, dict] = {}
+    groups: Dict[str, list] = {}
+    ungrouped = []
+    for d in droplets:
+        if not d.ip:
+            continue
+        host = d.name if d.name not in hostvars else f"{d.name}-{d.id}"
+        hostvars[host] = host_vars(d)
+        values = [("tag", tag) for tag in d.tags]
+        values += [("region", d.region), ("size", d.size), ("vpc", d.vpc_uuid)]
+        values = [(prefix, value) for prefix, value in values if value]
+        for prefix, value in values:
+            groups.setdefault(group_name(prefix, value), []).append(host)
+        if not values:
+            ungrouped.append(host)
+
+    inventory: dict = {"_meta": {"hostvars": hostvars}}
+    inventory["all"] = {"children": sorted(groups) + ["ungrouped"]}
+    inventory["ungrouped"] = {"hosts": ungrouped}
+    for name in sorted(groups):
+        inventory[name] = {"hosts": groups[name]}
+    return inventory
+
+
+def select_hosts(inventory: dict, pattern: str) -> List[str]:
+    """Hosts matching an Ansible-style pattern, in inventory order.
+
+    ``pattern`` is ``all`` or comma/colon-separated host and group names,
+    which may use shell wildcards (``tag_web,region_fra*``).
+    """
+    hostvars = inventory["_meta"]["hostvars"]
+    groups = [name for name in inventory if name not in ("_meta", "all")]
+    wanted = set()
+    for part in re.split(r"[,:]", pattern):
+        part = part.strip()
+        if part in ("all", "*"):
+            return list(hostvars)
+        wanted.update(fnmatch.filter(hostvars, part))
+        for group in fnmatch.filter(groups, part):
+            wanted.update(inventory[group].get("hosts", ()))
+    return [host for host in hostvars if host in wanted]
+
+
+def saved_path(account: str) -> Path:
+    return inventory_cache.cache_dir() / "ansible" / f"{account}.json"
+
+
+def _read_saved(account: str, fetched_at: float) -> Optional[str]:
+    """Saved inventory JSON built from the listing fetched at ``fetched_at``."""
+    try:
+        with open(saved_path(account)) as f:
+            header = json.loads(f.readline())
+            if header != {"version": INVENTORY_VERSION, "fetched_at": fetched_at}:
+                return None
+            return f.read()
+    except (OSError, ValueError):
+        return None
+
+
+def _save(account: str, fetched_at: float, data: str) -> None:
+    path = saved_path(account)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    with os.fdopen(fd, "w") as f:
+        header = {"version": INVENTORY_VERSION, "fetched_at": fetched_at}
+        f.write(json.dumps(header) + "\n")
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def inventory_json(refresh: bool = False) -> str:
+    """The ``--list`` JSON, from the saved copy when the droplets are cached."""
+    account = current_account()
+    cache = inventory_cache.get_cache()
+    params = inventory_cache.params_key()
+    refresh = refresh or inventory_cache.is_refresh()
+
+    if cache is not None and not refresh:
+        fetched = cache.fetched_at(account, "droplets", params)
+        ttl = inventory_cache.ttl_for("droplets")
+        if fetched is not None and (
+            inventory_cache.is_offline() or time.time() - fetched < ttl
+        ):
+            saved = _read_saved(account, fetched)
+            if saved is not None:
+                return saved
+
+    from .client import get_client
+    from .resources import list_models
+
+    droplets = list_models(get_client(), "droplets", refresh=refresh)
+    data = json.dumps(build_inventory(droplets), separators=(",", ":"))
+    if cache is not None:
+        fetched = cache.fetched_at(account, "droplets", params)
+        if fetched is not None:
+            _save(account, fetched, data)
+    return data
+
+
+def host_json(host: str, refresh: bool = False) -> str:
+    """The ``--host`` JSON: variables of one host, ``{}`` if unknown."""
+    hostvars = json.loads(inventory_json(refresh))["_meta"]["hostvars"]
+    return json.dumps(hostvars.get(host, {}))
@@ -0,0 +1,377 @@
+"""Compact, typed records for the resources dom works with.
+
+API listings carry far more than dom uses (a droplet embeds its whole
+image, kernel, size and region objects). ``from_api`` reduces an item to
+the fields commands read, resolves nested lookups such as the public IP
+once, and interns the short strings (region, size, status) repeated across
+thousands of items. Records are immutable tuples, so a 50k-droplet account
+costs a fraction of the raw JSON dicts.
+
+``MODELS`` maps each resource type of ``dom.utils.resources.RESOURCES``
+to its record class; ``iter_models``/``list_models`` there return them.
+"""
+
+import sys
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+
+def _intern(value: Any) -> str:
+    return sys.intern(value) if isinstance(value, str) else ""
+
+
+def _slug(value: Any) -> str:
+    """Slug of a nested object, or the value itself where the API flattens it."""
+    if isinstance(value, dict):
+        value = value.get("slug")
+    return _intern(value)
+
+
+def _ids(values: Any) -> Tuple[Any, ...]:
+    return tuple(values or ())
+
+
+def _tags(values: Any) -> Tuple[str, ...]:
+    return tuple(_intern(tag) for tag in values or ())
+
+
+def _ipv4(networks: Any, kind: str) -> str:
+    for net in (networks or {}).get("v4") or ():
+        if net.get("type") == kind:
+            return net.get("ip_address") or ""
+    return ""
+
+
+class Droplet(NamedTuple):
+    id: int
+    name: str
+    status: str
+    region: str
+    region_name: str
+    size: str
+    vcpus: int
+    memory: int
+    disk: int
+    image: str
+    public_ip: str
+    private_ip: str
+    tags: Tuple[str, ...]
+    vpc_uuid: str
+    created_at: str
+    price_monthly: float
+    locked: bool  # an action is in progress
+
+    @property
+    def ip(self) -> str:
+        """Address to reach the droplet at: public if it has one."""
+        return self.public_ip or self.private_ip
+
+    @classmethod
+    def from_api(cls, d: dict) -> "Droplet":
+        region = d.get("region") or {}
+        image = d.get("image") or {}
+        networks = d.get("networks")
+        return cls(
+            d["id"],
+            d.get("name", ""),
+            _intern(d.get("status")),
+            _slug(region),
+            _intern(region.get("name")) if isinstance(region, dict) else "",
+            _intern(d.get("size_slug")) or _slug(d.get("size")),
+            d.get("vcpus", 0),
+            d.get("memory", 0),
+            d.get("disk", 0),
+            _intern(image.get("slug") or image.get("name")),
+            _ipv4(networks, "public"),
+            _ipv4(networks, "private"),
+            _tags(d.get("tags")),
+            _intern(d.get("vpc_uuid")),
+            d.get("created_at", ""),
+            float((d.get("size") or {}).get("price_monthly") or 0),
+            bool(d.get("locked")),
+        )
+
+
+class Volume(NamedTuple):
+    id: str
+    name: str
+    region: str
+    size_gigabytes: int
+    droplet_ids: Tuple[int, ...]
+    filesystem_type: str
+    description: str
+    tags: Tuple[str, ...]
+    created_at: str
+
+    @classmethod
+    def from_api(cls, v: dict) -> "Volume":
+        return cls(
+            v["id"],
+            v.get("name", ""),
+            _slug(v.get("region")),
+            v.get("size_gigabytes", 0),
+            _ids(v.get("droplet_ids")),
+            _intern(v.get("filesystem_type")),
+            v.get("description") or "",
+            _tags(v.get("tags")),
+            v.get("created_at", ""),
+        )
+
+
+class Domain(NamedTuple):
+    name: str
+    ttl: Optional[int]
+
+    @classmethod
+    def from_api(cls, d: dict) -> "Domain":
+        return cls(d["name"], d.get("ttl"))
+
+
+class DomainRecord(NamedTuple):
+    id: int
+    type: str
+    name: str
+    data: str
+    ttl: Optional[int]
+    priority: Optional[int]
+
+    @classmethod
+    def from_api(cls, r: dict) -> "DomainRecord":
+        return cls(
+            r.get("id", 0),
+            _intern(r.get("type")),
+            _intern(r.get("name")),
+            r.get("data", ""),
+            r.get("ttl"),
+            r.get("priority"),
+        )
+
+
+class FirewallRule(NamedTuple):
+    protocol: str
+    ports: str
+    addresses: Tuple[str, ...]
+    droplet_ids: Tuple[int, ...]
+
+    @property
+    def targets(self) -> list:
+        """Where traffic comes from (inbound) or goes to (outbound)."""
+        return list(self.addresses or self.droplet_ids or ("any",))
+
+    @classmethod
+    def from_api(cls, rule: dict, side: str) -> "FirewallRule":
+        targets = rule.get(side) or {}
+        return cls(
+            _intern(rule.get("protocol")),
+            _intern(rule.get("ports")),
+            tuple(targets.get("addresses") or ()),
+            _ids(targets.get("droplet_ids")),
+        )
+
+
+class Firewall(NamedTuple):
+    id: str
+    name: str
+    droplet_ids: Tuple[int, ...]
+    inbound_rules: Tuple[FirewallRule, ...]
+    outbound_rules: Tuple[FirewallRule, ...]
+    tags: Tuple[str, ...]
+
+    @classmethod
+    def from_api(cls, fw: dict) -> "Firewall":
+        return cls(
+            fw.get("id", ""),
+            fw.get("name", ""),
+            _ids(fw.get("droplet_ids")),
+            tuple(
+                FirewallRule.from_api(r, "sources")
+                for r in fw.get("inbound_rules") or ()
+            ),
+            tuple(
+                FirewallRule.from_api(r, "destinations")
+                for r in fw.get("outbound_rules") or ()
+            ),
+            _tags(fw.get("tags")),
+        )
+
+
+class LoadBalancer(NamedTuple):
+    id: str
+    name: str
+    ip: str
+    status: str
+    region: str
+    size: str
+    size_unit: int
+    droplet_ids: Tuple[int, ...]
+    tag: str
+
+    @classmethod
+    def from_api(cls, lb: dict) -> "LoadBalancer":
+        return cls(
+            lb.get("id", ""),
+            lb.get("name", ""),
+            lb.get("ip") or "",
+            _intern(lb.get("status")),
+            _slug(lb.get("region")),
+            _intern(lb.get("size")),
+            lb.get("size_unit") or 1,
+            _ids(lb.get("droplet_ids")),
+            _intern(lb.get("tag")),
+        )
+
+
+class Database(NamedTuple):
+    id: str
+    name: str
+    engine: str
+    version: str
+    size: str
+    region: str
+    status: str
+    num_nodes: int
+    tags: Tuple[str, ...]
+
+    @classmethod
+    def from_api(cls, db: dict) -> "Database":
+        return cls(
+            db.get("id", ""),
+            db.get("name", ""),
+            _intern(db.get("engine")),
+            _intern(db.get("version")),
+            _intern(db.get("size")),
+            _slug(db.get("region")),
+            _intern(db.get("status")),
+            db.get("num_nodes") or 1,
+            _tags(db.get("tags")),
+        )
+
+
+class NodePool(NamedTuple):
+    size: str
+    nodes: int  # the API's "count", which would shadow tuple.count
+
+
+class KubernetesCluster(NamedTuple):
+    id: str
+    name: str
+    region: str
+    version: str
+    status: str
+    node_pools: Tuple[NodePool, ...]
+    tags: Tuple[str, ...]
+
+    @property
+    def node_count(self) -> int:
+        return sum(pool.nodes for pool in self.node_pools)
+
+    @classmethod
+    def from_api(cls, k: dict) -> "KubernetesCluster":
+        return cls(
+            k.get("id", ""),
+            k.get("name", ""),
+            _slug(k.get("region")),
+            _intern(k.get("version")),
+            _intern((k.get("status") or {}).get("state")),
+            tuple(
+                NodePool(_intern(p.get("size")), p.get("count", 0))
+                for p in k.get("node_pools") or ()
+            ),
+            _tags(k.get("tags")),
+        )
+
+
+class App(NamedTuple):
+    id: str
+    name: str
+    region: str
+    live_url: str
+
+    @classmethod
+    def from_api(cls, a: dict) -> "App":
+        return cls(
+            a.get("id", ""),
+            (a.get("spec") or {}).get("name", ""),
+            _slug(a.get("region")),
+            a.get("live_url") or "",
+        )
+
+
+class Snapshot(NamedTuple):
+    id: str
+    name: str
+    resource_type: str
+    regions: Tuple[str, ...]
+    min_disk_size: int
+    size_gigabytes: float
+    tags: Tuple[str, ...]
+    created_at: str
+
+    @classmethod
+    def from_api(cls, s: dict) -> "Snapshot":
+        return cls(
+            str(s.get("id", "")),
+            s.get("name", ""),
+            _intern(s.get("resource_type")),
+            _tags(s.get("regions")),
+            s.get("min_disk_size", 0),
+            s.get("size_gigabytes") or 0.0,
+            _tags(s.get("tags")),
+            s.get("created_at", ""),
+        )
+
+
+class FloatingIP(NamedTuple):
+    ip: str
+    region: str
+    droplet_id: Optional[int]
+
+    @classmethod
+    def from_api(cls, ip: dict) -> "FloatingIP":
+        droplet = ip.get("droplet") or {}
+        return cls(ip["ip"], _slug(ip.get("region")), droplet.get("id"))
+
+
+class Size(NamedTuple):
+    slug: str
+    vcpus: int
+    memory: int
+    disk: int
+    price_monthly: float
+    price_hourly: float
+    regions: Tuple[str, ...]
+    available: bool
+
+    @classmethod
+    def from_api(cls, s: dict) -> "Size":
+        return cls(
+            _intern(s.get("slug")),
+            s.get("vcpus", 0),
+            s.get("memory", 0),
+            s.get("disk", 0),
+            float(s.get("price_monthly") or 0),
+            float(s.get("price_hourly") or 0),
+            _tags(s.get("regions")),
+            bool(s.get("available", True)),
+        )
+
+
+# Record type of each resource type; every one has a from_api constructor.
+MODELS: Dict[str, Any] = {
+    "droplets": Droplet,
+    "volumes": Volume,
+    "domains": Domain,
+    "domain_records": DomainRecord,
+    "firewalls": Firewall,
+    "load_balancers": LoadBalancer,
+    "databases": Database,
+    "kubernetes": KubernetesCluster,
+    "apps": App,
+    "snapshots": Snapshot,
+    "floating_ips": FloatingIP,
+    "sizes": Size,
+}
+
+
+def from_api(kind: str, item: dict):
+    """Build the record for one API item of resource type ``kind``."""
+    return MODELS[kind].from_api(item)
@@ -0,0 +1,70 @@
+"""Paginated fetching for DigitalOcean list endpoints.
+
+The API returns 20 items per page by default. ``paginate`` asks for the
+largest page size, reads ``meta.total`` from the first response and then
+fetches the remaining pages concurrently, yielding items in page order.
+"""
+
+import math
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator
+
+MAX_PER_PAGE = 200
+DEFAULT_CONCURRENCY = 8
+
+
+def paginate(
+    list_fn: Callable[..., dict],
+    key: str,
+    *,
+    per_page: int = MAX_PER_PAGE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    **params: Any,
+) -> Iterator[dict]:
+    """Lazily yield every item of a paginated list endpoint.
+
+    ``list_fn`` is a pydo list method (e.g. ``client.droplets.list``) and
+    ``key`` the response field holding the items. Nothing is fetched until
+    the iterator is first advanced. At most ``concurrency`` page requests
+    are in flight at once.
+    """
+    first = list_fn(per_page=per_page, page=1, **params)
+    items = first.get(key, [])
+    yield from items
+
+    total = (first.get("meta") or {}).get("total")
+    if total is None:
+        # No meta block: fall back to walking pages until one comes back short.
+        page = 1
+        while len(items) >= per_page:
+            page += 1
+            items = list_fn(per_page=per_page, page=page, **params).get(key, [])
+            yield from items
+        return
+
+    last_page = math.ceil(total / per_page)
+    if last_page <= 1:
+        return
+
+    def fetch(page: int) -> list:
+        items: list = list_fn(per_page=per_page, page=page, **params).get(key, [])
+        return items
+
+    pages = iter(range(2, last_page + 1))
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        pending: deque = deque()
+        for page in pages:
+            pending.append(pool.submit(fetch, page))
+            if len(pending) >= concurrency:
+                break
+        try:
+            while pending:
+                items = pending.popleft().result()
+                next_page = next(pages, None)
+                if next_page is not None:
+                    pending.append(pool.submit(fetch, next_page))
+                yield from items
+        finally:
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,121 @@
+"""Price catalog for cost estimates.
+
+Droplet prices come from ``/v2/sizes``, read through the inventory cache
+(where the listing stays fresh for a week, ``DOM_CACHE_TTL_SIZES``), so
+the catalog costs at most one API call per week and none after that. The
+API does not price databases, volumes, snapshots, load balancers or
+reserved IPs; those, and every droplet size when the API is unreachable,
+come from the bundled ``dom/data/pricing.json``.
+
+Every lookup is a dict access::
+
+    catalog = get_catalog(client)
+    total = sum(catalog.droplet(d) for d in droplets)
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from azure.core.exceptions import AzureError
+
+from .cache import OfflineCacheMissError
+from .models import Database, Droplet, KubernetesCluster, LoadBalancer
+from .resources import iter_models
+
+BUNDLED_PRICES = Path(__file__).resolve().parent.parent / "data" / "pricing.json"
+
+
+class PriceCatalog:
+    """Monthly list prices, in USD."""
+
+    def __init__(
+        self,
+        droplets: Dict[str, float],
+        databases: Dict[str, float],
+        rates: Dict[str, float],
+        source: str,
+    ):
+        self.droplets = droplets
+        self.databases = databases
+        self.rates = rates
+        self.source = source  # "api" or "bundled"
+
+    def size(self, slug: str) -> Optional[float]:
+        """Price of a droplet size, None if unknown."""
+        return self.droplets.get(slug)
+
+    def droplet(self, d: Droplet) -> float:
+        price = self.droplets.get(d.size)
+        return price if price is not None else d.price_monthly
+
+    def database(self, db: Database) -> float:
+        """Cluster price: every node (primary and standbys) is billed."""
+        return self.databases.get(db.size, 0.0) * db.num_nodes
+
+    def kubernetes(self, cluster: KubernetesCluster) -> float:
+        return sum(
+            self.droplets.get(pool.size, 0.0) * pool.nodes
+            for pool in cluster.node_pools
+        )
+
+    def load_balancer(self, lb: LoadBalancer) -> float:
+        return self.rates["load_balancer_node"] * lb.size_unit
+
+    def volume(self, size_gigabytes: float) -> float:
+        return self.rates["volume_gb"] * size_gigabytes
+
+    def snapshot(self, size_gigabytes: float) -> float:
+        return self.rates["snapshot_gb"] * size_gigabytes
+
+    def floating_ip(self, assigned: bool) -> float:
+        """Reserved IPs are only billed while unassigned."""
+        return 0.0 if assigned else self.rates["floating_ip_unassigned"]
+
+
+def load_bundled() -> dict:
+    with open(BUNDLED_PRICES) as f:
+        prices: dict = json.load(f)
+    return prices
+
+
+def build_catalog(client=None) -> PriceCatalog:
+    """Build a catalog, from the API when ``client`` can reach it."""
+    bundled = load_bundled()
+    droplets = {slug: float(price) for slug, price in bundled["droplets"].items()}
+    source = "bundled"
+    if client is not None:
+        try:
+            sizes = iter_models(client, "sizes")
+            api_prices = {s.slug: s.price_monthly for s in sizes if s.price_monthly}
+        except (AzureError, OfflineCacheMissError):
+            # offline, or the API is unreachable: bundled prices will do
+            pass
+        else:
+            droplets.update(api_prices)
+            source = "api"
+    return PriceCatalog(
+        droplets,
+        {slug: float(price) for slug, price in bundled["databases"].items()},
+        {name: float(rate) for name, rate in bundled["rates"].items()},
+        source,
+    )
+
+
+_catalogs: Dict[Optional[str], PriceCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(client=None) -> PriceCatalog:
+    """The catalog for ``client``'s account, built once per process."""
+    account = getattr(client, "dom_account", None)
+    with _catalogs_lock:
+        catalog = _catalogs.get(account)
+    if catalog is None:
+        # built outside the lock, so accounts fetched in parallel
+        # do not wait on each other
+        catalog = build_catalog(client)
+        with _catalogs_lock:
+            catalog = _catalogs.setdefault(account, catalog)
+    return catalog
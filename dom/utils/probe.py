@@ -0,0 +1,137 @@
+"""Concurrent TCP/SSH reachability checks.
+
+``sweep`` opens a TCP connection to every target from one asyncio event
+loop and, unless told not to, reads the SSH identification line the
+server sends first (``SSH-2.0-OpenSSH_9.6``). Nothing is authenticated
+and no process is forked per host, so a fleet of thousands of hosts is
+checked in a few seconds: the time is roughly
+``hosts / concurrency * latency``, with ``timeout`` as the worst case
+per host.
+"""
+
+import asyncio
+import time
+from typing import Callable, Iterable, List, NamedTuple, Optional, Tuple
+
+DEFAULT_PORT = 22
+DEFAULT_CONCURRENCY = 256
+DEFAULT_TIMEOUT = 3.0
+# RFC 4253 allows other lines before the identification string.
+MAX_BANNER_LINES = 5
+# File descriptors kept free for everything else when capping concurrency.
+RESERVED_FDS = 64
+
+
+class ProbeResult(NamedTuple):
+    host: str
+    address: str
+    port: int
+    status: str  # ok, no-banner, refused, timeout, unreachable
+    connect_ms: Optional[float]
+    banner_ms: Optional[float]  # from the start of the connection
+    banner: str
+    error: str
+
+    @property
+    def reachable(self) -> bool:
+        return self.status == "ok"
+
+
+def max_concurrency(requested: int) -> int:
+    """``requested``, capped below the open files limit."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return requested
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        return requested
+    return max(1, min(requested, soft - RESERVED_FDS))
+
+
+async def _read_banner(reader: asyncio.StreamReader) -> Optional[str]:
+    for _ in range(MAX_BANNER_LINES):
+        line = await reader.readline()
+        if not line:
+            return None
+        if line.startswith(b"SSH-"):
+            return line.decode("ascii", "replace").strip()
+    return None
+
+
+async def probe(
+    host: str,
+    address: str,
+    port: int = DEFAULT_PORT,
+    timeout: float = DEFAULT_TIMEOUT,
+    banner: bool = True,
+) -> ProbeResult:
+    """Check one host; ``timeout`` covers connecting and reading the banner."""
+    started = time.perf_counter()
+
+    def result(
+        status: str, connect_ms=None, banner_ms=None, text: str = "", error: str = ""
+    ) -> ProbeResult:
+        return ProbeResult(
+            host, address, port, status, connect_ms, banner_ms, text, error
+        )
+
+    def elapsed_ms() -> float:
+        return round((time.perf_counter() - started) * 1000, 2)
+
+    try:
+        connecting = asyncio.open_connection(address, port)
+        reader, writer = await asyncio.wait_for(connecting, timeout)
+    except asyncio.TimeoutError:
+        return result("timeout", error=f"no answer in {timeout:g}s")
+    except ConnectionRefusedError:
+        return result("refused", error="connection refused")
+    except OSError as e:
+        return result("unreachable", error=e.strerror or str(e))
+    connect_ms = elapsed_ms()
+
+    try:
+        if not banner:
+            return result("ok", connect_ms)
+        try:
+            remaining = max(0.0, timeout - (time.perf_counter() - started))
+            text = await asyncio.wait_for(_read_banner(reader), remaining)
+        except asyncio.TimeoutError:
+            error = f"no SSH banner in {timeout:g}s"
+            return result("no-banner", connect_ms, error=error)
+        except OSError as e:
+            return result("no-banner", connect_ms, error=e.strerror or str(e))
+        if text is None:
+            return result("no-banner", connect_ms, error="not an SSH server")
+        return result("ok", connect_ms, elapsed_ms(), text)
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+
+async def sweep(
+    targets: Iterable[Tuple[str, str, int]],
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: float = DEFAULT_TIMEOUT,
+    banner: bool = True,
+    on_result: Optional[Callable[[ProbeResult], None]] = None,
+) -> List[ProbeResult]:
+    """Probe ``(host, address, port)`` targets, at most ``concurrency`` at once.
+
+    Results come back in target order; ``on_result`` sees each one as it
+    completes.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency(concurrency))
+
+    async def run(host: str, address: str, port: int) -> ProbeResult:
+        async with semaphore:
+            outcome = await probe(host, address, port, timeout, banner)
+        if on_result:
+            on_result(outcome)
+        return outcome
+
+    return await asyncio.gather(*(run(*target) for target in targets))
@@ -0,0 +1,241 @@
+"""Opt-in timing of API calls and command phases.
+
+Enabled with ``dom --profile`` (or ``DOM_PROFILE=1``). Every API request,
+through pydo or the async client, is recorded with its endpoint, status,
+latency, response size, retries and page number; commands mark their
+phases (fetch, transform, render, write) with ``phase()``, and each pydo
+call gets its own span, so the time pydo spends around the HTTP request
+(serializing, deserializing) shows up next to it. When the command ends
+dom prints a summary to stderr and writes a Chrome trace JSON file that
+opens in Perfetto (https://ui.perfetto.dev) or ``chrome://tracing``.
+
+When profiling is off the hooks only check one module global, and
+``phase()`` returns a shared no-op context manager.
+"""
+
+import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_TRACE = "dom-profile.json"
+
+# Path segments that identify one resource; calls are grouped with them
+# replaced by ``{id}`` (e.g. ``/v2/droplets/{id}/actions``).
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F-]{27})$")
+
+
+class Call(NamedTuple):
+    """One API request, retries included."""
+
+    method: str
+    endpoint: str  # path with resource ids replaced by {id}
+    path: str
+    page: Optional[int]
+    status: Optional[int]  # None when no response came back
+    start: float  # time.perf_counter()
+    duration: float
+    size: int  # response bytes
+    retries: int
+    lane: int
+
+
+class Span(NamedTuple):
+    """A named stretch of work: a command phase or a pydo call."""
+
+    name: str
+    category: str
+    start: float
+    duration: float
+    lane: int
+
+
+def endpoint_of(path: str) -> str:
+    parts = path.split("/")
+    return "/".join("{id}" if _ID_SEGMENT.match(part) else part for part in parts)
+
+
+def split_url(url: str) -> Tuple[str, Optional[int]]:
+    """Path and ``page`` query parameter of a request URL."""
+    parts = urlsplit(url)
+    page = parse_qs(parts.query).get("page")
+    try:
+        return parts.path, int(page[0]) if page else None
+    except ValueError:
+        return parts.path, None
+
+
+class Profiler:
+    """Collects calls and spans from every thread and asyncio task."""
+
+    def __init__(self, trace_path: Path):
+        self.trace_path = trace_path
+        self.started = time.perf_counter()
+        self.calls: List[Call] = []
+        self.spans: List[Span] = []
+        self._lanes: Dict[object, Tuple[int, str]] = {}
+        self._lock = threading.Lock()
+
+    def _lane(self) -> int:
+        """Trace row of the caller: its asyncio task, or else its thread.
+
+        Tasks share their thread, and their overlapping calls would not
+        nest on a single row.
+        """
+        task = None
+        asyncio = sys.modules.get("asyncio")
+        if asyncio is not None:
+            try:
+                task = asyncio.current_task()
+            except RuntimeError:
+                pass
+        key = ("task", id(task)) if task is not None else threading.get_ident()
+        with self._lock:
+            if key not in self._lanes:
+                if task is not None:
+                    name = task.get_name()
+                else:
+                    name = threading.current_thread().name
+                self._lanes[key] = (len(self._lanes) + 1, name)
+            return self._lanes[key][0]
+
+    def call(
+        self, method: str, path: str, page: Optional[int], status: Optional[int],
+        start: float, size: int, retries: int,
+    ) -> None:
+        duration = time.perf_counter() - start
+        self.calls.append(Call(
+            method, endpoint_of(path), path, page, status, start, duration, size,
+            retries, self._lane(),
+        ))
+
+    @contextmanager
+    def span(self, name: str, category: str = "phase") -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.spans.append(Span(name, category, start, duration, self._lane()))
+
+    def _us(self, seconds: float) -> float:
+        return round(seconds * 1e6, 1)
+
+    def trace(self) -> dict:
+        """Chrome trace event format (complete ``X`` events, microseconds)."""
+        pid = os.getpid()
+        events: List[dict] = [
+            {"ph": "M", "name": "process_name", "pid": pid, "args": {"name": "dom"}}
+        ]
+        for lane, name in sorted(self._lanes.values()):
+            events.append({
+                "ph": "M", "name": "thread_name", "pid": pid, "tid": lane,
+                "args": {"name": name},
+            })
+        for s in self.spans:
+            events.append({
+                "ph": "X", "name": s.name, "cat": s.category, "pid": pid, "tid": s.lane,
+                "ts": self._us(s.start - self.started), "dur": self._us(s.duration),
+            })
+        for c in self.calls:
+            events.append({
+                "ph": "X", "name": f"{c.method} {c.endpoint}", "cat": "api",
+                "pid": pid, "tid": c.lane,
+                "ts": self._us(c.start - self.started), "dur": self._us(c.duration),
+                "args": {
+                    "path": c.path, "page": c.page, "status": c.status,
+                    "bytes": c.size, "retries": c.retries,
+                },
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_trace(self) -> Path:
+        self.trace_path.parent.mkdir(parents=True, exist_ok=True)
+        self.trace_path.write_text(json.dumps(self.trace()))
+        return self.trace_path
+
+    def print_summary(self, console) -> None:
+        from rich.table import Table
+
+        wall = time.perf_counter() - self.started
+        table = Table(title="API calls", title_justify="left")
+        table.add_column("Endpoint", no_wrap=True)
+        columns = ("Calls", "Errors", "Retries", "KiB", "Total", "Avg", "p95", "Max")
+        for column in columns:
+            table.add_column(column, justify="right")
+        groups: Dict[str, List[Call]] = {}
+        for c in self.calls:
+            groups.setdefault(f"{c.method} {c.endpoint}", []).append(c)
+        by_total = sorted(groups.items(), key=lambda g: -sum(c.duration for c in g[1]))
+        for name, calls in by_total:
+            times = sorted(c.duration for c in calls)
+            table.add_row(
+                name,
+                str(len(calls)),
+                str(sum(1 for c in calls if c.status is None or c.status >= 400)),
+                str(sum(c.retries for c in calls)),
+                f"{sum(c.size for c in calls) / 1024:.1f}",
+                _ms(sum(times)),
+                _ms(sum(times) / len(times)),
+                _ms(times[max(0, math.ceil(len(times) * 0.95) - 1)]),
+                _ms(times[-1]),
+            )
+        console.print(table)
+
+        phases = Table(title="Phases", title_justify="left")
+        phases.add_column("Phase", no_wrap=True)
+        for column in ("Count", "Total", "Max"):
+            phases.add_column(column, justify="right")
+        totals: Dict[str, List[float]] = {}
+        for s in self.spans:
+            totals.setdefault(s.name, []).append(s.duration)
+        for name, times in sorted(totals.items(), key=lambda t: -sum(t[1])):
+            phases.add_row(name, str(len(times)), _ms(sum(times)), _ms(max(times)))
+        if totals:
+            console.print(phases)
+
+        console.print(
+            f"[dim]Wall time {_ms(wall)}, {len(self.calls)} API calls; "
+            "phases run in parallel threads can add up to more than the wall time."
+            "[/dim]"
+        )
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.1f} ms"
+
+
+_profiler: Optional[Profiler] = None
+_NULL = nullcontext()
+
+
+def enable(trace_path=DEFAULT_TRACE) -> Profiler:
+    global _profiler
+    _profiler = Profiler(Path(trace_path))
+    return _profiler
+
+
+def disable() -> Optional[Profiler]:
+    """Stop recording and return what was recorded."""
+    global _profiler
+    profiler, _profiler = _profiler, None
+    return profiler
+
+
+def active() -> Optional[Profiler]:
+    """The running profiler, or None when profiling is off."""
+    return _profiler
+
+
+def phase(name: str, category: str = "phase"):
+    """Context manager timing a named phase, e.g. ``phase("fetch droplets")``."""
+    if _profiler is None:
+        return _NULL
+    return _profiler.span(name, category)
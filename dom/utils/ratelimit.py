@@ -0,0 +1,234 @@
+"""Rate-limit-aware request scheduling.
+
+DigitalOcean allows 5,000 requests per hour and 250 per minute per token.
+Every API request dom makes, through pydo or the async client, goes
+through the ``RateLimiter`` for its account:
+
+* a token bucket sized so that no rolling minute exceeds the per-minute
+  limit paces requests before they are sent;
+* the ``ratelimit-remaining``/``ratelimit-reset`` response headers track the
+  hourly budget, and requests are spread out once it runs low;
+* 429 and 5xx responses (and connection errors) are retried with jittered
+  exponential backoff, honouring ``Retry-After`` when present. Requests
+  that may not be repeated safely (POST, DELETE, PATCH) are only retried
+  on 429, which the API answers without processing them.
+
+Limits can be tuned with ``DOM_RATE_LIMIT_PER_MINUTE`` and
+``DOM_RATE_LIMIT_PER_HOUR``.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Dict, Mapping, Optional
+
+from azure.core.exceptions import ServiceRequestError, ServiceResponseError
+from azure.core.pipeline.policies import HTTPPolicy
+
+from . import archive, profile
+
+PER_MINUTE = 250
+PER_HOUR = 5000
+# Share of the per-minute limit allowed as an instant burst; the rest is
+# refilled steadily so any 60s window stays within the limit.
+BURST_SHARE = 0.2
+# Below this many requests left in the hour, spread them until the reset.
+LOW_WATERMARK_SHARE = 0.05
+
+MAX_RETRIES = 5
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30.0
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Methods resent after a 5xx or a connection error: repeating them is harmless
+# even if the server applied the first attempt.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT"})
+
+
+class RateLimiter:
+    """Token bucket plus hourly budget tracking for one API token."""
+
+    def __init__(
+        self, per_minute: Optional[int] = None, per_hour: Optional[int] = None
+    ):
+        self.per_minute = per_minute or int(
+            os.getenv("DOM_RATE_LIMIT_PER_MINUTE", PER_MINUTE)
+        )
+        self.per_hour = per_hour or int(os.getenv("DOM_RATE_LIMIT_PER_HOUR", PER_HOUR))
+        self.capacity = max(1.0, self.per_minute * BURST_SHARE)
+        self.rate = (self.per_minute - self.capacity) / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        # hourly budget as last reported by the API
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None  # epoch seconds
+        self.first_remaining: Optional[int] = None
+
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0  # 429 responses received
+
+    def reserve(self) -> float:
+        """Take a slot and return how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            refill = (now - self._updated) * self.rate
+            self._tokens = min(self.capacity, self._tokens + refill)
+            self._updated = now
+            self._tokens -= 1
+            self.requests += 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._hourly_delay())
+
+    def _hourly_delay(self) -> float:
+        if self.remaining is None or self.reset_at is None:
+            return 0.0
+        until_reset = self.reset_at - time.time()
+        if until_reset <= 0:
+            return 0.0
+        if self.remaining <= 0:
+            return until_reset
+        if self.remaining < self.per_hour * LOW_WATERMARK_SHARE:
+            return until_reset / self.remaining
+        return 0.0
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Wait, without blocking the event loop, until a request may be sent."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def observe(self, status: int, headers: Mapping[str, str]) -> None:
+        """Update the hourly budget from a response."""
+        remaining = headers.get("ratelimit-remaining")
+        reset = headers.get("ratelimit-reset")
+        with self._lock:
+            if status == 429:
+                self.throttled += 1
+            if remaining is not None:
+                try:
+                    self.remaining = int(remaining)
+                except ValueError:
+                    pass
+                else:
+                    if self.first_remaining is None:
+                        self.first_remaining = self.remaining + 1
+            if reset is not None:
+                try:
+                    self.reset_at = float(reset)
+                except ValueError:
+                    pass
+
+    def backoff(
+        self, attempt: int, headers: Optional[Mapping[str, str]] = None
+    ) -> float:
+        """Delay before retry number ``attempt`` (starting at 0)."""
+        with self._lock:
+            self.retries += 1
+        if headers:
+            retry_after = headers.get("retry-after")
+            if retry_after is not None:
+                try:
+                    return float(retry_after) + random.uniform(0, BACKOFF_BASE)
+                except ValueError:
+                    pass
+        # full jitter: spreads retries of parallel requests apart
+        return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+    @property
+    def quota_used(self) -> int:
+        """Hourly quota consumed, per the API when it reported it."""
+        if self.first_remaining is not None and self.remaining is not None:
+            return max(0, self.first_remaining - self.remaining)
+        return self.requests
+
+    def summary(self) -> str:
+        text = f"API requests: {self.requests} (quota used: {self.quota_used}"
+        if self.remaining is not None:
+            text += f", {self.remaining}/{self.per_hour} left this hour"
+        text += ")"
+        if self.retries:
+            text += f", {self.retries} retries"
+        if self.throttled:
+            text += f", {self.throttled} rate-limited"
+        return text
+
+
+class RateLimitPolicy(HTTPPolicy):
+    """azure-core pipeline policy pacing and retrying pydo requests.
+
+    Installed as the client's ``retry_policy``, so it replaces azure-core's
+    own retry logic.
+    """
+
+    def __init__(self, limiter: RateLimiter, max_retries: int = MAX_RETRIES):
+        super().__init__()
+        self.limiter = limiter
+        self.max_retries = max_retries
+
+    def send(self, request):
+        method = request.http_request.method
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        tracer = profile.active()
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            try:
+                response = self.next.send(request)
+            except (ServiceRequestError, ServiceResponseError):
+                if not idempotent or attempt >= self.max_retries:
+                    if tracer:
+                        path, page = profile.split_url(request.http_request.url)
+                        tracer.call(method, path, page, None, started, 0, attempt)
+                    raise
+                time.sleep(self.limiter.backoff(attempt))
+                attempt += 1
+                continue
+
+            http_response = response.http_response
+            headers = http_response.headers
+            status = http_response.status_code
+            self.limiter.observe(status, headers)
+            retry = status == 429 or (idempotent and status in RETRY_STATUSES)
+            if not retry or attempt >= self.max_retries:
+                if tracer:
+                    path, page = profile.split_url(request.http_request.url)
+                    size = headers.get("content-length")
+                    length = int(size) if size else len(http_response.body() or b"")
+                    tracer.call(method, path, page, status, started, length, attempt)
+                return response
+            time.sleep(self.limiter.backoff(attempt, headers))
+            attempt += 1
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(account: str) -> RateLimiter:
+    """The shared limiter for an account (one per API token).
+
+    Replayed responses come from memory, so replay is not paced.
+    """
+    with _limiters_lock:
+        if account not in _limiters:
+            unlimited = 10 ** 9 if archive.is_replaying() else None
+            _limiters[account] = RateLimiter(unlimited, unlimited)
+        return _limiters[account]
+
+
+def all_limiters() -> dict:
+    """Limiters created in this process, by account."""
+    with _limiters_lock:
+        return dict(_limiters)
@@ -0,0 +1,183 @@
+"""Registry of the DigitalOcean list endpoints used by dom.
+
+``iter_resources(client, "droplets")`` is the single way commands and the
+TUI list resources: it knows which pydo method to call, which response key
+holds the items and whether the endpoint is paginated. Listings are read
+through the local inventory cache (see ``dom.utils.cache``).
+``iter_models``/``list_models`` return compact records instead of the raw
+API dicts (see ``dom.utils.models``).
+"""
+
+from typing import Any, Iterator, NamedTuple, Tuple
+
+from . import cache as inventory_cache
+from . import profile
+from .models import MODELS
+from .pagination import DEFAULT_CONCURRENCY, paginate
+
+
+class Resource(NamedTuple):
+    """How to list one resource type through pydo."""
+
+    operations: Tuple[str, ...]  # client attribute, first one present wins
+    method: str
+    key: str
+    path: str  # REST path, "{}" stands for the positional argument
+    paginated: bool = True
+
+
+RESOURCES = {
+    "droplets": Resource(("droplets",), "list", "droplets", "/v2/droplets"),
+    "volumes": Resource(("volumes",), "list", "volumes", "/v2/volumes"),
+    "domains": Resource(("domains",), "list", "domains", "/v2/domains"),
+    "domain_records": Resource(
+        ("domains",), "list_records", "domain_records", "/v2/domains/{}/records"
+    ),
+    "firewalls": Resource(("firewalls",), "list", "firewalls", "/v2/firewalls"),
+    "load_balancers": Resource(
+        ("load_balancers",), "list", "load_balancers", "/v2/load_balancers"
+    ),
+    "databases": Resource(
+        ("databases",), "list_clusters", "databases", "/v2/databases", paginated=False
+    ),
+    "kubernetes": Resource(
+        ("kubernetes",),
+        "list_clusters",
+        "kubernetes_clusters",
+        "/v2/kubernetes/clusters",
+    ),
+    "apps": Resource(("apps",), "list", "apps", "/v2/apps"),
+    "snapshots": Resource(("snapshots",), "list", "snapshots", "/v2/snapshots"),
+    # Floating IPs were renamed reserved IPs; newer pydo only has the latter.
+    "floating_ips": Resource(
+        ("floating_ips", "reserved_ips"), "list", "floating_ips", "/v2/floating_ips"
+    ),
+    "sizes": Resource(("sizes",), "list", "sizes", "/v2/sizes"),
+}
+
+
+def _endpoint(client, kind: str):
+    """Resolve ``kind`` to its pydo method, response key and registry entry."""
+    resource = RESOURCES[kind]
+    for name in resource.operations:
+        ops = getattr(client, name, None)
+        if ops is not None:
+            # reserved_ips responses are keyed by the new name
+            key = name if kind == "floating_ips" else resource.key
+            return getattr(ops, resource.method), key, resource
+    raise AttributeError(f"pydo client has none of {resource.operations}")
+
+
+def iter_resources(
+    client,
+    kind: str,
+    *args: Any,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    refresh: bool = False,
+    **params: Any,
+) -> Iterator[dict]:
+    """Lazily yield every ``kind`` resource, across all pages.
+
+    Positional ``args`` are forwarded to the pydo method (e.g. the domain
+    name for ``domain_records``), ``params`` become query parameters.
+    A fresh cached listing is served without touching the API unless
+    ``refresh`` is set; a fetched listing is streamed into the cache and
+    published once fully consumed.
+    """
+    account = getattr(client, "dom_account", None)
+    key_params = inventory_cache.params_key(*args, **params)
+    cached = inventory_cache.lookup(account, kind, key_params, refresh)
+    if cached is not None:
+        yield from cached
+        return
+
+    writer = inventory_cache.writer(account, kind, key_params)
+    if writer is None:
+        yield from _fetch(client, kind, args, params, concurrency)
+        return
+    try:
+        for item in _fetch(client, kind, args, params, concurrency):
+            writer.add(item)
+            yield item
+    except BaseException:
+        writer.discard()
+        raise
+    writer.commit()
+
+
+def _fetch(
+    client, kind: str, args: tuple, params: dict, concurrency: int
+) -> Iterator[dict]:
+    method, key, resource = _endpoint(client, kind)
+
+    def list_fn(**kwargs):
+        with profile.phase(f"pydo {kind}", "pydo"):
+            return method(*args, **kwargs)
+
+    if resource.paginated:
+        yield from paginate(list_fn, key, concurrency=concurrency, **params)
+    else:
+        yield from list_fn(**params).get(key, [])
+
+
+def list_resources(client, kind: str, *args: Any, **params: Any) -> list:
+    """Fetch every ``kind`` resource into a list."""
+    return list(iter_resources(client, kind, *args, **params))
+
+
+def iter_models(client, kind: str, *args: Any, **params: Any) -> Iterator[Any]:
+    """Like ``iter_resources``, yielding compact records of ``dom.utils.models``."""
+    from_api = MODELS[kind].from_api
+    for item in iter_resources(client, kind, *args, **params):
+        yield from_api(item)
+
+
+def list_models(client, kind: str, *args: Any, **params: Any) -> list:
+    """Fetch every ``kind`` resource as compact records."""
+    with profile.phase(f"fetch {kind}"):
+        return list(iter_models(client, kind, *args, **params))
+
+
+def count_resources(client, kind: str) -> int:
+    """Total number of ``kind`` resources, from a single one-item page."""
+    cache = inventory_cache.get_cache()
+    account = getattr(client, "dom_account", None)
+    if cache is not None and account is not None and not inventory_cache.is_refresh():
+        key_params = inventory_cache.params_key()
+        if cache.is_fresh(account, kind, key_params, inventory_cache.ttl_for(kind)):
+            return cache.count(account, kind, key_params)
+        offline = inventory_cache.is_offline()
+        if offline and cache.fetched_at(account, kind, key_params) is not None:
+            return cache.count(account, kind, key_params)
+    if inventory_cache.is_offline():
+        raise inventory_cache.OfflineCacheMissError(kind)
+
+    method, key, resource = _endpoint(client, kind)
+    if not resource.paginated:
+        return len(method().get(key, []))
+    response = method(per_page=1, page=1)
+    total = (response.get("meta") or {}).get("total")
+    if total is None:
+        return sum(1 for _ in iter_resources(client, kind))
+    return int(total)
+
+
+def get_account(client) -> dict:
+    """The account behind ``client``, cached like a one-item listing."""
+    account = getattr(client, "dom_account", None)
+    key_params = inventory_cache.params_key()
+    cached = inventory_cache.lookup(account, "account", key_params)
+    if cached is not None:
+        for item in cached:
+            return item
+    info: dict = client.account.get()["account"]
+    inventory_cache.store(account, "account", key_params, [info])
+    return info
+
+
+def invalidate(client, kind: str) -> None:
+    """Forget cached ``kind`` listings after changing them through the API."""
+    cache = inventory_cache.get_cache()
+    account = getattr(client, "dom_account", None)
+    if cache is not None and account is not None:
+        cache.invalidate(account, kind)
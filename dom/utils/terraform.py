@@ -0,0 +1,245 @@
+"""Bulk import of existing resources into Terraform state.
+
+``terraform import`` handles one resource per process, and every process
+initializes the providers and locks the state, so importing thousands of
+resources one by one takes hours. Two faster paths:
+
+* Terraform >= 1.5 reads ``import {}`` blocks (``imports.tf``, written by
+  ``dom export terraform --import-blocks``) and imports everything in a
+  single plan/apply;
+* older versions import in parallel shards, each in its own copy of the
+  working directory with its own state file; the shard states are then
+  merged into the real state with ``terraform state push``.
+
+Sharding works on a local state only: the shards import into unlocked
+local state files, which a remote backend (S3/Spaces, ...) would bypass.
+With a remote backend, older versions import serially, with locking, in
+the working directory itself (``serial_import``).
+"""
+
+import json
+import re
+import shutil
+import subprocess
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+IMPORT_BLOCKS_VERSION = (1, 5, 0)
+DEFAULT_SHARDS = 8
+
+
+class ImportEntry(NamedTuple):
+    address: str  # e.g. digitalocean_droplet.web_1
+    id: str
+
+
+def parse_import_script(path: Path) -> List[ImportEntry]:
+    """Entries of an ``import.sh`` written by ``dom export terraform``."""
+    entries = []
+    with open(path) as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 4 and parts[:2] == ["terraform", "import"]:
+                entries.append(ImportEntry(parts[2], parts[3]))
+    return entries
+
+
+_IMPORT_BLOCK = re.compile(
+    r'^import\s*\{\s*to\s*=\s*(\S+)\s+id\s*=\s*("(?:[^"\\]|\\.)*")\s*\}', re.MULTILINE
+)
+
+
+def parse_import_blocks(path: Path) -> List[ImportEntry]:
+    """Entries of an ``imports.tf`` written by ``dom export terraform``."""
+    return [
+        ImportEntry(address, json.loads(import_id))
+        for address, import_id in _IMPORT_BLOCK.findall(path.read_text())
+    ]
+
+
+def import_blocks(entries: Iterable[Tuple[str, Any]]) -> Iterator[str]:
+    """``imports.tf`` content for Terraform >= 1.5."""
+    yield "# Generated by dom export terraform - import blocks (Terraform >= 1.5)\n"
+    for address, import_id in entries:
+        import_id = json.dumps(str(import_id))
+        yield f"\nimport {{\n  to = {address}\n  id = {import_id}\n}}\n"
+
+
+def terraform_version(cwd: Optional[Path] = None) -> Tuple[int, ...]:
+    """Installed Terraform version, e.g. ``(1, 7, 2)``."""
+    result = subprocess.run(
+        ["terraform", "version", "-json"],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    version = json.loads(result.stdout)["terraform_version"]
+    return tuple(int(part) for part in version.split("-")[0].split(".")[:3])
+
+
+def supports_import_blocks(version: Tuple[int, ...]) -> bool:
+    return version >= IMPORT_BLOCKS_VERSION
+
+
+# ``backend "s3" {`` or ``cloud {`` (HCP Terraform) in a terraform block
+_BACKEND_BLOCK = re.compile(r'^\s*(?:backend\s+"([^"]+)"|(cloud)\s*\{)', re.MULTILINE)
+
+
+def backend_type(workdir: Path) -> str:
+    """State backend of a working directory: ``local``, ``s3``, ``cloud``...
+
+    Read from the initialized backend (``.terraform/terraform.tfstate``)
+    when there is one, else from a backend block in the configuration.
+    """
+    initialized = workdir / ".terraform" / "terraform.tfstate"
+    if initialized.exists():
+        try:
+            backend = json.loads(initialized.read_text()).get("backend") or {}
+        except ValueError:
+            backend = {}
+        if backend.get("type"):
+            return str(backend["type"])
+    for path in sorted(workdir.glob("*.tf")):
+        match = _BACKEND_BLOCK.search(path.read_text())
+        if match:
+            return match.group(1) or match.group(2)
+    return "local"
+
+
+def shard(entries: Sequence[ImportEntry], count: int) -> List[List[ImportEntry]]:
+    """Split entries round-robin into at most ``count`` non-empty shards."""
+    count = max(1, min(count, len(entries)))
+    return [list(entries[i::count]) for i in range(count)]
+
+
+def _working_copy(source: Path, target: Path) -> None:
+    """Copy the configuration, sharing the initialized providers."""
+    target.mkdir(parents=True)
+    for path in source.iterdir():
+        if path.suffix in (".tf", ".tfvars") or path.name == ".terraform.lock.hcl":
+            shutil.copy2(path, target / path.name)
+    if (source / ".terraform").is_dir():
+        providers = (source / ".terraform").resolve()
+        (target / ".terraform").symlink_to(providers, target_is_directory=True)
+
+
+class ShardResult(NamedTuple):
+    state: Optional[dict]
+    imported: List[ImportEntry]
+    failed: List[Tuple[ImportEntry, str]]
+
+
+def _import_each(
+    workdir: Path, entries: List[ImportEntry], options: Sequence[str] = ()
+) -> ShardResult:
+    imported, failed = [], []
+    for entry in entries:
+        result = subprocess.run(
+            ["terraform", "import", "-input=false", *options, entry.address, entry.id],
+            cwd=workdir,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode == 0:
+            imported.append(entry)
+        else:
+            lines = (result.stderr or result.stdout).strip().splitlines()
+            error = lines[-1] if lines else f"exit status {result.returncode}"
+            failed.append((entry, error))
+    return ShardResult(None, imported, failed)
+
+
+def _import_shard(workdir: Path, entries: List[ImportEntry]) -> ShardResult:
+    # the shard state is private to this working copy, so no lock is needed
+    state_file = workdir / "shard.tfstate"
+    result = _import_each(workdir, entries, ["-lock=false", f"-state={state_file}"])
+    state = json.loads(state_file.read_text()) if state_file.exists() else None
+    return result._replace(state=state)
+
+
+def serial_import(
+    workdir: Path, entries: Sequence[ImportEntry]
+) -> Tuple[List[ImportEntry], List[Tuple[ImportEntry, str]]]:
+    """Import ``entries`` one by one into the configured state, with locking.
+
+    The slow path, for remote backends. Returns ``(imported, failed)``.
+    """
+    result = _import_each(workdir, list(entries))
+    return result.imported, result.failed
+
+
+def _state_key(resource: dict) -> tuple:
+    module = resource.get("module", "")
+    return module, resource["mode"], resource["type"], resource["name"]
+
+
+def merge_states(
+    base: Optional[dict], shards: Iterable[Optional[dict]]
+) -> Optional[dict]:
+    """Add the resources of the shard states to ``base`` (which keeps its lineage)."""
+    merged = dict(base) if base else None
+    resources: list = list(merged["resources"]) if merged else []
+    seen = {_state_key(resource) for resource in resources}
+    for state in shards:
+        if not state:
+            continue
+        if merged is None:
+            lineage = state.get("lineage") or str(uuid.uuid4())
+            merged = {**state, "lineage": lineage, "serial": 0}
+        for resource in state.get("resources", []):
+            key = _state_key(resource)
+            if key not in seen:
+                seen.add(key)
+                resources.append(resource)
+    if merged is None:
+        return None
+    merged["resources"] = resources
+    merged["serial"] = merged.get("serial", 0) + 1
+    return merged
+
+
+def sharded_import(
+    workdir: Path, entries: Sequence[ImportEntry], shards: int = DEFAULT_SHARDS
+) -> Tuple[List[ImportEntry], List[Tuple[ImportEntry, str]]]:
+    """Import ``entries`` with ``terraform import`` across parallel working copies.
+
+    Returns ``(imported, failed)``. Resources already in the state keep
+    their existing entry. Raises ``ValueError`` if the working directory
+    uses a remote backend; use ``serial_import`` there.
+    """
+    backend = backend_type(workdir)
+    if backend != "local":
+        raise ValueError(
+            f"sharded import needs a local state, not the {backend} backend"
+        )
+    batches = shard(entries, shards)
+    with tempfile.TemporaryDirectory(prefix="dom-import-", dir=workdir) as tmp:
+        copies = []
+        for i in range(len(batches)):
+            copy = Path(tmp) / f"shard-{i}"
+            _working_copy(workdir, copy)
+            copies.append(copy)
+        with ThreadPoolExecutor(max_workers=len(batches) or 1) as pool:
+            results = list(pool.map(_import_shard, copies, batches))
+
+        imported = [entry for r in results for entry in r.imported]
+        failed = [failure for r in results for failure in r.failed]
+        if imported:
+            pulled = subprocess.run(
+                ["terraform", "state", "pull"],
+                cwd=workdir,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+            base = json.loads(pulled) if pulled else None
+            merged = merge_states(base, (r.state for r in results))
+            merged_file = Path(tmp) / "merged.tfstate"
+            merged_file.write_text(json.dumps(merged, indent=2))
+            push = ["terraform", "state", "push", str(merged_file)]
+            subprocess.run(push, cwd=workdir, check=True)
+    return imported, failed
@@ -0,0 +1,164 @@
+"""Shared, tuned HTTP transport for every API client in the process.
+
+All pydo clients share one ``requests`` session (through an azure-core
+``RequestsTransport``), so connections and TLS sessions are reused across
+commands, threads and TUI screens. The async client gets matching httpx
+settings. Tunables:
+
+* ``DOM_POOL_SIZE`` - connections kept per host (default 32)
+* ``DOM_CONNECT_TIMEOUT`` - seconds to establish a connection (default 10)
+* ``DOM_READ_TIMEOUT`` - seconds to wait on reads/listings (default 60)
+* ``DOM_WRITE_TIMEOUT`` - seconds to wait on create/update/delete (default 120)
+* ``DOM_HTTP2=1`` - multiplex async requests over HTTP/2 (needs ``h2``)
+
+Under ``dom --record``/``--replay`` the session's adapter goes through the
+active ``dom.utils.archive.Archive``.
+"""
+
+import importlib.util
+import io
+import os
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+from azure.core.pipeline.policies import SansIOHTTPPolicy
+from azure.core.pipeline.transport import RequestsTransport
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from . import archive
+
+DEFAULT_POOL_SIZE = 32
+DEFAULT_TIMEOUTS = {"connect": 10.0, "read": 60.0, "write": 120.0}
+
+# Compressed JSON listings are a fraction of their plain size.
+DEFAULT_HEADERS = {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def pool_size() -> int:
+    return int(os.getenv("DOM_POOL_SIZE", DEFAULT_POOL_SIZE))
+
+
+def timeout(kind: str) -> float:
+    """Timeout in seconds for ``connect``, ``read`` or ``write`` calls."""
+    override = os.getenv(f"DOM_{kind.upper()}_TIMEOUT")
+    return float(override) if override else DEFAULT_TIMEOUTS[kind]
+
+
+def http2_enabled() -> bool:
+    if os.getenv("DOM_HTTP2", "").lower() not in ("1", "true", "yes", "on"):
+        return False
+    # h2 is optional (pip install httpx[http2]); look for it without importing
+    return importlib.util.find_spec("h2") is not None
+
+
+class TimeoutPolicy(SansIOHTTPPolicy):
+    """Apply per-call-class timeouts: reads are short, writes get longer."""
+
+    def on_request(self, request):
+        options = request.context.options
+        call_class = "read" if request.http_request.method in READ_METHODS else "write"
+        options.setdefault("connection_timeout", timeout("connect"))
+        options.setdefault("read_timeout", timeout(call_class))
+
+
+class ArchiveAdapter(BaseAdapter):
+    """Record responses into the archive, or serve them from it offline."""
+
+    def __init__(self, store: "archive.Archive", inner: Optional[HTTPAdapter] = None):
+        super().__init__()
+        self.store = store
+        self.inner = inner
+
+    def send(self, request, **kwargs):
+        authorization = request.headers.get("Authorization")
+        if self.store.replaying:
+            recorded = self.store.replay(
+                request.method, request.url, request.body, authorization
+            )
+            return self._replayed(request, recorded)
+        response = self.inner.send(request, **kwargs)
+        self.store.record(
+            request.method, request.url, request.body,
+            response.status_code, response.headers, response.content, authorization,
+        )
+        return response
+
+    @staticmethod
+    def _replayed(request, recorded) -> requests.Response:
+        response = requests.Response()
+        response.status_code = recorded.status
+        response.headers = CaseInsensitiveDict(recorded.headers)
+        response._content = recorded.body
+        response.raw = io.BytesIO(recorded.body)
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        if self.inner is not None:
+            self.inner.close()
+
+
+_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+_transport: Optional[RequestsTransport] = None
+
+
+def get_session() -> requests.Session:
+    """The process-wide pooled ``requests`` session."""
+    global _session
+    with _lock:
+        if _session is None:
+            session = requests.Session()
+            size = pool_size()
+            # retries are handled by the rate limiter, not urllib3
+            pooled = HTTPAdapter(
+                pool_connections=size, pool_maxsize=size, max_retries=0
+            )
+            adapter: BaseAdapter = pooled
+            store = archive.active()
+            if store is not None:
+                adapter = ArchiveAdapter(store, None if store.replaying else pooled)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update(DEFAULT_HEADERS)
+            _session = session
+        return _session
+
+
+def get_transport() -> RequestsTransport:
+    """The azure-core transport every pydo client shares."""
+    global _transport
+    session = get_session()
+    with _lock:
+        if _transport is None:
+            _transport = RequestsTransport(session=session, session_owner=False)
+        return _transport
+
+
+def async_client_options(max_connections: Optional[int] = None) -> Dict[str, Any]:
+    """Keyword arguments for an ``httpx.AsyncClient`` matching the sync transport."""
+    import httpx
+
+    size = max_connections or pool_size()
+    return {
+        "headers": dict(DEFAULT_HEADERS),
+        "limits": httpx.Limits(max_connections=size, max_keepalive_connections=size),
+        "timeout": httpx.Timeout(timeout("read"), connect=timeout("connect")),
+        "http2": http2_enabled(),
+    }
+
+
+def reset() -> None:
+    """Close the shared session (tests, or after changing tunables)."""
+    global _session, _transport
+    with _lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _transport = None
@@ -0,0 +1,109 @@
+"""Concurrent DNS record crawl with conditional requests.
+
+Listing the records of every domain is an N+1 pattern. ``crawl_records``
+runs the per-domain listings concurrently (bounded by a semaphore shared
+by every request), paginates large zones and revalidates each stored page
+with ``If-None-Match`` when the API sent an ETag. Without an ETag, a hash
+of the page body tells whether it changed. Unchanged pages are served
+from the local store in the inventory cache database.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+from typing import AsyncIterator, Iterable, NamedTuple, Optional, Tuple
+
+from . import cache as inventory_cache
+from .aio import AsyncClient
+from .cache import ZonePage
+from .pagination import MAX_PER_PAGE
+from .resources import RESOURCES
+
+DEFAULT_ZONE_CONCURRENCY = 10
+
+
+class ZoneRecords(NamedTuple):
+    """Records of one domain, and whether they changed since last crawl."""
+
+    domain: str
+    records: list
+    changed: bool
+
+
+async def crawl_records(
+    client: AsyncClient,
+    domains: Iterable[str],
+    *,
+    concurrency: int = DEFAULT_ZONE_CONCURRENCY,
+    refresh: bool = False,
+) -> AsyncIterator[ZoneRecords]:
+    """Yield the records of every domain, in the order given.
+
+    At most ``concurrency`` requests are in flight across all zones.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    tasks = [
+        asyncio.ensure_future(_crawl_zone(client, domain, semaphore, refresh))
+        for domain in domains
+    ]
+    try:
+        for task in tasks:
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _crawl_zone(
+    client: AsyncClient, domain: str, semaphore: asyncio.Semaphore, refresh: bool
+) -> ZoneRecords:
+    account = client.dom_account
+    key_params = inventory_cache.params_key(domain)
+    cached = inventory_cache.lookup(account, "domain_records", key_params, refresh)
+    if cached is not None:
+        return ZoneRecords(domain, list(cached), False)
+
+    store = inventory_cache.get_cache()
+    path = RESOURCES["domain_records"].path.format(domain)
+
+    async def page(number: int) -> Tuple[dict, bool]:
+        stored = store.zone_page(account, domain, number) if store else None
+        headers = {}
+        if stored and stored.etag and not refresh:
+            headers["If-None-Match"] = stored.etag
+        async with semaphore:
+            response = await client.request(
+                path, headers=headers, per_page=MAX_PER_PAGE, page=number
+            )
+        if response.status_code == 304 and stored:
+            return json.loads(stored.data), False
+        response.raise_for_status()
+
+        digest = hashlib.sha256(response.content).hexdigest()
+        etag = response.headers.get("etag")
+        if stored and stored.hash == digest:
+            if store and etag != stored.etag:
+                store.put_zone_page(account, domain, number, stored._replace(etag=etag))
+            return json.loads(stored.data), False
+        if store:
+            zone_page = ZonePage(etag, digest, response.text)
+            store.put_zone_page(account, domain, number, zone_page)
+        return response.json(), True
+
+    first, changed = await page(1)
+    key = RESOURCES["domain_records"].key
+    records = list(first.get(key, []))
+    total: Optional[int] = (first.get("meta") or {}).get("total")
+    last_page = math.ceil(total / MAX_PER_PAGE) if total else 1
+
+    if last_page > 1:
+        pages = await asyncio.gather(*(page(n) for n in range(2, last_page + 1)))
+        for body, page_changed in pages:
+            records.extend(body.get(key, []))
+            changed = changed or page_changed
+
+    if store:
+        store.trim_zone(account, domain, last_page)
+    inventory_cache.store(account, "domain_records", key_params, records)
+    return ZoneRecords(domain, records, changed)
@@ -0,0 +1,33 @@
+"""Shared fixtures."""
+
+import pytest
+
+from tests.fake_api import FakeDOAPI
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(monkeypatch, tmp_path):
+    """Give every test its own inventory cache, clients, catalogs, rate limiters and profiler."""
+    from dom.utils import cache, client, pricing, profile, ratelimit, transport
+
+    monkeypatch.setenv("DOM_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(ratelimit, "_limiters", {})
+    monkeypatch.setattr(client, "_clients", {})
+    monkeypatch.setattr(pricing, "_catalogs", {})
+    monkeypatch.setattr(profile, "_profiler", None)
+    transport.reset()
+    cache.configure()
+    yield
+    cache.configure()
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    """A running fake DO API that ``get_client()`` points at."""
+    api = FakeDOAPI().start()
+    monkeypatch.setenv("DIGITALOCEAN_TOKEN", "test-token")
+    monkeypatch.setenv("DIGITALOCEAN_API_URL", api.url)
+    # the real limits would pace the larger fixtures; tests opt back in
+    monkeypatch.setenv("DOM_RATE_LIMIT_PER_MINUTE", "1000000")
+    yield api
+    api.stop()
@@ -0,0 +1,375 @@
+"""Local stand-in for the DigitalOcean v2 API, serving paged fixtures."""
+
+import gzip
+import hashlib
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+
+def make_droplet(i: int, region: str = "fra1", size: str = "s-1vcpu-1gb", tags=None) -> dict:
+    """Droplet fixture shaped like a /v2/droplets item."""
+    return {
+        "id": 1000 + i,
+        "name": f"web-{i}",
+        "status": "active",
+        "memory": 1024,
+        "vcpus": 1,
+        "disk": 25,
+        "locked": False,
+        "created_at": "2024-01-01T00:00:00Z",
+        "size_slug": size,
+        "size": {"slug": size, "price_monthly": 6.0},
+        "region": {"slug": region, "name": region.upper()},
+        "image": {"slug": "ubuntu-22-04-x64", "name": "Ubuntu 22.04"},
+        "networks": {
+            "v4": [
+                {"ip_address": f"10.0.{i // 256 % 256}.{i % 256}", "type": "private"},
+                {"ip_address": f"203.0.{i // 256 % 256}.{i % 256}", "type": "public"},
+            ]
+        },
+        "tags": list(tags) if tags is not None else ["web"],
+        "vpc_uuid": "vpc-1",
+    }
+
+
+REGIONS = ("fra1", "nyc3", "ams3", "sgp1")
+SIZES = ("s-1vcpu-1gb", "s-1vcpu-2gb", "s-2vcpu-4gb", "s-4vcpu-8gb", "c-8")
+
+# Share of each resource type in a synthetic account, in thousandths.
+ACCOUNT_MIX = {
+    "droplets": 500,
+    "volumes": 150,
+    "snapshots": 100,
+    "domains": 50,
+    "firewalls": 50,
+    "floating_ips": 50,
+    "load_balancers": 40,
+    "databases": 30,
+    "kubernetes": 15,
+    "apps": 15,
+}
+
+
+def make_account(total: int) -> dict:
+    """Routes of a synthetic account of about ``total`` resources.
+
+    Returns ``{path: (key, items, paginated)}`` for ``FakeDOAPI.add``. Every
+    type gets at least one item; the data is deterministic, and a share of
+    volumes, floating IPs and load balancers is left unattached so that
+    cleanup has something to report.
+    """
+    n = {kind: max(1, total * share // 1000) for kind, share in ACCOUNT_MIX.items()}
+    droplet_ids = [1000 + i for i in range(n["droplets"])]
+
+    def attached(i):
+        return [droplet_ids[i % len(droplet_ids)]] if i % 3 else []
+
+    def region(i):
+        return {"slug": REGIONS[i % len(REGIONS)]}
+
+    return {
+        "droplets": ("droplets", [
+            make_droplet(i, region=REGIONS[i % len(REGIONS)], size=SIZES[i % len(SIZES)],
+                         tags=["web" if i % 2 else "db", f"team-{i % 7}"])
+            for i in range(n["droplets"])
+        ], True),
+        "volumes": ("volumes", [
+            {"id": f"vol-{i}", "name": f"data-{i}", "size_gigabytes": 10 * (1 + i % 10), "region": region(i),
+             "droplet_ids": attached(i), "filesystem_type": "ext4", "tags": [], "created_at": "2024-01-01T00:00:00Z"}
+            for i in range(n["volumes"])
+        ], True),
+        "snapshots": ("snapshots", [
+            {"id": str(5000 + i), "name": f"snap-{i}", "resource_type": "droplet", "regions": [REGIONS[i % 4]],
+             "min_disk_size": 25, "size_gigabytes": 2.5, "tags": [], "created_at": "2023-01-01T00:00:00Z"}
+            for i in range(n["snapshots"])
+        ], True),
+        "domains": ("domains", [{"name": f"example-{i}.com", "ttl": 1800} for i in range(n["domains"])], True),
+        "firewalls": ("firewalls", [
+            {"id": f"fw-{i}", "name": f"fw-{i}", "droplet_ids": attached(i + 1), "tags": ["web"],
+             "inbound_rules": [{"protocol": "tcp", "ports": "22", "sources": {"addresses": ["0.0.0.0/0"]}}],
+             "outbound_rules": [{"protocol": "tcp", "ports": "all", "destinations": {"addresses": ["0.0.0.0/0"]}}]}
+            for i in range(n["firewalls"])
+        ], True),
+        "floating_ips": ("floating_ips", [
+            {"ip": f"198.51.{i // 256 % 256}.{i % 256}", "region": region(i),
+             "droplet": {"id": droplet_ids[i % len(droplet_ids)]} if i % 3 else None}
+            for i in range(n["floating_ips"])
+        ], True),
+        "load_balancers": ("load_balancers", [
+            {"id": f"lb-{i}", "name": f"lb-{i}", "ip": f"192.0.2.{i % 256}", "status": "active", "region": region(i),
+             "size": "lb-small", "size_unit": 1, "droplet_ids": attached(i), "tag": ""}
+            for i in range(n["load_balancers"])
+        ], True),
+        "databases": ("databases", [
+            {"id": f"db-{i}", "name": f"db-{i}", "engine": "pg", "version": "16", "size": "db-s-1vcpu-1gb",
+             "region": REGIONS[i % 4], "status": "online", "num_nodes": 1 + i % 3, "tags": []}
+            for i in range(n["databases"])
+        ], False),
+        "kubernetes/clusters": ("kubernetes_clusters", [
+            {"id": f"k8s-{i}", "name": f"k8s-{i}", "region": REGIONS[i % 4], "version": "1.29.1-do.0",
+             "status": {"state": "running"}, "node_pools": [{"size": "s-2vcpu-4gb", "count": 3}], "tags": []}
+            for i in range(n["kubernetes"])
+        ], True),
+        "apps": ("apps", [
+            {"id": f"app-{i}", "spec": {"name": f"app-{i}"}, "region": {"slug": "fra"},
+             "live_url": f"https://app-{i}.ondigitalocean.app"}
+            for i in range(n["apps"])
+        ], True),
+        "sizes": ("sizes", [
+            {"slug": slug, "price_monthly": 6.0 * 2 ** i, "vcpus": 2 ** i, "memory": 1024 * 2 ** i, "disk": 25 * 2 ** i}
+            for i, slug in enumerate(SIZES)
+        ], True),
+    }
+
+
+class Rendezvous:
+    """Holds the requests of several fake APIs until each of them has one open.
+
+    The multi-API counterpart of ``FakeDOAPI.hold_until``: ``reached`` is
+    only true if every API had a request open at the same time, and
+    requests stop being held after ``timeout`` otherwise.
+    """
+
+    def __init__(self, apis: list, timeout: float = 5.0):
+        self.timeout = timeout
+        self.reached = False
+        self._waiting = set(apis)
+        self._timed_out = False
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        for api in apis:
+            api._rendezvous = self
+
+    def arrive(self, api: "FakeDOAPI") -> None:
+        with self._lock:
+            self._waiting.discard(api)
+            if not self._waiting and not self._timed_out:
+                self.reached = True
+                self._event.set()
+        if not self._event.wait(self.timeout):
+            with self._lock:
+                self._timed_out = True
+            self._event.set()
+
+
+class FakeDOAPI:
+    """Threaded HTTP server implementing DO-style list endpoints.
+
+    Register collections with ``add`` and point the client at ``url``.
+    ``DELETE /v2/<path>/<id>`` removes an item from a registered collection.
+    Every request is recorded in ``requests`` as ``(method, path, query)``.
+    """
+
+    def __init__(self, latency: float = 0.0, etags: bool = False, gzip: bool = False):
+        self.latency = latency
+        self.etags = etags
+        self.gzip = gzip
+        self.bytes_sent = 0
+        self.routes: dict = {}
+        self.requests: list = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.connections = 0
+        self.not_modified = 0
+        self.quota = 5000
+        self.throttle_every = 0
+        self.throttle_retry_after = 0.0
+        self._served = 0
+        self._failures: list = []
+        self._gate: Optional[tuple] = None
+        self._rendezvous: Optional[Rendezvous] = None
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def add(self, path: str, key: str, items: list, paginated: bool = True) -> None:
+        """Serve ``items`` under ``key`` at ``/v2/<path>``."""
+        self.routes["/v2/" + path.strip("/")] = (key, items, paginated)
+
+    def add_account(self, total: int) -> None:
+        """Serve a synthetic account of about ``total`` resources (see ``make_account``)."""
+        for path, (key, items, paginated) in make_account(total).items():
+            self.add(path, key, items, paginated)
+
+    def set(self, path: str, body: dict) -> None:
+        """Serve a fixed JSON body at ``/v2/<path>``."""
+        self.routes["/v2/" + path.strip("/")] = body
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeDOAPI":
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # headers and body go out in separate writes; avoid Nagle stalls
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with api._lock:
+                    api.connections += 1
+
+            def do_GET(self):
+                api._handle(self)
+
+            def do_DELETE(self):
+                api._handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            request_queue_size = 256
+            daemon_threads = True
+
+        self._server = Server(("127.0.0.1", 0), Handler)
+        threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        ).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def fail(self, status: int = 429, times: int = 1, retry_after: Optional[float] = None) -> None:
+        """Answer the next ``times`` requests with ``status``."""
+        self._failures.extend([(status, retry_after)] * times)
+
+    def throttle(self, every: int, retry_after: float = 0.0) -> None:
+        """Answer every ``every``-th request with 429, like a busy token; 0 turns it off."""
+        self.throttle_every = every
+        self.throttle_retry_after = retry_after
+
+    def hold_until(self, in_flight: int, timeout: float = 5.0) -> None:
+        """Hold every response until ``in_flight`` requests are open at once.
+
+        Shows that a client overlaps its requests without timing it: a
+        serial client never opens the gate, which gives up after ``timeout``
+        and leaves ``max_in_flight`` below ``in_flight``.
+        """
+        self._gate = (in_flight, threading.Event(), timeout)
+
+    def page_requests(self, path: str) -> list:
+        """Query dicts of every request made to ``/v2/<path>``."""
+        full = "/v2/" + path.strip("/")
+        return [q for _, p, q in self.requests if p == full]
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        parsed = urlparse(handler.path)
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        with self._lock:
+            self.requests.append((handler.command, parsed.path, query))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            gate = self._gate
+            if gate and self.in_flight >= gate[0]:
+                gate[1].set()
+        extra_headers = {}
+        try:
+            if gate and not gate[1].wait(gate[2]):
+                gate[1].set()  # not reached: stop holding the rest
+            if self._rendezvous:
+                self._rendezvous.arrive(self)
+            if self.latency:
+                time.sleep(self.latency)
+            with self._lock:
+                failure = self._failures.pop(0) if self._failures else None
+                self._served += 1
+                if failure is None and self.throttle_every and self._served % self.throttle_every == 0:
+                    failure = (429, self.throttle_retry_after)
+                self.quota = max(0, self.quota - 1)
+                remaining = self.quota
+            if failure:
+                status, retry_after = failure
+                body = {"id": "too_many_requests" if status == 429 else "server_error", "message": "simulated"}
+                if retry_after is not None:
+                    extra_headers["Retry-After"] = str(retry_after)
+            elif handler.command == "DELETE":
+                status, body = self._delete(parsed.path)
+            else:
+                status, body = self._respond(parsed.path, query)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        extra_headers["ratelimit-limit"] = "5000"
+        extra_headers["ratelimit-remaining"] = str(remaining)
+        extra_headers["ratelimit-reset"] = str(int(time.time()) + 3600)
+
+        payload = json.dumps(body).encode() if body is not None else b""
+        if self.etags and status == 200:
+            etag = '"%s"' % hashlib.sha1(payload).hexdigest()
+            if handler.headers.get("If-None-Match") == etag:
+                status, payload = 304, b""
+                with self._lock:
+                    self.not_modified += 1
+            handler.send_response(status)
+            handler.send_header("ETag", etag)
+        else:
+            handler.send_response(status)
+        if self.gzip and payload and "gzip" in handler.headers.get("Accept-Encoding", ""):
+            payload = gzip.compress(payload)
+            extra_headers["Content-Encoding"] = "gzip"
+        handler.send_header("Content-Type", "application/json")
+        for name, value in extra_headers.items():
+            handler.send_header(name, value)
+        handler.send_header("Content-Length", str(len(payload)))
+        handler.end_headers()
+        handler.wfile.write(payload)
+        with self._lock:
+            self.bytes_sent += len(payload)
+
+    def _delete(self, path: str):
+        collection, _, item_id = path.rpartition("/")
+        route = self.routes.get(collection)
+        if isinstance(route, tuple):
+            items = route[1]
+            with self._lock:
+                for i, item in enumerate(items):
+                    if str(item.get("id", item.get("ip"))) == item_id:
+                        del items[i]
+                        return 204, None
+        return 404, {"id": "not_found", "message": "The resource you requested could not be found."}
+
+    def _item(self, path: str):
+        """``GET /v2/<path>/<id>``: one item of a collection, e.g. ``{"droplet": {...}}``."""
+        collection, _, item_id = path.rpartition("/")
+        route = self.routes.get(collection)
+        if isinstance(route, tuple):
+            key, items, _ = route
+            for item in items:
+                if str(item.get("id", item.get("ip"))) == item_id:
+                    return 200, {key[:-1]: item}
+        return 404, {"id": "not_found", "message": "The resource you requested could not be found."}
+
+    def _respond(self, path: str, query: dict):
+        route = self.routes.get(path)
+        if route is None:
+            return self._item(path)
+        if isinstance(route, dict):
+            return 200, route
+
+        key, items, paginated = route
+        if not paginated:
+            return 200, {key: items}
+
+        per_page = min(int(query.get("per_page", 20)), 200)
+        page = int(query.get("page", 1))
+        start = (page - 1) * per_page
+        body = {
+            key: items[start:start + per_page],
+            "links": {"pages": {}},
+            "meta": {"total": len(items)},
+        }
+        if start + per_page < len(items):
+            body["links"]["pages"]["next"] = f"{path}?page={page + 1}&per_page={per_page}"
+        return 200, body
@@ -0,0 +1,92 @@
+"""Tests for multi-account audit and cost rollup."""
+
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from dom.cli import app
+from dom.utils import ratelimit
+from dom.utils.accounts import load_accounts
+from tests.fake_api import FakeDOAPI, Rendezvous, make_droplet
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def teams(tmp_path, monkeypatch):
+    """Three accounts, each behind its own slow fake API."""
+    apis = {}
+    lines = []
+    for n, name in enumerate(["acme", "beta", "gamma"], start=1):
+        api = FakeDOAPI(latency=0.1).start()
+        api.add_account(10 * n)
+        api.add("droplets", "droplets", [make_droplet(100 * n + i) for i in range(n)])
+        apis[name] = api
+        lines += [f"[{name}]", f"token_env = {name.upper()}_TOKEN", f"endpoint = {api.url}", ""]
+        monkeypatch.setenv(f"{name.upper()}_TOKEN", f"token-{name}")
+    path = tmp_path / "accounts.ini"
+    path.write_text("\n".join(lines))
+    monkeypatch.setenv("DOM_ACCOUNTS_FILE", str(path))
+    monkeypatch.setenv("DOM_RATE_LIMIT_PER_MINUTE", "1000000")
+    yield apis
+    for api in apis.values():
+        api.stop()
+
+
+def test_audit_all_accounts_in_parallel(teams):
+    both = Rendezvous([teams["gamma"], teams["acme"]])
+    result = runner.invoke(app, ["audit", "all", "--accounts", "gamma,acme", "--format", "ndjson"])
+
+    assert result.exit_code == 0, result.output
+    rows = [json.loads(line) for line in result.stdout.splitlines()]
+    droplets = [(r["account"], r["name"]) for r in rows if r["type"] == "droplets"]
+    assert droplets == [("gamma", "web-300"), ("gamma", "web-301"), ("gamma", "web-302"), ("acme", "web-100")]
+    assert {r["account"] for r in rows} == {"gamma", "acme"}
+    assert teams["beta"].requests == []
+    assert len(ratelimit.all_limiters()) == 2  # one budget per token
+    assert both.reached  # the two accounts had requests open at once
+
+
+def test_audit_all_accounts_table(teams):
+    result = runner.invoke(app, ["audit", "all", "--all-accounts"])
+
+    assert result.exit_code == 0, result.output
+    out = result.stdout
+    assert out.index("== acme ==") < out.index("== beta ==") < out.index("== gamma ==")
+    assert "web-201" in out
+    assert "Accounts" in out
+
+
+def test_costs_estimate_rollup(teams):
+    result = runner.invoke(app, ["costs", "estimate", "--all-accounts"])
+
+    assert result.exit_code == 0, result.output
+    rows = {}
+    for line in result.stdout.splitlines():
+        cells = [cell.strip() for cell in line.split("│")[1:-1]]
+        if len(cells) == 5:
+            rows[cells[0]] = [float(cell.lstrip("$")) for cell in cells[1:]]
+    assert list(rows) == ["acme", "beta", "gamma", "All accounts"]
+    assert rows["acme"][0] == 6.0  # one s-1vcpu-1gb droplet
+    sums = [sum(col) for col in zip(*(rows[n] for n in ("acme", "beta", "gamma")))]
+    assert rows["All accounts"] == pytest.approx(sums, abs=0.02)
+
+
+def test_unknown_account_is_rejected(teams):
+    result = runner.invoke(app, ["audit", "all", "--accounts", "acme,zeta"])
+
+    assert result.exit_code == 2
+    assert "zeta" in result.output
+
+
+def test_token_env_must_be_set(tmp_path, monkeypatch):
+    path = tmp_path / "accounts.ini"
+    path.write_text("[ops]\ntoken_env = OPS_TOKEN  # in the CI secrets\n[dev]\ntoken = dop_v1_x\n")
+    monkeypatch.delenv("OPS_TOKEN", raising=False)
+
+    with pytest.raises(ValueError, match="OPS_TOKEN is not set"):
+        load_accounts(path)
+
+    monkeypatch.setenv("OPS_TOKEN", "secret")
+    assert [(a.name, a.token) for a in load_accounts(path).values()] == [("ops", "secret"), ("dev", "dop_v1_x")]
@@ -0,0 +1,75 @@
+"""Tests for the asyncio API client."""
+
+import asyncio
+
+from dom.utils import aio, get_client, list_resources
+from tests.fake_api import make_droplet
+
+
+def test_same_shapes_as_pydo_path(fake_api, monkeypatch):
+    monkeypatch.setenv("DOM_CACHE", "off")
+    fake_api.add("droplets", "droplets", [make_droplet(i) for i in range(450)])
+    fake_api.add("databases", "databases", [{"name": "db"}], paginated=False)
+
+    droplets = aio.run(aio.fetch("droplets"))
+    databases = aio.run(aio.fetch("databases"))
+
+    assert droplets == list_resources(get_client(), "droplets")
+    assert databases == [{"name": "db"}]
+
+
+def test_reuses_pooled_connections(fake_api):
+    fake_api.add("domains", "domains", [])
+
+    async def many_requests():
+        async with aio.get_async_client() as client:
+            for _ in range(20):
+                await client.get("/v2/domains")
+
+    aio.run(many_requests())
+
+    assert fake_api.connections == 1
+
+
+def test_gather_isolates_errors(fake_api):
+    fake_api.add("volumes", "volumes", [{"id": "v1"}])
+
+    async def gather():
+        async with aio.get_async_client() as client:
+            return await client.gather_resources(["volumes", "firewalls"])
+
+    results = aio.run(gather())
+
+    assert results["volumes"] == [{"id": "v1"}]
+    assert isinstance(results["firewalls"], Exception)
+
+
+def test_reads_through_inventory_cache(fake_api):
+    fake_api.add("droplets", "droplets", [make_droplet(1)])
+
+    aio.run(aio.fetch("droplets"))
+    list_resources(get_client(), "droplets")
+
+    assert len(fake_api.page_requests("droplets")) == 1
+
+
+def test_crawl_overlaps_requests(fake_api, monkeypatch):
+    """An N+1 record crawl fans out and matches the serial pydo results."""
+    monkeypatch.setenv("DOM_CACHE", "off")
+    domains = [f"example{i}.com" for i in range(30)]
+    for name in domains:
+        fake_api.add(f"domains/{name}/records", "domain_records", [{"type": "A", "name": "@"}])
+    serial = [list_resources(get_client(), "domain_records", name) for name in domains]
+
+    async def crawl():
+        async with aio.get_async_client() as client:
+            return await asyncio.gather(
+                *(client.list_resources("domain_records", name) for name in domains)
+            )
+
+    fake_api.max_in_flight = 0
+    fake_api.hold_until(10)
+    concurrent = aio.run(crawl())
+
+    assert concurrent == serial
+    assert fake_api.max_in_flight >= 10
@@ -0,0 +1,71 @@
+"""Tests for audit commands."""
+
+from typer.testing import CliRunner
+
+from dom.cli import app
+from dom.commands.audit import AUDIT_SECTIONS
+from tests.fake_api import make_droplet
+
+runner = CliRunner()
+
+
+def _add_empty_sections(api):
+    for path, key in [
+        ("volumes", "volumes"),
+        ("domains", "domains"),
+        ("firewalls", "firewalls"),
+        ("load_balancers", "load_balancers"),
+        ("kubernetes/clusters", "kubernetes_clusters"),
+        ("apps", "apps"),
+    ]:
+        api.add(path, key, [])
+    api.add("databases", "databases", [], paginated=False)
+
+
+def test_audit_all_fetches_sections_concurrently(fake_api):
+    """Every section is requested at once, not one after the other."""
+    fake_api.add("droplets", "droplets", [make_droplet(1)])
+    _add_empty_sections(fake_api)
+    fake_api.hold_until(len(AUDIT_SECTIONS))
+
+    result = runner.invoke(app, ["audit", "all"])
+
+    assert result.exit_code == 0
+    assert "web-1" in result.stdout
+    assert fake_api.max_in_flight == len(AUDIT_SECTIONS)
+
+
+def test_audit_all_keeps_order_and_isolates_errors(fake_api):
+    """A failing section reports its error without hiding the others."""
+    fake_api.add("droplets", "droplets", [make_droplet(1)])
+    _add_empty_sections(fake_api)
+    del fake_api.routes["/v2/firewalls"]
+
+    result = runner.invoke(app, ["audit", "all"])
+
+    assert result.exit_code == 0
+    out = result.stdout
+    titles = ["Droplets", "Volumes", "Domains", "Firewalls", "Load Balancers",
+              "Database Clusters", "Kubernetes Clusters", "Apps (App Platform)"]
+    positions = [out.index(t) for t in titles]
+    assert positions == sorted(positions)
+    firewalls = out[out.index("Firewalls"):out.index("Load Balancers")]
+    assert "Error" in firewalls
+    assert "No load balancers found" in out
+
+
+def test_audit_all_on_a_throttled_synthetic_account(fake_api, monkeypatch):
+    """Every section of the generated account lists cleanly through 429s."""
+    from dom.utils import ratelimit
+
+    monkeypatch.setattr(ratelimit, "BACKOFF_BASE", 0.001)
+    fake_api.add_account(1000)
+    fake_api.throttle(5)
+
+    result = runner.invoke(app, ["audit", "all", "--format", "ndjson"])
+
+    assert result.exit_code == 0, result.output
+    rows = [line for line in result.stdout.splitlines() if line]
+    assert len(rows) == 1000 - 100 - 50  # snapshots and floating IPs are not audited
+    assert "Error" not in result.output
+    assert sum(limiter.throttled for limiter in ratelimit.all_limiters().values()) >= len(fake_api.requests) // 5
@@ -0,0 +1,116 @@
+"""Tests for the bulk deletion pipeline."""
+
+import pytest
+from typer.testing import CliRunner
+
+from dom.cli import app
+from dom.utils import bulk, get_client
+from dom.utils.bulk import Journal, Target, bulk_delete
+
+runner = CliRunner()
+
+
+def _snapshot(i):
+    return {"id": str(5000 + i), "name": f"snap-{i}", "created_at": "2020-01-01T00:00:00Z",
+            "min_disk_size": 25, "size_gigabytes": 2.5, "regions": ["fra1"], "resource_type": "droplet"}
+
+
+def _volume(i):
+    return {"id": f"vol-{i}", "name": f"data-{i}", "size_gigabytes": 10, "droplet_ids": [],
+            "region": {"slug": "fra1"}, "created_at": "2024-01-01T00:00:00Z"}
+
+
+def _deletes(api, path):
+    full = "/v2/" + path
+    return [p for method, p, _ in api.requests if method == "DELETE" and p.startswith(full)]
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(bulk, "BACKOFF_BASE", 0.001)
+
+
+def test_snapshots_are_deleted_in_parallel(fake_api):
+    fake_api.latency = 0.05
+    fake_api.add("snapshots", "snapshots", [_snapshot(i) for i in range(40)])
+
+    result = runner.invoke(app, ["cleanup", "snapshots", "--execute", "--force", "-c", "8"])
+
+    assert result.exit_code == 0
+    assert "Deleted 40 snapshots" in result.stdout
+    assert len(_deletes(fake_api, "snapshots")) == 40
+    assert fake_api.max_in_flight > 1
+    assert fake_api.routes["/v2/snapshots"][1] == []
+
+
+def test_busy_resources_are_retried(fake_api, tmp_path):
+    fake_api.add("volumes", "volumes", [_volume(i) for i in range(3)])
+    client = get_client()
+    fake_api.fail(409, times=2)  # volume still detaching
+
+    report = bulk_delete([Target(f"vol-{i}", f"data-{i}") for i in range(3)],
+                         client.volumes.delete, Journal(tmp_path / "j.jsonl"), concurrency=1)
+
+    assert len(report.deleted) == 3 and not report.failed
+    assert not (tmp_path / "j.jsonl").exists()
+
+
+def test_server_errors_are_not_retried(fake_api, tmp_path):
+    fake_api.add("volumes", "volumes", [_volume(0)])
+    client = get_client()
+    fake_api.fail(500, retry_after=0)
+
+    report = bulk_delete([Target("vol-0", "data-0")], client.volumes.delete,
+                         Journal(tmp_path / "j.jsonl"))
+
+    assert len(report.failed) == 1
+    assert len(_deletes(fake_api, "volumes")) == 1  # it may have been applied
+
+
+def test_failures_are_reported_and_journaled(fake_api):
+    fake_api.add("volumes", "volumes", [_volume(i) for i in range(3)])
+
+    def delete(volume_id):
+        if volume_id == "vol-1":
+            raise PermissionError("forbidden")
+        return get_client().volumes.delete(volume_id)
+
+    journal = Journal(bulk.journal_path("acct", "volumes"))
+    report = bulk_delete([Target(f"vol-{i}", f"data-{i}") for i in range(3)], delete, journal)
+
+    assert [t.id for t in report.deleted] == ["vol-0", "vol-2"]
+    assert [(t.id, err) for t, err in report.failed] == [("vol-1", "forbidden")]
+    assert journal.deleted() == {"vol-0", "vol-2"}
+
+
+def test_interrupted_run_resumes(fake_api, tmp_path):
+    fake_api.add("volumes", "volumes", [_volume(i) for i in range(10)])
+    targets = [Target(f"vol-{i}", f"data-{i}") for i in range(10)]
+    journal = Journal(tmp_path / "volumes.jsonl")
+    calls = []
+
+    def flaky_delete(volume_id):
+        if len(calls) == 4:
+            raise KeyboardInterrupt
+        calls.append(volume_id)
+        return get_client().volumes.delete(volume_id)
+
+    with pytest.raises(KeyboardInterrupt):
+        bulk_delete(targets, flaky_delete, journal, concurrency=1)
+    assert journal.deleted() == {f"vol-{i}" for i in range(4)}
+
+    # the listing may still show deleted volumes for a while
+    report = bulk_delete(targets, get_client().volumes.delete, journal)
+
+    assert len(report.resumed) == 4
+    assert len(report.deleted) == 6
+    assert len(_deletes(fake_api, "volumes")) == 10
+    assert not journal.path.exists()
+
+
+def test_already_deleted_counts_as_deleted(fake_api, tmp_path):
+    fake_api.add("volumes", "volumes", [])
+
+    report = bulk_delete([Target("vol-gone", "gone")], get_client().volumes.delete, Journal(tmp_path / "j"))
+
+    assert [t.id for t in report.deleted] == ["vol-gone"]
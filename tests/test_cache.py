@@ -0,0 +1,129 @@
+"""Tests for the inventory cache."""
+
+import time
+
+from typer.testing import CliRunner
+
+from dom.cli import app
+from dom.utils import cache, get_client, iter_resources, list_resources
+from dom.utils.cache import InventoryCache
+from tests.fake_api import make_droplet
+
+runner = CliRunner()
+
+
+def test_repeat_listing_is_served_from_cache(fake_api):
+    fake_api.add("droplets", "droplets", [make_droplet(i) for i in range(3)])
+
+    first = list_resources(get_client(), "droplets")
+    second = list_resources(get_client(), "droplets")
+
+    assert first == second
+    assert len(fake_api.page_requests("droplets")) == 1
+
+
+def test_params_are_part_of_the_key(fake_api):
+    fake_api.add("droplets", "droplets", [make_droplet(1)])
+
+    list_resources(get_client(), "droplets")
+    list_resources(get_client(), "droplets", tag_name="web")
+
+    assert len(fake_api.page_requests("droplets")) == 2
+
+
+def test_ttl_expiry(fake_api, monkeypatch):
+    monkeypatch.setenv("DOM_CACHE_TTL_DROPLETS", "0")
+    fake_api.add("droplets", "droplets", [make_droplet(1)])
+
+    list_resources(get_client(), "droplets")
+    list_resources(get_client(), "droplets")
+
+    assert len(fake_api.page_requests("droplets")) == 2
+
+
+def test_partial_iteration_is_not_cached(fake_api):
+    fake_api.add("droplets", "droplets", [make_droplet(i) for i in range(3)])
+
+    next(iter_resources(get_client(), "droplets"))
+    list_resources(get_client(), "droplets")
+
+    assert len(fake_api.page_requests("droplets")) == 2
+
+
+def test_refresh_and_offline_flags(fake_api):
+    fake_api.add("droplets", "droplets", [make_droplet(i) for i in range(3)])
+
+    result = runner.invoke(app, ["--offline", "audit", "droplets"])
+    assert result.exit_code == 1
+    assert "no cached droplets; run once without --offline" in result.stderr
+    assert fake_api.requests == []
+
+    assert runner.invoke(app, ["audit", "droplets"]).exit_code == 0
+    assert runner.invoke(app, ["--offline", "audit", "droplets"]).exit_code == 0
+    assert len(fake_api.page_requests("droplets")) == 1
+
+    assert runner.invoke(app, ["--refresh", "audit", "droplets"]).exit_code == 0
+    assert len(fake_api.page_requests("droplets")) == 2
+
+
+def test_offline_status_never_calls_the_api(fake_api, monkeypatch):
+    fake_api.set("account", {"account": {
+        "email": "ops@example.com", "status": "active", "droplet_limit": 25}})
+    for kind in ("droplets", "volumes", "domains"):
+        fake_api.add(kind, kind, [])
+
+    result = runner.invoke(app, ["--offline", "status"])
+    assert result.exit_code == 1
+    assert "no cached account; run once without --offline" in result.stderr
+    assert fake_api.requests == []
+
+    assert runner.invoke(app, ["status"]).exit_code == 0
+    for kind in ("droplets", "volumes", "domains"):
+        list_resources(get_client(), kind)
+    requests = len(fake_api.requests)
+    monkeypatch.setenv("DOM_CACHE_TTL_ACCOUNT", "0")
+    monkeypatch.setenv("DOM_CACHE_TTL_DROPLETS", "0")
+
+    result = runner.invoke(app, ["--offline", "status"])
+    assert result.exit_code == 0, result.output
+    assert "ops@example.com" in result.stdout
+    assert len(fake_api.requests) == requests
+
+
+def test_concurrent_writers(tmp_path):
+    """Separate connections can replace the same listing without errors."""
+    import threading
+
+    path = tmp_path / "inventory.db"
+    errors = []
+
+    def writer(n):
+        try:
+            store = InventoryCache(path)
+            for _ in range(20):
+                store.write("acct", "droplets", "[]", [{"n": n}] * 50)
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    items = list(InventoryCache(path).read("acct", "droplets", "[]"))
+    assert len(items) == 50
+    assert len({i["n"] for i in items}) == 1
+    assert time.time() - InventoryCache(path).fetched_at("acct", "droplets", "[]") < 60
+
+
+def test_disabled_cache(fake_api, monkeypatch):
+    monkeypatch.setenv("DOM_CACHE", "off")
+    fake_api.add("droplets", "droplets", [make_droplet(1)])
+
+    list_resources(get_client(), "droplets")
+    list_resources(get_client(), "droplets")
+
+    assert cache.get_cache() is None
+    assert len(fake_api.page_requests("droplets")) == 2
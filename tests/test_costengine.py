@@ -0,0 +1,112 @@
+"""Tests for the columnar cost engine."""
+
+import random
+from collections import defaultdict
+
+import pytest
+from typer.testing import CliRunner
+
+from dom.cli import app
+from dom.utils.costengine import CostFrame
+from tests.fake_api import make_droplet
+
+runner = CliRunner()
+
+REGIONS = ["fra1", "ams3", "nyc1", "sfo3", "sgp1"]
+SIZES = ["s-1vcpu-1gb", "s-2vcpu-4gb", "c-4", "db-s-1vcpu-2gb"]
+TYPES = ["droplets", "volumes", "snapshots", "databases", "load_balancers"]
+TAGS = [f"team-{i}" for i in range(40)]
+
+
+def _frame(count, seed=1):
+    rng = random.Random(seed)
+    frame = CostFrame()
+    for _ in range(count):
+        frame.add(rng.choice(TYPES), rng.choice(REGIONS), rng.choice(SIZES),
+                  rng.sample(TAGS, rng.randint(0, 2)), rng.choice([4.0, 6.0, 12.5, 60.0]))
+    return frame
+
+
+def _reference(frame, by):
+    """Plain-Python group-by over the same items."""
+    rng = random.Random(1)
+    totals = defaultdict(lambda: [0, 0.0])
+    for _ in range(len(frame)):
+        item = {"type": rng.choice(TYPES), "region": rng.choice(REGIONS), "size": rng.choice(SIZES)}
+        tags = rng.sample(TAGS, rng.randint(0, 2)) or ["untagged"]
+        cost = rng.choice([4.0, 6.0, 12.5, 60.0])
+        for tag in tags if "tag" in by else [None]:
+            key = tuple(tag if dim == "tag" else item[dim] for dim in by)
+            totals[key][0] += 1
+            totals[key][1] += cost
+    return totals
+
+
+@pytest.mark.parametrize("by", [["type"], ["tag"], ["tag", "region"], ["region", "size", "type", "tag"]])
+def test_matches_plain_python(by):
+    frame = _frame(3000)
+
+    groups = frame.group_by(by)
+
+    expected = _reference(frame, by)
+    assert {g.keys: (g.items, round(g.cost, 6)) for g in groups} == {
+        k: (n, round(c, 6)) for k, (n, c) in expected.items()
+    }
+    assert [g.cost for g in groups] == sorted((g.cost for g in groups), reverse=True)
+
+
+def test_totals_are_not_double_counted():
+    frame = CostFrame()
+    frame.add("droplets", "fra1", "s-1vcpu-1gb", ["web", "prod"], 6)
+    frame.add("volumes", "fra1", "100gb", [], 10)
+
+    assert frame.total == 16
+    assert sum(g.cost for g in frame.group_by(["region"])) == 16
+    assert {g.keys: g.cost for g in frame.group_by(["tag"])} == {
+        ("untagged",): 10, ("web",): 6, ("prod",): 6
+    }
+
+
+def test_unknown_dimension():
+    with pytest.raises(ValueError):
+        CostFrame().group_by(["colour"])
+
+
+def test_breakdown_command(fake_api):
+    fake_api.add("sizes", "sizes", [])
+    fake_api.add("droplets", "droplets", [
+        make_droplet(1, region="fra1", tags=["web"]),
+        make_droplet(2, region="ams3", tags=["web"]),
+        make_droplet(3, region="fra1", size="s-2vcpu-4gb", tags=["db"]),
+    ])
+    fake_api.add("volumes", "volumes", [{"id": "v", "name": "data", "size_gigabytes": 100, "region": {"slug": "fra1"}}])
+    for path, key in [("snapshots", "snapshots"), ("load_balancers", "load_balancers"),
+                      ("kubernetes/clusters", "kubernetes_clusters"), ("floating_ips", "floating_ips")]:
+        fake_api.add(path, key, [])
+    fake_api.add("databases", "databases", [], paginated=False)
+
+    result = runner.invoke(app, ["costs", "breakdown", "--by", "tag,region", "--format", "csv"])
+
+    assert result.exit_code == 0
+    assert result.stdout.splitlines() == [
+        "tag,region,items,monthly",
+        "db,fra1,1,24.0",
+        "untagged,fra1,1,10.0",
+        "web,ams3,1,6.0",
+        "web,fra1,1,6.0",
+    ]
+    assert runner.invoke(app, ["costs", "breakdown", "--by", "colour"]).exit_code != 0
+
+
+def test_large_frame_totals():
+    """Totals hold at 100k items grouped by every dimension at once."""
+    frame = _frame(100_000)
+
+    by_region = frame.group_by(["region"])
+    by_everything = frame.group_by(["tag", "region", "size", "type"])
+
+    assert sum(g.items for g in by_region) == 100_000
+    assert sum(g.cost for g in by_region) == pytest.approx(frame.total)
+    by_tag = _reference(frame, ["tag"]).values()
+    assert sum(g.items for g in by_everything) == sum(n for n, _ in by_tag)
+    assert sum(g.cost for g in by_everything) == pytest.approx(sum(c for _, c in by_tag))
@@ -0,0 +1,127 @@
+"""Tests for the Terraform export."""
+
+import time
+
+import pytest
+from typer.testing import CliRunner
+
+from dom.cli import app
+from tests.fake_api import make_droplet
+
+runner = CliRunner()
+
+
+def _add_account(api, droplets):
+    api.add("droplets", "droplets", droplets)
+    api.add("volumes", "volumes", [{"id": "vol-1", "name": "data", "size_gigabytes": 10,
+                                    "region": {"slug": "fra1"}, "description": 'say "hi" ${x}'}])
+    api.add("domains", "domains", [{"name": "example.com"}])
+    api.add("firewalls", "firewalls", [])
+
+
+def _export(out, *args):
+    result = runner.invoke(app, ["export", "terraform", "-o", str(out), *args])
+    assert result.exit_code == 0, result.output
+    return result
+
+
+@pytest.fixture
+def out(tmp_path):
+    return tmp_path / "terraform"
+
+
+def _mtimes(path):
+    return {p.name: p.stat().st_mtime_ns for p in path.iterdir()}
+
+
+def test_one_file_per_type(fake_api, out):
+    _add_account(fake_api, [make_droplet(2), make_droplet(1, tags=["web", "prod"])])
+
+    _export(out)
+
+    assert sorted(p.name for p in out.iterdir()) == [
+        "domains.tf", "droplets.tf", "firewalls.tf", "import.sh", "main.tf", "volumes.tf"
+    ]
+    droplets = (out / "droplets.tf").read_text()
+    assert droplets.index('"web_1"') < droplets.index('"web_2"')
+    assert 'tags     = ["web", "prod"]' in droplets
+    assert 'description             = "say \\"hi\\" $${x}"' in (out / "volumes.tf").read_text()
+    assert "digitalocean_droplet" not in (out / "main.tf").read_text()
+    assert (out / "import.sh").read_text().splitlines()[3:] == [
+        "terraform import digitalocean_droplet.web_1 1001",
+        "terraform import digitalocean_droplet.web_2 1002",
+        "terraform import digitalocean_volume.data vol-1",
+        "terraform import digitalocean_domain.example_com example.com",
+    ]
+
+
+def test_duplicate_names_stay_unique(fake_api, out):
+    twins = [make_droplet(1), {**make_droplet(2), "name": "web-1"}]
+    _add_account(fake_api, twins)
+
+    _export(out, "--type", "droplets")
+
+    droplets = (out / "droplets.tf").read_text()
+    assert '"web_1_1001"' in droplets and '"web_1_1002"' in droplets
+
+
+def test_unchanged_export_touches_no_files(fake_api, out):
+    _add_account(fake_api, [make_droplet(i) for i in range(5)])
+    _export(out)
+    before = _mtimes(out)
+    time.sleep(0.01)
+
+    result = _export(out)
+
+    assert _mtimes(out) == before
+    assert "Unchanged: 6 files" in result.stdout
+
+
+def test_only_changed_types_are_rewritten(fake_api, out):
+    _add_account(fake_api, [make_droplet(i) for i in range(5)])
+    _export(out)
+    before = _mtimes(out)
+    time.sleep(0.01)
+
+    fake_api.routes["/v2/droplets"][1].append(make_droplet(9))
+    # --refresh: the droplet listing is still fresh in the cache
+    result = runner.invoke(app, ["--refresh", "export", "terraform", "-o", str(out)])
+
+    after = _mtimes(out)
+    changed = sorted(name for name in after if after[name] != before[name])
+    assert changed == ["droplets.tf", "import.sh"]
+    assert "Written" in result.stdout
+
+
+def test_large_export(fake_api, out):
+    droplets = [make_droplet(i, tags=["web", f"team-{i % 7}"]) for i in range(10_000)]
+    _add_account(fake_api, droplets)
+
+    _export(out)
+
+    assert (out / "droplets.tf").read_text().count("resource ") == 10_000
+    assert (out / "import.sh").read_text().count("terraform import") == 10_002
+
+
+def test_import_blocks(fake_api, out):
+    _add_account(fake_api, [make_droplet(1)])
+
+    _export(out, "--import-blocks")
+
+    blocks = (out / "imports.tf").read_text()
+    assert 'import {\n  to = digitalocean_droplet.web_1\n  id = "1001"\n}' in blocks
+    assert blocks.count("import {") == 3
+
+
+def test_stale_import_files_are_removed(fake_api, out):
+    _add_account(fake_api, [make_droplet(1)])
+    _export(out, "--import-blocks")
+
+    result = _export(out)
+
+    assert not (out / "imports.tf").exists()
+    assert "Removed:" in result.stdout
+
+    _export(out, "--type", "firewalls")  # nothing to import
+
+    assert not (out / "import.sh").exists()
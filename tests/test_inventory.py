@@ -0,0 +1,100 @@
+"""Tests for the Ansible dynamic inventory."""
+
+import json
+import os
+import subprocess
+import sys
+
+from typer.testing import CliRunner
+
+from dom.cli import app
+from dom.utils.inventory import build_inventory
+from dom.utils.models import Droplet
+from tests.fake_api import make_droplet
+
+runner = CliRunner()
+
+
+def _list(*args):
+    result = runner.invoke(app, ["ans", "inventory", *args])
+    assert result.exit_code == 0, result.output
+    return json.loads(result.stdout)
+
+
+def test_groups_by_tag_region_size_and_vpc():
+    droplets = [
+        make_droplet(1, tags=["web", "prod-eu"]),
+        make_droplet(2, region="nyc3", size="s-2vcpu-4gb", tags=[]),
+        {**make_droplet(3), "name": "web-1"},  # duplicate name
+        {**make_droplet(4), "networks": {"v4": []}},  # unreachable
+    ]
+
+    inventory = build_inventory(Droplet.from_api(d) for d in droplets)
+
+    hostvars = inventory["_meta"]["hostvars"]
+    assert sorted(hostvars) == ["web-1", "web-1-1003", "web-2"]
+    assert hostvars["web-1"]["ansible_host"] == "203.0.0.1"
+    assert hostvars["web-2"]["do_size"] == "s-2vcpu-4gb"
+    assert inventory["tag_prod_eu"] == {"hosts": ["web-1"]}
+    assert inventory["tag_web"] == {"hosts": ["web-1", "web-1-1003"]}
+    assert inventory["region_nyc3"] == {"hosts": ["web-2"]}
+    assert inventory["size_s_2vcpu_4gb"] == {"hosts": ["web-2"]}
+    assert inventory["vpc_vpc_1"]["hosts"] == ["web-1", "web-2", "web-1-1003"]
+    assert "region_fra1" in inventory["all"]["children"]
+
+
+def test_list_is_served_from_cache(fake_api):
+    fake_api.add("droplets", "droplets", [make_droplet(i) for i in range(1, 4)])
+
+    first = _list("--list")
+    calls = len(fake_api.requests)
+    second = _list("--list")
+
+    assert first == second
+    assert len(fake_api.requests) == calls
+    assert first["tag_web"]["hosts"] == ["web-1", "web-2", "web-3"]
+    assert _list("--host", "web-2")["do_id"] == 1002
+    assert _list("--host", "missing") == {}
+
+
+def test_refresh_rebuilds(fake_api):
+    fake_api.add("droplets", "droplets", [make_droplet(1)])
+    _list("--list")
+    fake_api.add("droplets", "droplets", [make_droplet(1), make_droplet(2)])
+
+    assert sorted(_list("--list")["_meta"]["hostvars"]) == ["web-1"]
+    result = runner.invoke(app, ["--refresh", "ans", "inventory", "--list"])
+    assert sorted(json.loads(result.stdout)["_meta"]["hostvars"]) == ["web-1", "web-2"]
+
+
+def test_cached_list_skips_pydo(fake_api):
+    fake_api.add("droplets", "droplets", [make_droplet(1)])
+    expected = _list("--list")
+
+    script = (
+        "import json, sys\n"
+        "from dom.cli import app\n"
+        "try:\n"
+        "    app(['ans', 'inventory', '--list'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "sys.stderr.write(json.dumps(sorted(m for m in sys.modules if m.split('.')[0] in ('pydo', 'azure'))))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=os.environ)
+
+    assert json.loads(result.stdout) == expected
+    assert json.loads(result.stderr) == []
+
+
+def test_dynamic_inventory_script(fake_api, tmp_path, monkeypatch):
+    from dom.commands import ans
+
+    fake_api.add("droplets", "droplets", [make_droplet(1)])
+    monkeypatch.setattr(ans, "ANSIBLE_DIR", tmp_path / "ansible")
+
+    inventory = ans.get_inventory_file(dynamic=True)
+
+    script = tmp_path / "ansible" / inventory
+    assert os.access(script, os.X_OK)
+    result = subprocess.run([str(script), "--list"], capture_output=True, text=True, check=True)
+    assert json.loads(result.stdout)["_meta"]["hostvars"]["web-1"]["do_region"] == "fra1"
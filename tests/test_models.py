@@ -0,0 +1,67 @@
+"""Tests for the compact resource records."""
+
+import gc
+import json
+import tracemalloc
+
+from dom.utils import get_client, list_models
+from dom.utils.models import Database, Droplet, FloatingIP, from_api
+from tests.fake_api import make_droplet
+
+
+def test_droplet_fields():
+    d = Droplet.from_api(make_droplet(1, region="ams3", size="s-2vcpu-4gb", tags=["web", "prod"]))
+
+    assert (d.id, d.name, d.region, d.region_name, d.size) == (1001, "web-1", "ams3", "AMS3", "s-2vcpu-4gb")
+    assert d.public_ip == d.ip == "203.0.0.1"
+    assert d.private_ip == "10.0.0.1"
+    assert d.tags == ("web", "prod")
+    assert d.image == "ubuntu-22-04-x64"
+    assert d.price_monthly == 6.0
+    assert not d.locked
+
+
+def test_shared_strings_are_interned():
+    a, b = (Droplet.from_api(json.loads(json.dumps(make_droplet(i)))) for i in range(2))
+
+    assert a.region is b.region
+    assert a.size is b.size
+    assert a.tags[0] is b.tags[0]
+
+
+def test_sparse_items():
+    """Items missing optional fields still convert."""
+    assert Database.from_api({"name": "db"}).region == ""
+    assert FloatingIP.from_api({"ip": "198.51.100.1", "region": {"slug": "fra1"}}).droplet_id is None
+    assert Droplet.from_api({"id": 1, "networks": {"v4": []}}).ip == ""
+
+
+def test_list_models(fake_api):
+    fake_api.add("droplets", "droplets", [make_droplet(i) for i in range(3)])
+
+    droplets = list_models(get_client(), "droplets")
+
+    assert [d.name for d in droplets] == ["web-0", "web-1", "web-2"]
+
+
+def _retained(build):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del kept
+    return size
+
+
+def test_memory_against_raw_dicts():
+    """Records take a fraction of the memory of the API dicts they replace."""
+    payload = json.dumps([make_droplet(i, tags=["web", f"team-{i % 10}"]) for i in range(5000)])
+
+    dicts = _retained(lambda: json.loads(payload))
+    models = _retained(lambda: [from_api("droplets", d) for d in json.loads(payload)])
+
+    assert models * 3 < dicts
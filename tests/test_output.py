@@ -0,0 +1,127 @@
+"""Tests for streamed machine-readable audit output."""
+
+import csv
+import io
+import json
+import sys
+import time
+import tracemalloc
+
+from typer.testing import CliRunner
+
+from dom.cli import app
+from dom.utils import cache
+from tests.fake_api import make_droplet
+from tests.test_audit import _add_empty_sections
+
+runner = CliRunner()
+
+
+def test_ndjson_droplets(fake_api):
+    fake_api.add("droplets", "droplets", [make_droplet(i, region="fra1" if i % 2 else "ams3") for i in range(250)])
+
+    result = runner.invoke(app, ["audit", "droplets", "--format", "ndjson", "--region", "fra1"])
+
+    assert result.exit_code == 0
+    rows = [json.loads(line) for line in result.stdout.splitlines()]
+    assert len(rows) == 125
+    assert rows[0]["name"] == "web-1"
+    assert rows[0]["public_ip"] == "203.0.0.1"
+    assert rows[0]["tags"] == ["web"]
+
+
+def test_csv_and_json(fake_api):
+    fake_api.add("droplets", "droplets", [make_droplet(i, tags=["web", "prod"]) for i in range(3)])
+
+    result = runner.invoke(app, ["audit", "droplets", "--format", "csv"])
+    rows = list(csv.DictReader(io.StringIO(result.stdout)))
+    assert [r["name"] for r in rows] == ["web-0", "web-1", "web-2"]
+    assert rows[0]["tags"] == "web;prod"
+
+    result = runner.invoke(app, ["audit", "droplets", "--format", "json"])
+    assert [d["id"] for d in json.loads(result.stdout)] == [1000, 1001, 1002]
+
+
+def test_unknown_format(fake_api):
+    result = runner.invoke(app, ["audit", "droplets", "--format", "xml"])
+
+    assert result.exit_code != 0
+
+
+def test_audit_all_rows_are_typed(fake_api):
+    fake_api.add("droplets", "droplets", [make_droplet(1)])
+    _add_empty_sections(fake_api)
+    fake_api.add("volumes", "volumes", [{"id": "vol-1", "name": "data", "size_gigabytes": 10}])
+
+    result = runner.invoke(app, ["audit", "all", "--format", "ndjson"])
+
+    rows = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [(r["type"], r["name"]) for r in rows] == [("droplets", "web-1"), ("volumes", "data")]
+
+
+def test_audit_domains_ndjson(fake_api):
+    fake_api.add("domains", "domains", [{"name": "example.com", "ttl": 1800}])
+    fake_api.add("domains/example.com/records", "domain_records",
+                 [{"id": 1, "type": "A", "name": "@", "data": "203.0.113.1", "ttl": 1800}])
+
+    result = runner.invoke(app, ["audit", "domains", "--format", "ndjson"])
+
+    assert json.loads(result.stdout) == {
+        "domain": "example.com", "id": 1, "type": "A", "name": "@",
+        "data": "203.0.113.1", "ttl": 1800, "priority": None,
+    }
+
+
+class _Probe(io.TextIOBase):
+    """stdout stand-in counting lines and noting when the first one arrives."""
+
+    first_write = None
+    lines = 0
+
+    def write(self, text):
+        if self.first_write is None:
+            self.first_write = time.perf_counter()
+        self.lines += text.count("\n")
+        return len(text)
+
+
+def _stream_droplets():
+    from dom.commands.audit import audit_droplets
+
+    probe, stdout = _Probe(), sys.stdout
+    sys.stdout = probe
+    try:
+        started = time.perf_counter()
+        audit_droplets(region=None, tag=None, fmt="ndjson")
+        return probe, started, time.perf_counter()
+    finally:
+        sys.stdout = stdout
+
+
+def test_first_row_after_first_page(fake_api):
+    fake_api.latency = 0.3
+    fake_api.add("droplets", "droplets", [make_droplet(i) for i in range(1000)])
+
+    probe, started, finished = _stream_droplets()
+
+    assert probe.lines == 1000
+    assert probe.first_write - started < (finished - started) - 0.2
+
+
+def test_memory_does_not_grow_with_account(fake_api):
+    cache.configure(refresh=True)
+
+    def peak(count):
+        fake_api.add("droplets", "droplets", [make_droplet(i) for i in range(count)])
+        _stream_droplets()  # warm imports and the connection pool
+        tracemalloc.start()
+        try:
+            probe, _, _ = _stream_droplets()
+            assert probe.lines == count
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    # beyond the pagination window (concurrency x page size) peak should be flat
+    small, large = peak(2000), peak(6000)
+    assert large < small * 1.5
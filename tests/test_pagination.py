@@ -0,0 +1,76 @@
+"""Tests for the paginated fetch layer."""
+
+from typer.testing import CliRunner
+
+from dom.cli import app
+from dom.utils import get_client, iter_resources, list_resources
+from dom.utils.pagination import paginate
+from tests.fake_api import make_droplet
+
+runner = CliRunner()
+
+
+def test_fetches_every_page_at_max_page_size(fake_api):
+    """All items come back, in order, using per_page=200."""
+    fake_api.add("droplets", "droplets", [make_droplet(i) for i in range(450)])
+
+    droplets = list_resources(get_client(), "droplets")
+
+    assert [d["id"] for d in droplets] == [1000 + i for i in range(450)]
+    pages = fake_api.page_requests("droplets")
+    assert sorted(int(q["page"]) for q in pages) == [1, 2, 3]
+    assert all(q["per_page"] == "200" for q in pages)
+
+
+def test_iterator_is_lazy(fake_api):
+    """No request is made until the iterator is advanced."""
+    fake_api.add("droplets", "droplets", [make_droplet(i) for i in range(5)])
+
+    droplets = iter_resources(get_client(), "droplets")
+    assert fake_api.requests == []
+
+    assert next(droplets)["id"] == 1000
+    assert len(fake_api.requests) == 1
+
+
+def test_concurrency_is_bounded(fake_api):
+    """Remaining pages are fetched in parallel, never above the limit."""
+    fake_api.latency = 0.05
+    fake_api.add("droplets", "droplets", [make_droplet(i) for i in range(2000)])
+
+    droplets = list_resources(get_client(), "droplets", concurrency=3)
+
+    assert len(droplets) == 2000
+    assert fake_api.max_in_flight == 3
+
+
+def test_walks_pages_without_meta():
+    """Endpoints without meta.total are walked until a short page."""
+    items = list(range(450))
+    calls = []
+
+    def list_fn(per_page, page):
+        calls.append(page)
+        start = (page - 1) * per_page
+        return {"things": items[start:start + per_page]}
+
+    assert list(paginate(list_fn, "things")) == items
+    assert calls == [1, 2, 3]
+
+
+def test_unpaginated_endpoint(fake_api):
+    """Database clusters are returned in a single response."""
+    fake_api.add("databases", "databases", [{"name": "db"}], paginated=False)
+
+    assert list_resources(get_client(), "databases") == [{"name": "db"}]
+    assert fake_api.page_requests("databases") == [{}]
+
+
+def test_audit_droplets_sees_all_pages(fake_api):
+    """dom audit droplets lists more than the API's default first page."""
+    fake_api.add("droplets", "droplets", [make_droplet(i) for i in range(250)])
+
+    result = runner.invoke(app, ["audit", "droplets"])
+
+    assert result.exit_code == 0
+    assert "Total: 250 droplets" in result.stdout
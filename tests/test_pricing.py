@@ -0,0 +1,83 @@
+"""Tests for the price catalog."""
+
+import pytest
+from typer.testing import CliRunner
+
+from dom.cli import app
+from dom.utils import get_client, pricing
+from dom.utils.models import Database, Droplet
+from tests.fake_api import make_droplet
+
+runner = CliRunner()
+
+
+def _size(slug, price):
+    return {"slug": slug, "price_monthly": price, "vcpus": 1, "memory": 1024, "disk": 25}
+
+
+def test_api_prices_override_bundled(fake_api):
+    fake_api.add("sizes", "sizes", [_size("s-1vcpu-1gb", 6.5), _size("s-custom", 42)])
+
+    catalog = pricing.get_catalog(get_client())
+
+    assert catalog.source == "api"
+    assert catalog.size("s-custom") == 42
+    assert catalog.size("s-1vcpu-1gb") == 6.5
+    assert catalog.size("c-2") == 42  # bundled, not offered by this API
+
+
+def test_catalog_is_fetched_once(fake_api, monkeypatch):
+    fake_api.add("sizes", "sizes", [_size("s-1vcpu-1gb", 6)])
+
+    pricing.get_catalog(get_client())
+    pricing.get_catalog(get_client())
+    monkeypatch.setattr(pricing, "_catalogs", {})  # a later dom run
+    pricing.get_catalog(get_client())
+
+    assert len(fake_api.page_requests("sizes")) == 1
+
+
+def test_bundled_fallback(fake_api):
+    """No /v2/sizes (or no network): the bundled catalog is used."""
+    catalog = pricing.get_catalog(get_client())
+
+    assert catalog.source == "bundled"
+    assert catalog.size("s-2vcpu-4gb") == 24
+    assert pricing.get_catalog().source == "bundled"
+
+
+def test_bugs_are_not_hidden_by_the_fallback(fake_api, monkeypatch):
+    def broken(client, kind):
+        raise TypeError("bug")
+
+    monkeypatch.setattr(pricing, "iter_models", broken)
+
+    with pytest.raises(TypeError):
+        pricing.build_catalog(get_client())
+
+
+def test_lookups():
+    catalog = pricing.build_catalog()
+
+    unknown = Droplet.from_api({**make_droplet(1, size="s-unknown"), "size": {"price_monthly": 9}})
+    assert catalog.droplet(unknown) == 9
+    ha = Database.from_api({"name": "db", "size": "db-s-1vcpu-2gb", "num_nodes": 2})
+    assert catalog.database(ha) == 60
+    assert catalog.volume(100) == 10
+    assert catalog.floating_ip(assigned=True) == 0
+
+
+def test_estimate_and_by_tag_agree(fake_api):
+    fake_api.add("sizes", "sizes", [_size("s-custom", 42)])
+    fake_api.add("droplets", "droplets", [make_droplet(1, size="s-custom", tags=["prod"])])
+    fake_api.add("volumes", "volumes", [])
+    fake_api.add("databases", "databases",
+                 [{"name": "db", "engine": "pg", "size": "db-s-1vcpu-1gb", "num_nodes": 1}],
+                 paginated=False)
+
+    estimate = runner.invoke(app, ["costs", "estimate"])
+    by_tag = runner.invoke(app, ["costs", "by-tag"])
+
+    assert "Estimated Total: $57.00/month" in estimate.stdout
+    assert "$42.00" in by_tag.stdout
+    assert len(fake_api.page_requests("sizes")) == 1
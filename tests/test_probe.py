@@ -0,0 +1,149 @@
+"""Tests for the asyncio reachability sweep behind `dom ans probe`."""
+
+import asyncio
+import json
+import socket
+
+from typer.testing import CliRunner
+
+from dom.cli import app
+from dom.utils.inventory import build_inventory, select_hosts
+from dom.utils.models import Droplet
+from dom.utils.probe import probe, sweep
+from tests.fake_api import make_droplet
+
+runner = CliRunner()
+
+BANNER = b"SSH-2.0-OpenSSH_9.6\r\n"
+
+
+class LocalServer:
+    """SSH-like server on 127.0.0.1 counting its concurrent connections.
+
+    With ``hold_until``, no banner is sent until that many connections are
+    open at once (or 5s have passed), so a sweep that does not overlap its
+    probes never reaches it.
+    """
+
+    def __init__(self, banner: bytes = BANNER, hold_until: int = 0):
+        self.banner = banner
+        self.hold_until = hold_until
+        self.open = 0
+        self.peak = 0
+        self.accepted = 0
+        self.gate = asyncio.Event()
+
+    async def _handle(self, reader, writer):
+        self.open += 1
+        self.accepted += 1
+        self.peak = max(self.peak, self.open)
+        if self.open >= self.hold_until:
+            self.gate.set()
+        try:
+            try:
+                await asyncio.wait_for(self.gate.wait(), 5)
+            except asyncio.TimeoutError:
+                self.gate.set()
+            if self.banner:
+                writer.write(self.banner)
+                await writer.drain()
+            await reader.read()  # until the client hangs up
+        except ConnectionError:
+            pass
+        finally:
+            self.open -= 1
+            writer.close()
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0, backlog=1024)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+
+
+def _closed_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_probe_statuses():
+    async def main():
+        async with LocalServer() as ssh, LocalServer(banner=b"") as silent:
+            return await asyncio.gather(
+                probe("ssh", "127.0.0.1", ssh.port),
+                probe("silent", "127.0.0.1", silent.port, timeout=0.2),
+                probe("silent-tcp", "127.0.0.1", silent.port, banner=False),
+                probe("closed", "127.0.0.1", _closed_port()),
+            )
+
+    ssh, silent, silent_tcp, closed = asyncio.run(main())
+
+    assert (ssh.status, ssh.banner) == ("ok", "SSH-2.0-OpenSSH_9.6")
+    assert ssh.connect_ms <= ssh.banner_ms
+    assert silent.status == "no-banner" and silent.connect_ms is not None
+    assert silent_tcp.status == "ok" and silent_tcp.banner_ms is None
+    assert closed.status == "refused" and not closed.reachable
+
+
+def test_sweep_respects_concurrency_and_keeps_order():
+    targets = [(f"web-{i}", "127.0.0.1", 0) for i in range(2000)]
+
+    async def main():
+        async with LocalServer(hold_until=100) as ssh:
+            results = await sweep([(h, a, ssh.port) for h, a, _ in targets], concurrency=100, timeout=10)
+            return results, ssh
+
+    results, ssh = asyncio.run(main())
+
+    assert [r.host for r in results] == [h for h, _, _ in targets]
+    assert all(r.status == "ok" for r in results)
+    assert ssh.accepted == 2000
+    assert ssh.peak == 100  # the limit is used in full, and never exceeded
+
+
+def test_select_hosts():
+    droplets = [Droplet.from_api(make_droplet(1, region="fra1", tags=["web"])),
+                Droplet.from_api(make_droplet(2, region="nyc3", tags=["db"])),
+                Droplet.from_api(make_droplet(3, region="nyc3", tags=["web"]))]
+    inventory = build_inventory(droplets)
+
+    assert select_hosts(inventory, "all") == ["web-1", "web-2", "web-3"]
+    assert select_hosts(inventory, "tag_db,web-1") == ["web-1", "web-2"]
+    assert select_hosts(inventory, "region_nyc*") == ["web-2", "web-3"]
+    assert select_hosts(inventory, "nothing") == []
+
+
+def test_ans_probe_command(fake_api):
+    droplets = [make_droplet(i) for i in range(3)]
+    for d in droplets[:2]:
+        d["networks"]["v4"][1]["ip_address"] = "127.0.0.1"
+    droplets[2]["networks"]["v4"] = []  # no address, skipped
+    fake_api.add("droplets", "droplets", droplets)
+
+    async def serve():
+        async with LocalServer() as ssh:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, runner.invoke, app, ["ans", "probe", "--port", str(ssh.port), "--format", "ndjson"])
+
+    result = asyncio.run(serve())
+
+    assert result.exit_code == 0, result.output
+    rows = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [(r["host"], r["status"], r["banner"]) for r in rows] == [
+        ("web-0", "ok", "SSH-2.0-OpenSSH_9.6"), ("web-1", "ok", "SSH-2.0-OpenSSH_9.6")]
+    assert "2/2 reachable" in result.stderr
+
+
+def test_ans_probe_fails_on_unreachable_hosts(fake_api):
+    droplet = make_droplet(1)
+    droplet["networks"]["v4"][0]["ip_address"] = "127.0.0.1"
+    fake_api.add("droplets", "droplets", [droplet])
+
+    result = runner.invoke(app, ["ans", "probe", "web-*", "--private", "--port", str(_closed_port())])
+
+    assert result.exit_code == 1
+    assert "refused" in result.stdout
+    assert "0/1 reachable" in result.stderr
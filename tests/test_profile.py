@@ -0,0 +1,74 @@
+"""Tests for --profile tracing."""
+
+import json
+
+from typer.testing import CliRunner
+
+from dom.cli import app
+from dom.utils import aio, profile
+from tests.fake_api import make_droplet
+
+runner = CliRunner()
+
+
+def _events(trace, category):
+    return [e for e in trace["traceEvents"] if e.get("cat") == category]
+
+
+def test_profile_records_calls_and_phases(fake_api, tmp_path):
+    fake_api.add("droplets", "droplets", [make_droplet(i) for i in range(450)])
+    fake_api.fail(429, times=1, retry_after=0)
+    trace_path = tmp_path / "trace.json"
+
+    result = runner.invoke(app, [
+        "--profile", "--profile-out", str(trace_path),
+        "export", "terraform", "-o", str(tmp_path / "tf"), "-t", "droplets",
+    ])
+
+    assert result.exit_code == 0, result.output
+    assert "GET /v2/droplets" in result.stderr
+    assert str(trace_path) in result.stderr.replace("\n", "")
+    trace = json.loads(trace_path.read_text())
+
+    calls = sorted(_events(trace, "api"), key=lambda e: e["args"]["page"])
+    assert [c["args"]["page"] for c in calls] == [1, 2, 3]
+    assert [c["args"]["retries"] for c in calls] == [1, 0, 0]
+    assert all(c["args"]["status"] == 200 and c["args"]["bytes"] > 0 for c in calls)
+    assert all(c["ph"] == "X" and c["dur"] > 0 for c in calls)
+
+    phases = {e["name"] for e in _events(trace, "phase")}
+    assert {"fetch droplets", "transform droplets", "write droplets.tf"} <= phases
+    assert len(_events(trace, "pydo")) == 3
+    threads = [e for e in trace["traceEvents"] if e["name"] == "thread_name"]
+    assert {e["tid"] for e in threads} >= {e["tid"] for e in calls}
+    assert profile.active() is None
+
+
+def test_async_calls_get_a_lane_per_task(fake_api):
+    fake_api.add("droplets", "droplets", [make_droplet(i) for i in range(450)])
+    profiler = profile.enable()
+
+    aio.run(aio.fetch("droplets"))
+
+    calls = profiler.calls
+    assert sorted(c.page for c in calls) == [1, 2, 3]
+    assert {c.endpoint for c in calls} == {"/v2/droplets"}
+    assert len({c.lane for c in calls}) > 1
+    assert all(c.size > 0 for c in calls)
+
+
+def test_nothing_is_recorded_when_off(fake_api):
+    fake_api.add("droplets", "droplets", [make_droplet(1)])
+
+    result = runner.invoke(app, ["audit", "droplets"])
+
+    assert result.exit_code == 0, result.output
+    assert profile.active() is None
+    assert profile.phase("fetch") is profile.phase("render")
+
+
+def test_endpoints_group_resource_ids():
+    assert profile.endpoint_of("/v2/droplets/1234/actions") == "/v2/droplets/{id}/actions"
+    assert profile.endpoint_of("/v2/volumes/506f78a4-e098-11e5-ad9f-000f53306ae1") == "/v2/volumes/{id}"
+    assert profile.endpoint_of("/v2/domains/example.com/records") == "/v2/domains/example.com/records"
+    assert profile.split_url("https://api/v2/droplets?per_page=200&page=3") == ("/v2/droplets", 3)
@@ -0,0 +1,101 @@
+"""Tests for the rate-limit-aware scheduler."""
+
+import time
+
+import pytest
+from azure.core.exceptions import HttpResponseError
+from typer.testing import CliRunner
+
+from dom.cli import app
+from dom.utils import aio, get_client, list_resources
+from dom.utils.ratelimit import RateLimiter, get_limiter
+from tests.fake_api import make_droplet
+
+runner = CliRunner()
+
+
+def test_bucket_paces_after_burst():
+    limiter = RateLimiter(per_minute=60, per_hour=5000)
+
+    waits = [limiter.reserve() for _ in range(13)]
+
+    assert waits[:12] == [0.0] * 12
+    # 12-request burst, then 48 more spread over the minute
+    assert waits[12] == pytest.approx(60 / 48, rel=0.05)
+
+
+def test_no_rolling_minute_exceeds_limit():
+    limiter = RateLimiter(per_minute=250, per_hour=5000)
+
+    waits = [limiter.reserve() for _ in range(500)]
+
+    assert sum(1 for w in waits if w < 60) <= 250
+
+
+def test_exhausted_hourly_budget_waits_for_reset():
+    limiter = RateLimiter(per_minute=250, per_hour=5000)
+    limiter.observe(200, {"ratelimit-remaining": "0", "ratelimit-reset": str(time.time() + 10)})
+
+    assert limiter.reserve() == pytest.approx(10, abs=0.5)
+
+
+def test_low_hourly_budget_is_spread_until_reset():
+    limiter = RateLimiter(per_minute=250, per_hour=5000)
+    limiter.observe(200, {"ratelimit-remaining": "100", "ratelimit-reset": str(time.time() + 100)})
+
+    assert limiter.reserve() == pytest.approx(1, abs=0.1)
+
+
+def test_pydo_requests_retry_429(fake_api):
+    fake_api.add("droplets", "droplets", [make_droplet(1)])
+    fake_api.fail(429, times=2, retry_after=0)
+
+    client = get_client()
+    droplets = list_resources(client, "droplets")
+
+    limiter = get_limiter(client.dom_account)
+    assert len(droplets) == 1
+    assert limiter.throttled == 2
+    assert limiter.retries == 2
+    assert limiter.remaining == 4997
+
+
+def test_pydo_gives_up_after_max_retries(fake_api, monkeypatch):
+    monkeypatch.setattr("dom.utils.ratelimit.BACKOFF_BASE", 0.001)
+    fake_api.add("droplets", "droplets", [])
+    fake_api.fail(503, times=10)
+
+    with pytest.raises(HttpResponseError):
+        list_resources(get_client(), "droplets")
+
+
+def test_deletes_are_retried_on_429_only(fake_api, monkeypatch):
+    monkeypatch.setattr("dom.utils.ratelimit.BACKOFF_BASE", 0.001)
+    fake_api.add("volumes", "volumes", [{"id": f"vol-{i}"} for i in range(2)])
+    client = get_client()
+
+    fake_api.fail(429, retry_after=0)
+    client.volumes.delete("vol-0")
+    fake_api.fail(503)
+    with pytest.raises(HttpResponseError):
+        client.volumes.delete("vol-1")
+
+    deletes = [p for m, p, _ in fake_api.requests if m == "DELETE"]
+    assert deletes == ["/v2/volumes/vol-0", "/v2/volumes/vol-0", "/v2/volumes/vol-1"]
+
+
+def test_async_requests_retry_5xx(fake_api, monkeypatch):
+    monkeypatch.setattr("dom.utils.ratelimit.BACKOFF_BASE", 0.001)
+    fake_api.add("volumes", "volumes", [{"id": "v1"}])
+    fake_api.fail(502, times=2)
+
+    assert aio.run(aio.fetch("volumes")) == [{"id": "v1"}]
+
+
+def test_quota_report(fake_api):
+    fake_api.add("droplets", "droplets", [make_droplet(1)])
+
+    result = runner.invoke(app, ["--quota", "audit", "droplets"])
+
+    assert result.exit_code == 0
+    assert "quota used: 1" in result.output
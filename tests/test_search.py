@@ -0,0 +1,74 @@
+"""Tests for the TUI search index."""
+
+import random
+
+from dom.tui.app import VIEWS
+from dom.tui.search import SearchIndex
+from dom.utils.models import from_api
+from tests.fake_api import make_droplet
+
+# Keystrokes of someone typing into the search bar.
+QUERIES = ["w", "we", "web", "web-1", "web-19", "web-199", "203.0.7", "fra1 db",
+           "team-3 cache", "s-1vcpu", "zzz"]
+
+
+def _droplets(count):
+    rng = random.Random(7)
+    return [
+        from_api("droplets", make_droplet(
+            i, region=rng.choice(["fra1", "nyc3", "ams3", "sgp1"]), tags=[rng.choice(["web", "db", "cache"]), f"team-{i % 37}"]
+        ))
+        for i in range(count)
+    ]
+
+
+def test_matches_every_field():
+    index = VIEWS["droplets"].search_index([
+        from_api("droplets", make_droplet(1, region="nyc3", tags=["db"])),
+        from_api("droplets", make_droplet(2, size="s-2vcpu-4gb", tags=["Frontend"])),
+    ])
+
+    assert index.search("web-1") == ["1001"]  # name
+    assert index.search("203.0.0.2") == ["1002"]  # public IP
+    assert index.search("10.0.0.1") == ["1001"]  # private IP
+    assert index.search("FRONT") == ["1002"]  # tag, any case
+    assert index.search("nyc") == ["1001"]  # region
+    assert index.search("4gb") == ["1002"]  # size
+    assert index.search("") == ["1001", "1002"]
+
+
+def test_terms_must_all_match():
+    index = SearchIndex(["a", "b", "c"], ["web-1 fra1 prod", "web-2 nyc3 prod", "db-1 fra1 staging"])
+
+    assert index.search("fra1 web") == ["a"]
+    assert index.search("  prod  ") == ["a", "b"]
+    assert index.search("f 1") == ["a", "c"]  # terms shorter than a trigram
+    assert index.search("prod staging") == []
+    assert index.search("zzz") == []
+    assert index.search("e", limit=2) == ["a", "b"]
+
+
+def test_fuzzy_only_without_exact_matches():
+    index = SearchIndex(["a", "b", "c"], ["web-19 fra1", "web-190 nyc3", "db-1 staging"])
+
+    assert index.search("wb19") == ["a", "b"]
+    assert index.search("stging fra") == []  # every term must match
+    assert index.search("stging") == ["c"]
+    assert index.search("web-19") == ["a", "b"]
+    assert index.search("b-1") == ["a", "b", "c"]  # exact, no fuzzy extras
+    assert index.search("wfra") == []  # fuzzy stays within one field
+    assert index.search("wb19", limit=1) == ["a"]
+
+
+def test_large_index_agrees_with_a_scan():
+    records = _droplets(20_000)
+    index = VIEWS["droplets"].search_index(records)
+    texts = [" ".join(VIEWS["droplets"].fields(r)).lower() for r in records]
+
+    for query in QUERIES:
+        terms = query.split()
+        expected = [str(r.id) for r, text in zip(records, texts) if all(t in text for t in terms)]
+        if expected:
+            assert index.search(query) == expected, query
+            assert index.search(query, limit=201) == expected[:201], query
+    assert index.search("zzz") == []
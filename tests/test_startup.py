@@ -0,0 +1,50 @@
+"""Startup benchmark: cheap commands must not pay for the heavy imports."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Milliseconds allowed for importing dom.cli and running `dom version`.
+STARTUP_BUDGET_MS = float(os.getenv("DOM_STARTUP_BUDGET_MS", "200"))
+
+HEAVY_MODULES = {"pydo", "azure", "httpx", "requests", "textual", "dom.commands.audit"}
+
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from dom.cli import app
+try:
+    app(sys.argv[1:])
+except SystemExit:
+    pass
+elapsed = (time.perf_counter() - start) * 1000
+loaded = sorted(m for m in sys.modules if m in HEAVY or m.split(".")[0] in HEAVY)
+print(json.dumps({"elapsed_ms": elapsed, "loaded": loaded}))
+"""
+
+
+def _startup(*args: str) -> dict:
+    script = f"HEAVY = {sorted(HEAVY_MODULES)!r}\n{SCRIPT}"
+    result = subprocess.run(
+        [sys.executable, "-c", script, *args], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("args", [["version"], ["--help"]])
+def test_cheap_commands_skip_heavy_imports(args):
+    assert _startup(*args)["loaded"] == []
+
+
+def test_version_startup_budget():
+    # best of three to smooth out a cold disk cache
+    elapsed = min(_startup("version")["elapsed_ms"] for _ in range(3))
+    assert elapsed < STARTUP_BUDGET_MS, f"dom version took {elapsed:.0f}ms"
+
+
+def test_subcommand_loads_on_use():
+    loaded = _startup("audit", "--help")["loaded"]
+    assert "dom.commands.audit" in loaded
@@ -0,0 +1,198 @@
+"""Tests for bulk Terraform imports, against a fake terraform executable."""
+
+import json
+import os
+import sys
+import textwrap
+
+import pytest
+from typer.testing import CliRunner
+
+from dom.cli import app
+from dom.utils.terraform import (
+    ImportEntry,
+    import_blocks,
+    merge_states,
+    parse_import_blocks,
+    parse_import_script,
+    shard,
+    sharded_import,
+)
+
+runner = CliRunner()
+
+FAKE_TERRAFORM = textwrap.dedent(
+    """\
+    import json, os, shutil, sys
+
+    args = sys.argv[1:]
+    with open(os.environ["FAKE_TF_LOG"], "a") as log:
+        log.write(json.dumps([os.getcwd()] + args) + "\\n")
+
+    if args[:2] == ["version", "-json"]:
+        print(json.dumps({"terraform_version": os.environ.get("FAKE_TF_VERSION", "1.7.0")}))
+    elif args[0] == "init":
+        os.mkdir(".terraform")
+    elif args[0] == "plan":
+        out = [a for a in args if a.startswith("-out=")][0][5:]
+        open(out, "w").write(open("imports.tf").read())
+    elif args[0] == "apply":
+        print("Apply complete!")
+    elif args[0] == "import":
+        states = [a[7:] for a in args if a.startswith("-state=")]
+        state_file = states[0] if states else "terraform.tfstate"
+        address, import_id = args[-2], args[-1]
+        if import_id.startswith("bad"):
+            sys.exit("Error: Cannot import non-existent remote object")
+        state = json.load(open(state_file)) if os.path.exists(state_file) else {
+            "version": 4, "serial": 0, "lineage": "shard", "resources": []}
+        rtype, name = address.split(".")
+        state["resources"].append({"mode": "managed", "type": rtype, "name": name,
+                                   "instances": [{"attributes": {"id": import_id}}]})
+        json.dump(state, open(state_file, "w"))
+    elif args[:2] == ["state", "pull"]:
+        if os.path.exists("terraform.tfstate"):
+            print(open("terraform.tfstate").read())
+    elif args[:2] == ["state", "push"]:
+        shutil.copy(args[2], "terraform.tfstate")
+    """
+)
+
+
+@pytest.fixture
+def terraform(tmp_path, monkeypatch):
+    """Put a fake ``terraform`` on PATH; returns a function reading its calls."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "terraform"
+    script.write_text(f"#!{sys.executable}\n" + FAKE_TERRAFORM)
+    script.chmod(0o755)
+    log = tmp_path / "terraform.log"
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_TF_LOG", str(log))
+
+    def calls():
+        if not log.exists():
+            return []
+        return [json.loads(line) for line in log.read_text().splitlines()]
+
+    return calls
+
+
+@pytest.fixture
+def workdir(tmp_path):
+    path = tmp_path / "generated"
+    path.mkdir()
+    (path / "main.tf").write_text("# provider\n")
+    entries = [f"terraform import digitalocean_droplet.web_{i} {1000 + i}" for i in range(10)]
+    (path / "import.sh").write_text("#!/bin/bash\n# Generated by dom\n\n" + "\n".join(entries) + "\n")
+    return path
+
+
+def test_parse_and_blocks(workdir):
+    entries = parse_import_script(workdir / "import.sh")
+
+    assert entries[0] == ImportEntry("digitalocean_droplet.web_0", "1000")
+    assert len(entries) == 10
+    blocks = "".join(import_blocks(entries[:1]))
+    assert 'import {\n  to = digitalocean_droplet.web_0\n  id = "1000"\n}' in blocks
+
+    (workdir / "imports.tf").write_text("".join(import_blocks(entries)))
+    assert parse_import_blocks(workdir / "imports.tf") == entries
+
+
+def test_shard_round_robin():
+    entries = [ImportEntry(f"a.r{i}", str(i)) for i in range(5)]
+
+    assert [len(s) for s in shard(entries, 3)] == [2, 2, 1]
+    assert len(shard(entries, 10)) == 5
+    assert shard([], 4) == [[]]
+
+
+def test_merge_states_keeps_base_lineage_and_entries():
+    def resource(name, rid):
+        return {"mode": "managed", "type": "t", "name": name, "instances": [{"attributes": {"id": rid}}]}
+
+    base = {"version": 4, "serial": 7, "lineage": "base", "resources": [resource("a", "old")]}
+    shard_a = {"version": 4, "serial": 1, "lineage": "s1", "resources": [resource("a", "new"), resource("b", "2")]}
+    shard_b = {"version": 4, "serial": 1, "lineage": "s2", "resources": [resource("c", "3")]}
+
+    merged = merge_states(base, [shard_a, None, shard_b])
+
+    assert merged["lineage"] == "base"
+    assert merged["serial"] == 8
+    assert [r["name"] for r in merged["resources"]] == ["a", "b", "c"]
+    assert merged["resources"][0]["instances"][0]["attributes"]["id"] == "old"
+    assert merge_states(None, [None]) is None
+    assert merge_states(None, [shard_b])["lineage"] == "s2"
+
+
+def test_blocks_mode_is_one_plan_and_apply(terraform, workdir):
+    result = runner.invoke(app, ["tf", "import", "-d", str(workdir), "-y"])
+
+    assert result.exit_code == 0, result.output
+    commands = [call[1] for call in terraform()]
+    assert commands == ["init", "version", "plan", "apply"]
+    assert "import" not in commands
+    assert (workdir / "imports.tf").read_text().count("import {") == 10
+    assert not (workdir / "dom-import.tfplan").exists()
+
+
+def test_old_terraform_imports_in_shards(terraform, workdir, monkeypatch):
+    monkeypatch.setenv("FAKE_TF_VERSION", "1.4.6")
+    (workdir / "imports.tf").write_text("import {}\n")  # unreadable by 1.4
+
+    result = runner.invoke(app, ["tf", "import", "-d", str(workdir), "--shards", "4"])
+
+    assert result.exit_code == 0, result.output
+    assert "Imported 10 resources" in result.output
+    assert not (workdir / "imports.tf").exists()
+    assert (workdir / "imports.tf.disabled").read_text() == "import {}\n"
+    assert "Moved" in result.output
+    imports = [call for call in terraform() if call[1] == "import"]
+    assert len(imports) == 10
+    assert len({call[0] for call in imports}) == 4  # one working copy per shard
+    state = json.loads((workdir / "terraform.tfstate").read_text())
+    assert sorted(r["name"] for r in state["resources"]) == [f"web_{i}" for i in range(10)]
+    assert [p.name for p in workdir.iterdir() if p.name.startswith("dom-import-")] == []
+
+
+def test_sharded_import_reports_failures(terraform, workdir):
+    (workdir / ".terraform").mkdir()
+    entries = [ImportEntry("digitalocean_volume.ok", "vol-1"), ImportEntry("digitalocean_volume.gone", "bad-2")]
+
+    imported, failed = sharded_import(workdir, entries, shards=2)
+
+    assert imported == entries[:1]
+    assert [(entry, "non-existent" in error) for entry, error in failed] == [(entries[1], True)]
+    state = json.loads((workdir / "terraform.tfstate").read_text())
+    assert [r["name"] for r in state["resources"]] == ["ok"]
+
+
+def test_shards_from_import_blocks_alone(terraform, workdir, monkeypatch):
+    monkeypatch.setenv("FAKE_TF_VERSION", "1.4.6")
+    entries = parse_import_script(workdir / "import.sh")
+    (workdir / "import.sh").unlink()
+    (workdir / "imports.tf").write_text("".join(import_blocks(entries)))
+
+    result = runner.invoke(app, ["tf", "import", "-d", str(workdir), "-m", "sharded"])
+
+    assert result.exit_code == 0, result.output
+    assert "Imported 10 resources" in result.output
+    assert len([call for call in terraform() if call[1] == "import"]) == 10
+
+
+def test_remote_backend_imports_serially_with_locking(terraform, workdir, monkeypatch):
+    monkeypatch.setenv("FAKE_TF_VERSION", "1.4.6")
+    (workdir / "main.tf").write_text('terraform {\n  backend "s3" {\n    bucket = "state"\n  }\n}\n')
+
+    result = runner.invoke(app, ["tf", "import", "-d", str(workdir)])
+
+    assert result.exit_code == 0, result.output
+    assert "s3 backend" in result.output
+    imports = [call for call in terraform() if call[1] == "import"]
+    assert len(imports) == 10
+    assert {call[0] for call in imports} == {str(workdir)}
+    assert not any(arg.startswith(("-lock", "-state")) for call in imports for arg in call)
+    with pytest.raises(ValueError, match="s3 backend"):
+        sharded_import(workdir, parse_import_script(workdir / "import.sh"))
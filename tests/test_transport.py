@@ -0,0 +1,78 @@
+"""Tests for the shared HTTP transport."""
+
+import json
+
+import requests
+from azure.core.pipeline import PipelineContext, PipelineRequest
+from azure.core.rest import HttpRequest
+
+from dom.utils import aio, get_client, list_resources
+from dom.utils.transport import TimeoutPolicy
+from tests.fake_api import make_droplet
+
+
+def test_get_client_is_shared(fake_api):
+    assert get_client() is get_client()
+
+
+def test_connections_are_reused_across_calls(fake_api, monkeypatch):
+    monkeypatch.setenv("DOM_CACHE", "off")
+    fake_api.add("domains", "domains", [])
+
+    for _ in range(10):
+        list_resources(get_client(), "domains")
+
+    assert fake_api.connections == 1
+
+
+def test_responses_are_gzip_encoded(fake_api, monkeypatch):
+    monkeypatch.setenv("DOM_CACHE", "off")
+    fake_api.gzip = True
+    items = [make_droplet(i) for i in range(200)]
+    fake_api.add("droplets", "droplets", items)
+
+    droplets = list_resources(get_client(), "droplets")
+    sync_bytes = fake_api.bytes_sent
+    assert aio.run(aio.fetch("droplets")) == droplets
+
+    plain = len(json.dumps({"droplets": items}))
+    assert droplets == items
+    assert sync_bytes < plain / 5
+    assert fake_api.bytes_sent - sync_bytes < plain / 5
+
+
+def test_timeouts_per_call_class(monkeypatch):
+    monkeypatch.setenv("DOM_READ_TIMEOUT", "7")
+    monkeypatch.setenv("DOM_WRITE_TIMEOUT", "99")
+    policy = TimeoutPolicy()
+
+    read = PipelineRequest(HttpRequest("GET", "https://x/v2/droplets"), PipelineContext(None))
+    write = PipelineRequest(HttpRequest("DELETE", "https://x/v2/volumes/1"), PipelineContext(None))
+    policy.on_request(read)
+    policy.on_request(write)
+
+    assert read.context.options["read_timeout"] == 7
+    assert write.context.options["read_timeout"] == 99
+
+
+def test_shared_pool_vs_fresh_sessions(fake_api, monkeypatch):
+    """A fresh session per call pays a new connection every time."""
+    monkeypatch.setenv("DOM_CACHE", "off")
+    fake_api.gzip = True
+    fake_api.add("droplets", "droplets", [make_droplet(i) for i in range(100)])
+    calls = 30
+
+    for _ in range(calls):
+        with requests.Session() as session:
+            url = f"{fake_api.url}/v2/droplets"
+            session.get(url, headers={"Accept-Encoding": "identity"}).json()
+    fresh_connections, fresh_bytes = fake_api.connections, fake_api.bytes_sent
+
+    for _ in range(calls):
+        get_client().droplets.list()
+    shared_connections = fake_api.connections - fresh_connections
+    shared_bytes = fake_api.bytes_sent - fresh_bytes
+
+    assert fresh_connections == calls
+    assert shared_connections == 1
+    assert shared_bytes < fresh_bytes / 5
@@ -0,0 +1,338 @@
+"""Tests for the TUI, driven through Textual's test pilot."""
+
+import asyncio
+import threading
+
+import pytest
+from textual.widgets import DataTable
+
+from dom.tui import app as tui
+from dom.tui.app import DOManagerApp, ResourceListScreen
+from dom.utils.models import from_api
+from tests.fake_api import make_droplet
+
+TABS = ("droplets", "volumes", "domains", "firewalls", "databases")
+
+
+def _add_account(api):
+    api.add("droplets", "droplets", [make_droplet(i) for i in range(1, 4)])
+    api.add("volumes", "volumes", [{"id": "vol-1", "name": "data", "size_gigabytes": 10,
+                                    "region": {"slug": "fra1"}, "droplet_ids": [1001]}])
+    api.add("domains", "domains", [{"name": "example.com", "ttl": 1800}])
+    api.add("firewalls", "firewalls", [])
+    api.add("databases", "databases", [], paginated=False)
+
+
+async def _settle(pilot):
+    await pilot.app.workers.wait_for_complete()
+    await pilot.pause()
+
+
+async def _wait_for(pilot, condition, polls=100):
+    for _ in range(polls):
+        if condition():
+            return
+        await pilot.pause(0.05)
+    pytest.fail("condition not met")
+
+
+def _screen(pilot) -> ResourceListScreen:
+    return pilot.app.screen
+
+
+def _table(pilot) -> DataTable:
+    return pilot.app.screen.query_one("#resource-table", DataTable)
+
+
+def test_prefetches_every_tab(fake_api):
+    _add_account(fake_api)
+
+    async def scenario():
+        async with DOManagerApp().run_test() as pilot:
+            await _settle(pilot)
+            assert _table(pilot).row_count == 3
+            assert not _table(pilot).loading
+            assert sorted(_screen(pilot).loaded) == sorted(TABS)
+            requests = len(fake_api.requests)
+
+            await pilot.press("v")
+            await pilot.pause()
+            assert _table(pilot).row_count == 1  # no wait for the API
+            assert len(fake_api.requests) == requests
+
+    asyncio.run(scenario())
+
+
+def test_switching_tabs_cancels_a_slow_refresh(fake_api, monkeypatch):
+    _add_account(fake_api)
+    gate = threading.Event()
+    real_iter_models = tui.iter_models
+
+    def slow_iter_models(client, kind, refresh=False):
+        if refresh:
+            gate.wait(5)
+        return real_iter_models(client, kind, refresh=refresh)
+
+    monkeypatch.setattr(tui, "iter_models", slow_iter_models)
+
+    async def scenario():
+        async with DOManagerApp().run_test() as pilot:
+            await _settle(pilot)
+            screen = _screen(pilot)
+
+            await pilot.press("r")
+            await pilot.pause()
+            refresh = screen._loading["droplets"]
+            assert _table(pilot).loading
+
+            await pilot.press("v")  # the UI answers while the refresh hangs
+            await pilot.pause()
+            assert refresh.is_cancelled
+            assert screen.current_view == "volumes"
+            assert _table(pilot).row_count == 1
+            assert not _table(pilot).loading
+
+            gate.set()
+            await _settle(pilot)
+            assert len(screen.loaded["droplets"]) == 3
+
+    asyncio.run(scenario())
+
+
+def test_load_errors_are_reported(fake_api, monkeypatch):
+    _add_account(fake_api)
+    real_iter_models = tui.iter_models
+
+    def failing_iter_models(client, kind, refresh=False):
+        if kind == "databases":
+            raise RuntimeError("forbidden")
+        return real_iter_models(client, kind, refresh=refresh)
+
+    monkeypatch.setattr(tui, "iter_models", failing_iter_models)
+
+    async def scenario():
+        async with DOManagerApp().run_test() as pilot:
+            await _settle(pilot)
+            assert "databases" not in _screen(pilot).loaded
+            assert any("databases: forbidden" in str(n.message) for n in pilot.app._notifications)
+            assert _table(pilot).row_count == 3
+
+    asyncio.run(scenario())
+
+
+class _Inventory:
+    """Serves model listings from dicts the test can change between refreshes."""
+
+    def __init__(self, droplets):
+        self.items = {"droplets": droplets, "volumes": [], "domains": [], "firewalls": [], "databases": []}
+
+    def iter_models(self, client, kind, refresh=False):
+        return (from_api(kind, item) for item in list(self.items[kind]))
+
+
+def _fake_inventory(monkeypatch, droplets):
+    monkeypatch.setenv("DIGITALOCEAN_TOKEN", "test-token")
+    inventory = _Inventory(droplets)
+    monkeypatch.setattr(tui, "iter_models", inventory.iter_models)
+    return inventory
+
+
+def _cursor_key(pilot):
+    table = _table(pilot)
+    return table.coordinate_to_cell_key(table.cursor_coordinate).row_key.value
+
+
+def test_refresh_updates_only_changed_rows(monkeypatch):
+    droplets = [make_droplet(i) for i in range(10_000)]
+    inventory = _fake_inventory(monkeypatch, droplets)
+
+    async def scenario():
+        async with DOManagerApp().run_test() as pilot:
+            await _settle(pilot)
+            table, screen = _table(pilot), _screen(pilot)
+            table.move_cursor(row=5000)
+            await pilot.pause()
+            scroll_y = table.scroll_y
+
+            changed = [{**d, "status": "off"} if i % 100 == 0 else d for i, d in enumerate(droplets)]
+            inventory.items["droplets"] = changed[10:] + [make_droplet(i) for i in range(20_000, 20_005)]
+            added = []
+            monkeypatch.setattr(table, "add_row", lambda *cells, **kw: added.append(kw["key"]) or
+                                type(table).add_row(table, *cells, **kw))
+            monkeypatch.setattr(table, "clear", lambda **kw: pytest.fail("table rebuilt"))
+            updated = []
+            monkeypatch.setattr(table, "update_cell", lambda key, *a, **kw: updated.append(key) or
+                                type(table).update_cell(table, key, *a, **kw))
+
+            await pilot.press("r")
+            await _settle(pilot)
+
+            assert added == [str(1000 + i) for i in range(20_000, 20_005)]
+            assert table.row_count == 10_000 - 10 + 5
+            assert _cursor_key(pilot) == str(1000 + 5000)
+            assert table.scroll_y == scroll_y
+            assert table.get_cell("1100", "Status") == "[red]off[/]"
+            assert table.get_cell("1101", "Status") == "[green]active[/]"
+            assert screen._records["1100"].status == "off"
+            assert sorted(updated) == sorted(str(1000 + i) for i in range(100, 10_000, 100))
+
+    asyncio.run(scenario())
+
+
+def test_mass_removal_rebuilds_and_keeps_cursor(monkeypatch):
+    droplets = [make_droplet(i) for i in range(1000)]
+    inventory = _fake_inventory(monkeypatch, droplets)
+
+    async def scenario():
+        async with DOManagerApp().run_test() as pilot:
+            await _settle(pilot)
+            _table(pilot).move_cursor(row=700)
+            inventory.items["droplets"] = droplets[500:]
+
+            await pilot.press("r")
+            await _settle(pilot)
+
+            assert _table(pilot).row_count == 500
+            assert _cursor_key(pilot) == str(1000 + 700)
+
+    asyncio.run(scenario())
+
+
+def test_tabs_keep_their_cursor(monkeypatch):
+    _fake_inventory(monkeypatch, [make_droplet(i) for i in range(50)])
+
+    async def scenario():
+        async with DOManagerApp().run_test() as pilot:
+            await _settle(pilot)
+            _table(pilot).move_cursor(row=30)
+
+            await pilot.press("v")
+            await pilot.pause()
+            await pilot.press("d")
+            await pilot.pause()
+
+            assert _cursor_key(pilot) == str(1000 + 30)
+
+            await pilot.press("enter")
+            await pilot.pause()
+            assert pilot.app.screen.droplet.id == 1000 + 30
+
+    asyncio.run(scenario())
+
+
+def test_live_mode_polls_faster_while_resources_change(monkeypatch):
+    monkeypatch.setattr(tui, "LIVE_FAST", 0.05)
+    monkeypatch.setattr(tui, "LIVE_IDLE", 0.4)
+    booting = {**make_droplet(1), "status": "new"}
+    inventory = _fake_inventory(monkeypatch, [make_droplet(0), booting])
+    polls = []
+    serve = inventory.iter_models
+
+    def counting_iter_models(client, kind, refresh=False):
+        if refresh:
+            polls.append(kind)
+        return serve(client, kind, refresh)
+
+    monkeypatch.setattr(tui, "iter_models", counting_iter_models)
+
+    async def scenario():
+        async with DOManagerApp(live=True).run_test() as pilot:
+            screen = _screen(pilot)
+            await _wait_for(pilot, lambda: len(polls) >= 4)
+            assert screen._interval == 0.05
+            busy_polls = len(polls)
+            assert set(polls) == {"droplets"}  # only the shown tab
+
+            inventory.items["droplets"] = [make_droplet(0), {**booting, "status": "active"}]
+            monkeypatch.setattr(_table(pilot), "clear", lambda **kw: pytest.fail("table rebuilt"))
+            await _wait_for(pilot, lambda: screen._interval == 0.4)
+            assert len(polls) - busy_polls <= 6  # 0.05, 0.1, 0.2, 0.4, ...
+            assert _table(pilot).get_cell("1001", "Status") == "[green]active[/]"
+            assert "live" in pilot.app.sub_title
+
+            await pilot.press("l")
+            stopped = len(polls)
+            await pilot.pause(0.5)
+            assert len(polls) == stopped
+
+    asyncio.run(scenario())
+
+
+def test_live_mode_polls_busy_resources_by_id(fake_api, monkeypatch):
+    monkeypatch.setattr(tui, "LIVE_FAST", 0.05)
+    _add_account(fake_api)
+    droplets = [make_droplet(i) for i in range(450)]  # three pages
+    droplets[7] = {**droplets[7], "status": "new"}
+    fake_api.add("droplets", "droplets", droplets)
+
+    def by_id():
+        return [p for m, p, _ in fake_api.requests if p == "/v2/droplets/1007"]
+
+    async def scenario():
+        async with DOManagerApp(live=True).run_test() as pilot:
+            await _settle(pilot)
+            listings = len(fake_api.page_requests("droplets"))
+            await _wait_for(pilot, lambda: len(by_id()) >= 3)
+            assert len(fake_api.page_requests("droplets")) == listings
+
+            droplets[7]["status"] = "active"
+            polls = len(by_id())
+            await _wait_for(pilot, lambda: len(by_id()) > polls)
+            await _settle(pilot)
+            assert _table(pilot).get_cell("1007", "Status") == "[green]active[/]"
+            assert _table(pilot).row_count == 450
+
+    asyncio.run(scenario())
+
+
+def test_locked_droplets_count_as_busy():
+    assert tui._droplet_busy(from_api("droplets", {**make_droplet(1), "locked": True}))
+    assert tui._droplet_busy(from_api("droplets", {**make_droplet(1), "status": "new"}))
+    assert not tui._droplet_busy(from_api("droplets", make_droplet(1)))
+
+
+def test_search_filters_as_you_type(monkeypatch):
+    droplets = [make_droplet(i, region="nyc3" if i % 10 == 0 else "fra1", tags=["db" if i % 2 else "web"])
+                for i in range(2000)]
+    _fake_inventory(monkeypatch, droplets)
+
+    async def scenario():
+        async with DOManagerApp().run_test() as pilot:
+            await _settle(pilot)
+            screen = _screen(pilot)
+            results = screen.query_one("#search-results", DataTable)
+
+            await pilot.press("slash")
+            await pilot.press(*"nyc3 d")  # typed keys do not trigger bindings
+            await pilot.pause()
+            assert screen.current_view == "droplets"
+            assert results.display and not _table(pilot).display
+            assert results.row_count == 0  # "d" alone matches no nyc3 droplet (even ids are web)
+
+            await pilot.press("backspace", *"web")
+            await pilot.pause()
+            assert results.row_count == 200
+            assert str(screen.query_one("#search-count").render()) == "200 of 2000 match"
+
+            await pilot.press(*["backspace"] * 8, *"fra1")
+            await pilot.pause()
+            assert results.row_count == 200  # of 1800
+            assert "First 200" in str(screen.query_one("#search-count").render())
+
+            await pilot.press(*["backspace"] * 4, *"web-1990")
+            await pilot.pause()
+            assert [row.key.value for row in results.ordered_rows] == ["2990"]
+
+            await pilot.press("enter", "enter")
+            await pilot.pause()
+            assert pilot.app.screen.droplet.id == 2990
+            await pilot.press("escape")
+            await pilot.pause()
+
+            await pilot.press("escape")  # close the search
+            await pilot.pause()
+            assert _table(pilot).display and not results.display
+            assert _cursor_key(pilot) == "2990"
+            assert _table(pilot).row_count == 2000
+
+    asyncio.run(scenario())
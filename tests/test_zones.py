@@ -0,0 +1,95 @@
+"""Tests for the concurrent DNS record crawl."""
+
+from typer.testing import CliRunner
+
+from dom.cli import app
+from dom.utils import aio
+from dom.utils.zones import crawl_records
+
+runner = CliRunner()
+
+
+def _record(i):
+    return {"id": i, "type": "A", "name": f"host{i}", "data": "203.0.113.1", "ttl": 1800}
+
+
+def _crawl(domains, **kwargs):
+    async def crawl():
+        async with aio.get_async_client() as client:
+            return [zone async for zone in crawl_records(client, domains, **kwargs)]
+
+    return aio.run(crawl())
+
+
+def _add_zones(api, count, records=1):
+    names = [f"example{i}.com" for i in range(count)]
+    for name in names:
+        api.add(f"domains/{name}/records", "domain_records", [_record(r) for r in range(records)])
+    return names
+
+
+def test_crawl_is_concurrent_and_capped(fake_api):
+    fake_api.latency = 0.05
+    names = _add_zones(fake_api, 20)
+
+    zones = _crawl(names, concurrency=4)
+
+    assert [z.domain for z in zones] == names
+    assert fake_api.max_in_flight == 4
+
+
+def test_large_zones_are_paginated(fake_api):
+    names = _add_zones(fake_api, 1, records=450)
+
+    (zone,) = _crawl(names)
+
+    assert len(zone.records) == 450
+    assert len(fake_api.page_requests(f"domains/{names[0]}/records")) == 3
+
+
+def test_unchanged_zones_revalidate_with_etags(fake_api, monkeypatch):
+    monkeypatch.setenv("DOM_CACHE_TTL_DOMAIN_RECORDS", "0")
+    fake_api.etags = True
+    names = _add_zones(fake_api, 3, records=250)
+
+    first = _crawl(names)
+    fake_api.routes[f"/v2/domains/{names[0]}/records"][1].append(_record(999))
+    second = _crawl(names)
+
+    assert all(z.changed for z in first)
+    assert [z.changed for z in second] == [True, False, False]
+    assert len(second[0].records) == 251
+    assert second[1].records == first[1].records
+    # page 1 of zone 0 changed (meta.total), page 2 too; the rest were 304s
+    assert fake_api.not_modified == 4
+
+
+def test_content_hash_without_etags(fake_api, monkeypatch):
+    monkeypatch.setenv("DOM_CACHE_TTL_DOMAIN_RECORDS", "0")
+    names = _add_zones(fake_api, 2)
+
+    _crawl(names)
+    second = _crawl(names)
+
+    assert [z.changed for z in second] == [False, False]
+
+
+def test_fresh_zones_skip_the_api(fake_api):
+    names = _add_zones(fake_api, 2)
+
+    _crawl(names)
+    requests = len(fake_api.requests)
+    _crawl(names)
+
+    assert len(fake_api.requests) == requests
+
+
+def test_audit_domains(fake_api):
+    fake_api.add("domains", "domains", [{"name": "example0.com"}, {"name": "example1.com"}])
+    _add_zones(fake_api, 2)
+
+    result = runner.invoke(app, ["audit", "domains", "--concurrency", "2"])
+
+    assert result.exit_code == 0
+    assert result.stdout.index("example0.com") < result.stdout.index("example1.com")
+    assert "host0" in result.stdout